@@ -1,10 +1,12 @@
 import os
 import base64
 import hashlib
+import threading
 from ldap3 import Server, Connection, ALL, SUBTREE, MODIFY_ADD, MODIFY_DELETE, MODIFY_REPLACE
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 
+from app.services.ldap_directory import DirectoryClient
 from app.security import (
     SessionUser,
     clear_session,
@@ -25,37 +27,40 @@ LDAP_BIND_PASSWORD = os.getenv("LDAP_BIND_PASSWORD")
 LDAP_GROUP_DN = os.getenv("LDAP_GROUP_DN")
 
 
+_directory: DirectoryClient | None = None
+_directory_lock = threading.Lock()
+
+
+def _get_directory() -> DirectoryClient:
+    global _directory
+    with _directory_lock:
+        if _directory is None:
+            _directory = DirectoryClient(LDAP_URI, LDAP_BASE_DN, LDAP_BIND_DN, LDAP_BIND_PASSWORD)
+        return _directory
+
+
 def fetch_all_user_uids() -> list[str]:
     """Return a sorted list of LDAP user identifiers.
 
     This helper is imported by other modules (e.g. for dropdowns) so we keep
     the dependency here to avoid repeating the LDAP connection boilerplate.
-    Failures are swallowed and reported as an empty list to keep the UI usable
-    even if LDAP is momentarily unavailable.
+    The roster is served from a process-wide cache backed by pooled binds;
+    when LDAP is slow or unavailable the last good roster is returned, and an
+    empty list only if no roster was ever loaded.
     """
 
     required_settings = [LDAP_URI, LDAP_BASE_DN, LDAP_BIND_DN, LDAP_BIND_PASSWORD]
     if not all(required_settings):
         return []
 
-    server = Server(LDAP_URI, get_info=ALL)
-    user_ids: list[str] = []
+    return _get_directory().user_uids()
 
-    try:
-        with Connection(server, LDAP_BIND_DN, LDAP_BIND_PASSWORD, auto_bind=True) as conn:
-            conn.search(
-                search_base=LDAP_BASE_DN,
-                search_filter="(objectClass=inetOrgPerson)",
-                search_scope=SUBTREE,
-                attributes=["uid"],
-            )
-            for entry in conn.entries:
-                if "uid" in entry and str(entry.uid):
-                    user_ids.append(str(entry.uid))
-    except Exception as exc:  # pragma: no cover - defensive logging for ops
-        print(f"⚠️  Unable to fetch LDAP users: {exc}")
 
-    return sorted(set(user_ids))
+def invalidate_user_roster() -> None:
+    """Drop the cached roster after adding or removing users."""
+    if _directory is not None:
+        _directory.roster.invalidate()
+
 
 @router.get("/dashboard", response_class=HTMLResponse)
 def dashboard(request: Request, current_user: SessionUser = Depends(require_user)):
@@ -198,6 +203,7 @@ def add_user(
                     group_dn,
                     {"member": [(MODIFY_ADD, [dn])]}
                 )
+                invalidate_user_roster()
                 return {"message": f"✅ User {username} created and added to 'users' group!"}
             else:
                 return {"error": conn.result}
@@ -347,6 +353,7 @@ def delete_user(username: str = Form(...), current_admin: SessionUser = Depends(
         with Connection(server, LDAP_BIND_DN, LDAP_BIND_PASSWORD, auto_bind=True) as conn:
             dn = f"uid={username},ou=Users,{LDAP_BASE_DN}"
             if conn.delete(dn):
+                invalidate_user_roster()
                 return RedirectResponse(url="/auth/list_users", status_code=303)
             else:
                 return {"error": conn.result}
@@ -405,6 +412,14 @@ def dashboard_user(request: Request, current_user: SessionUser = Depends(require
     )
 
 
+@router.get("/directory/stats")
+def directory_stats(current_admin: SessionUser = Depends(require_admin)):
+    _ = current_admin
+    if _directory is None:
+        return {"roster_cache": None}
+    return {"roster_cache": _directory.roster.stats()}
+
+
 def _user_dn(username: str) -> str:
     return f"uid={username},ou=Users,{LDAP_BASE_DN}"
 
@@ -16,5 +16,7 @@ class Settings(BaseSettings):
     
     class Config:
         env_file = ".env"
+        # .env also carries settings read straight from os.environ (SESSION_COOKIE_SECURE).
+        extra = "ignore"
 
 settings = Settings()
@@ -16,22 +16,26 @@ load_dotenv()
 
 from fastapi import FastAPI, Depends, HTTPException, Request, Form, File, UploadFile, Path, Query, status
 from fastapi.responses import Response
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-import psycopg2
-from psycopg2 import pool, errors
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2 import errors
+from psycopg import errors as async_errors
 
 from app import auth_ldap
 from app.core.config import settings
 from app.security import SessionUser, optional_user, require_user, require_admin
 from app.routers import nba as nba_router
+from app.services import async_db, leader, nba_picks, nba_scoring, nba_stats, nba_sync
+from app.services.db_pool import InstrumentedConnectionPool, PoolExhausted, pool_from_env
 from app.services.nba_headers import ensure_nba_api_headers
+from app.services.player_search import PlayerSearchIndex, classify_player_position, like_escape, normalize_name
+from app.services.reference_data import NOTIFY_CHANNEL as NBA_DATA_NOTIFY_CHANNEL, VersionedCache
 
 # Ensure nba_api uses hardened headers before any endpoint instantiation.
 ensure_nba_api_headers()
@@ -70,25 +74,25 @@ NBA_ALL_NBA_SLOT_DEFS: dict[int, dict[str, str]] = {
 }
 
 NBA_CURRENT_SEASON_ID: int | None = None
+# "trgm" while pg_trgm + unaccent are usable, otherwise "memory" (PlayerSearchIndex).
+NBA_PLAYER_SEARCH_MODE = "trgm"
+# Fallback poll of nba_data_versions when no NOTIFY arrives.
+NBA_REFERENCE_POLL_SECONDS = float(os.environ.get("NBA_REFERENCE_POLL_SECONDS", "30"))
+NBA_OVERVIEW_PAGE_SIZE = int(os.environ.get("NBA_OVERVIEW_PAGE_SIZE", "50"))
+# Users read per query; each batch checks out a pooled connection only while it runs.
+NBA_OVERVIEW_FETCH_USERS = int(os.environ.get("NBA_OVERVIEW_FETCH_USERS", "25"))
+# False when nba_pick_counts cannot be created; analytics are then unavailable.
+NBA_PICK_STATS_ENABLED = True
+# The contrarian query scans every pick, so a burst of saves rebuilds the analytics at most this often.
+NBA_PICK_ANALYTICS_MIN_REBUILD_SECONDS = float(os.environ.get("NBA_PICK_ANALYTICS_MIN_REBUILD_SECONDS", "30"))
+# Advisory lock class for per-user pick saves (pg_advisory_xact_lock(class, hashtext(user_uid))).
+NBA_PICKS_LOCK_CLASS = 4_202_621
+# False when the score snapshot tables cannot be created; the scorer is then not started.
+NBA_SCORING_ENABLED = True
+# False when the sync bookkeeping tables cannot be created; the sync worker is then not started.
+NBA_SYNC_ENABLED = True
 
 
-def _classify_player_position(raw: str | None) -> str:
-    """Return guard/forward bucket from a raw position string."""
-    if not raw:
-        return "forward"
-    normalized = str(raw).strip().upper()
-    if not normalized:
-        return "forward"
-    if normalized.startswith(("PG", "SG", "G")):
-        return "guard"
-    if "G" in normalized:
-        return "guard"
-    if normalized.startswith(("SF", "PF", "F", "C")):
-        return "forward"
-    if "F" in normalized or "C" in normalized:
-        return "forward"
-    return "forward"
-
 _BASE_FRAME_DEFINITIONS: dict[str, dict[str, str]] = {
     "default": {
         "label": "Default",
@@ -243,6 +247,7 @@ _HALL_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
 
 FRAME_STORAGE_MODE = "column"
 RATINGS_ENABLED = True
+V2_RATING_STATS_ENABLED = True
 ALLOW_HALL_OF_HATE_PREVIEW = os.environ.get("ALLOW_HALL_OF_HATE_PREVIEW", "false").lower() in {"1", "true", "yes"}
 
 
@@ -323,6 +328,8 @@ app.add_middleware(
     max_age=SESSION_MAX_AGE,
 )
 templates = Jinja2Templates(directory="app/templates")
+# Same loader/filters, but able to iterate async generators and render with generate_async().
+streaming_templates = templates.env.overlay(enable_async=True)
 app.include_router(auth_ldap.router)
 app.include_router(nba_router.router)
 app.mount("/static", StaticFiles(directory="app/images"), name="static")
@@ -331,7 +338,7 @@ app.mount("/static", StaticFiles(directory="app/images"), name="static")
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
-pool: SimpleConnectionPool | None = None
+pool: InstrumentedConnectionPool | None = None
 
 
 def _ensure_schema(conn) -> None:
@@ -538,6 +545,42 @@ def _ensure_schema(conn) -> None:
             conn.rollback()
             raise
 
+    # Ensure Hall of Hate v2 per-villain rating aggregates exist
+    with conn.cursor() as cur:
+        try:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hall_of_hate_v2_rating_stats (
+                    villain_id INTEGER PRIMARY KEY REFERENCES hall_of_hate_v2(id) ON DELETE CASCADE,
+                    rating_sum BIGINT NOT NULL DEFAULT 0,
+                    rating_count INTEGER NOT NULL DEFAULT 0,
+                    average_hate NUMERIC,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+                """
+            )
+            # Backfill villains that predate the aggregate table; existing rows
+            # are left alone so drift stays visible to the verify endpoint.
+            cur.execute(
+                """
+                INSERT INTO hall_of_hate_v2_rating_stats (villain_id, rating_sum, rating_count, average_hate)
+                SELECT v.id, COALESCE(SUM(r.rating), 0), COUNT(r.rating), SUM(r.rating)::numeric / NULLIF(COUNT(r.rating), 0)
+                FROM hall_of_hate_v2 v
+                LEFT JOIN hall_of_hate_v2_ratings r ON r.villain_id = v.id
+                GROUP BY v.id
+                ON CONFLICT (villain_id) DO NOTHING
+                """
+            )
+            conn.commit()
+        except (errors.InsufficientPrivilege, errors.UndefinedTable) as exc:
+            conn.rollback()
+            global V2_RATING_STATS_ENABLED
+            V2_RATING_STATS_ENABLED = False
+            print(f"[HallOfHate v2] Rating aggregates unavailable ({exc.pgcode}); averages will be computed on read.")
+        except Exception:
+            conn.rollback()
+            raise
+
     # Ensure NBA picks structures exist
     with conn.cursor() as cur:
         try:
@@ -590,6 +633,17 @@ def _ensure_schema(conn) -> None:
                 ON nba_players (LOWER(full_name))
                 """
             )
+            # guard/forward bucket precomputed by app.services.nba_sync;
+            # backfill rows imported before the column existed (same rule as
+            # classify_player_position: any "G" in the position means guard).
+            cur.execute("ALTER TABLE nba_players ADD COLUMN IF NOT EXISTS bucket TEXT")
+            cur.execute(
+                """
+                UPDATE nba_players
+                SET bucket = CASE WHEN UPPER(COALESCE(position, '')) LIKE '%G%' THEN 'guard' ELSE 'forward' END
+                WHERE bucket IS NULL
+                """
+            )
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS nba_playoff_picks (
@@ -637,6 +691,20 @@ def _ensure_schema(conn) -> None:
                 )
                 """
             )
+            # Version stamps for reference data (teams/players); bumped by
+            # app.services.nba_sync so app processes can cache it.
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_data_versions (
+                    name TEXT PRIMARY KEY,
+                    version BIGINT NOT NULL DEFAULT 1,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+                """
+            )
+            cur.execute(
+                "INSERT INTO nba_data_versions (name) VALUES ('reference') ON CONFLICT (name) DO NOTHING"
+            )
             # Relax historical constraints in case table existed with stricter schema
             cur.execute(
                 """
@@ -658,6 +726,185 @@ def _ensure_schema(conn) -> None:
             conn.rollback()
             raise
 
+    # Per-season pick popularity, maintained by _replace_user_nba_picks
+    with conn.cursor() as cur:
+        try:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_pick_counts (
+                    season_id INTEGER NOT NULL REFERENCES nba_seasons(id) ON DELETE CASCADE,
+                    kind TEXT NOT NULL,
+                    slot TEXT NOT NULL,
+                    choice TEXT NOT NULL,
+                    picks INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (season_id, kind, slot, choice)
+                )
+                """
+            )
+            # Backfill picks saved before the table existed; like the rating
+            # aggregates, existing rows are left for the verify endpoint.
+            cur.execute(
+                f"""
+                INSERT INTO nba_pick_counts (season_id, kind, slot, choice, picks)
+                SELECT season_id, kind, slot, choice, picks
+                FROM ({nba_picks.PICK_COUNTS_SOURCE_SQL}) source
+                ON CONFLICT (season_id, kind, slot, choice) DO NOTHING
+                """
+            )
+            cur.execute(
+                "INSERT INTO nba_data_versions (name) VALUES ('picks') ON CONFLICT (name) DO NOTHING"
+            )
+            conn.commit()
+        except (errors.InsufficientPrivilege, errors.UndefinedTable) as exc:
+            conn.rollback()
+            global NBA_PICK_STATS_ENABLED
+            NBA_PICK_STATS_ENABLED = False
+            print(f"[NBA] Pick aggregates unavailable ({exc.pgcode}); analytics disabled.")
+        except Exception:
+            conn.rollback()
+            raise
+
+    # Projected score snapshots written by app.services.nba_scoring
+    with conn.cursor() as cur:
+        try:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_score_snapshots (
+                    id SERIAL PRIMARY KEY,
+                    season_id INTEGER NOT NULL REFERENCES nba_seasons(id) ON DELETE CASCADE,
+                    taken_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    digest TEXT NOT NULL,
+                    users INTEGER NOT NULL,
+                    context JSONB
+                )
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS nba_score_snapshots_season_idx
+                ON nba_score_snapshots (season_id, taken_at DESC)
+                """
+            )
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_score_entries (
+                    snapshot_id INTEGER NOT NULL REFERENCES nba_score_snapshots(id) ON DELETE CASCADE,
+                    user_uid TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    playoff_points INTEGER NOT NULL DEFAULT 0,
+                    honor_points INTEGER NOT NULL DEFAULT 0,
+                    all_nba_points INTEGER NOT NULL DEFAULT 0,
+                    total_points INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (snapshot_id, user_uid)
+                )
+                """
+            )
+            conn.commit()
+        except (errors.InsufficientPrivilege, errors.UndefinedTable) as exc:
+            conn.rollback()
+            global NBA_SCORING_ENABLED
+            NBA_SCORING_ENABLED = False
+            print(f"[NBA] Score snapshots unavailable ({exc.pgcode}); scoring disabled.")
+        except Exception:
+            conn.rollback()
+            raise
+
+    # Payload hashes and run log for app.services.nba_sync
+    with conn.cursor() as cur:
+        try:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_sync_state (
+                    entity TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    payload JSONB,
+                    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+                """
+            )
+            cur.execute("ALTER TABLE nba_sync_state ADD COLUMN IF NOT EXISTS payload JSONB")
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nba_sync_runs (
+                    id SERIAL PRIMARY KEY,
+                    triggered_by TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    finished_at TIMESTAMPTZ,
+                    duration_ms INTEGER,
+                    details JSONB,
+                    error TEXT
+                )
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS nba_sync_runs_started_idx
+                ON nba_sync_runs (started_at DESC)
+                """
+            )
+            conn.commit()
+        except errors.InsufficientPrivilege as exc:
+            conn.rollback()
+            global NBA_SYNC_ENABLED
+            NBA_SYNC_ENABLED = False
+            print(f"[NBA] Sync tables unavailable ({exc.pgcode}); sync worker disabled.")
+        except Exception:
+            conn.rollback()
+            raise
+
+    _ensure_player_search_index(conn)
+
+
+# Immutable wrapper so the expression can back an index (unaccent() itself is only STABLE).
+_NBA_SEARCH_NORM_BODY = "SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1))"
+
+
+def _disable_trgm_player_search(reason: str) -> None:
+    global NBA_PLAYER_SEARCH_MODE
+    if NBA_PLAYER_SEARCH_MODE != "memory":
+        print(f"[NBA] Trigram player search unavailable ({reason}); using in-memory index.")
+    NBA_PLAYER_SEARCH_MODE = "memory"
+
+
+def _ensure_player_search_index(conn) -> None:
+    with conn.cursor() as cur:
+        try:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cur.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+            cur.execute("SELECT prosrc FROM pg_proc WHERE proname = 'nba_search_norm'")
+            existing = cur.fetchone()
+            cur.execute(
+                f"""
+                CREATE OR REPLACE FUNCTION nba_search_norm(text) RETURNS text
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+                AS $$ {_NBA_SEARCH_NORM_BODY} $$
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS nba_players_search_trgm_idx
+                ON nba_players USING gin (nba_search_norm(full_name) gin_trgm_ops)
+                """
+            )
+            if existing and existing[0].strip() != _NBA_SEARCH_NORM_BODY:
+                cur.execute("REINDEX INDEX nba_players_search_trgm_idx")
+            conn.commit()
+        except (
+            errors.InsufficientPrivilege,
+            errors.UndefinedFile,
+            errors.UndefinedObject,
+            errors.UndefinedFunction,
+            errors.UndefinedTable,
+        ) as exc:
+            conn.rollback()
+            _disable_trgm_player_search(exc.pgcode or type(exc).__name__)
+        except Exception:
+            conn.rollback()
+            raise
+
 
 def _ensure_nba_season(conn, *, year: int) -> int | None:
     """Create the NBA season row if missing and return its identifier."""
@@ -733,76 +980,197 @@ def _normalize_frame_key(value: str | None) -> str:
     return "default"
 
 
-def _load_nba_teams_by_conference() -> dict[str, list[dict[str, Any]]]:
+async def _fetch_nba_teams_by_conference() -> dict[str, list[dict[str, Any]]]:
     teams: dict[str, list[dict[str, Any]]] = {conf: [] for conf in NBA_CONFERENCES}
-    if not pool:
-        return teams
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id, full_name, abbreviation, conference, city, nickname
-                FROM nba_teams
-                ORDER BY conference, full_name
-                """
-            )
-            for team_id, full_name, abbreviation, conference, city, nickname in cur.fetchall():
-                conf = (conference or "").title()
-                entry = {
-                    "id": team_id,
-                    "name": full_name,
-                    "abbreviation": abbreviation,
-                    "city": city,
-                    "nickname": nickname,
-                }
-                teams.setdefault(conf, []).append(entry)
-    except Exception as exc:
-        print(f"[NBA] Unable to load teams: {exc}")
-    finally:
-        pool.putconn(conn)
+    rows = await async_db.fetch_all(
+        """
+        SELECT id, full_name, abbreviation, conference, city, nickname
+        FROM nba_teams
+        ORDER BY conference, full_name
+        """
+    )
+    for team_id, full_name, abbreviation, conference, city, nickname in rows:
+        conf = (conference or "").title()
+        entry = {
+            "id": team_id,
+            "name": full_name,
+            "abbreviation": abbreviation,
+            "city": city,
+            "nickname": nickname,
+        }
+        teams.setdefault(conf, []).append(entry)
     return teams
 
 
-def _load_nba_player_suggestions(limit: int | None = None) -> list[dict[str, str]]:
-    suggestions: list[dict[str, str]] = []
-    if not pool:
-        return suggestions
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            query = """
-                SELECT p.full_name, COALESCE(p.position, ''), COALESCE(t.full_name, '')
-                FROM nba_players p
-                LEFT JOIN nba_teams t ON t.id = p.team_id
-                ORDER BY p.full_name
-            """
-            params: tuple[Any, ...] = ()
-            if limit is not None:
-                query += " LIMIT %s"
-                params = (limit,)
-                cur.execute(query, params)
-            else:
-                cur.execute(query)
-            for full_name, raw_position, team_name in cur.fetchall():
-                bucket = _classify_player_position(raw_position)
-                suggestions.append(
+async def _fetch_nba_player_suggestions() -> list[dict[str, str]]:
+    rows = await async_db.fetch_all(
+        """
+        SELECT p.full_name, COALESCE(p.position, ''), COALESCE(t.full_name, ''), p.bucket
+        FROM nba_players p
+        LEFT JOIN nba_teams t ON t.id = p.team_id
+        ORDER BY p.full_name
+        """
+    )
+    return [
+        {
+            "name": full_name,
+            "position": (raw_position or "").strip().upper(),
+            "bucket": stored_bucket or classify_player_position(raw_position),
+            "team": team_name,
+        }
+        for full_name, raw_position, team_name, stored_bucket in rows
+    ]
+
+
+def _nba_reference_payload(version: int, teams: dict[str, list[dict[str, Any]]], players: list[dict[str, str]]) -> dict[str, Any]:
+    """Everything /nba-playoffs derives from teams and players, built once per data version."""
+    teams_by_id_int = {team["id"]: team for bucket in teams.values() for team in bucket}
+    teams_by_id = {str(team_id): team for team_id, team in teams_by_id_int.items()}
+    teams_for_merge: dict[Any, dict[str, Any]] = {}
+    teams_for_merge.update(teams_by_id_int)
+    teams_for_merge.update(teams_by_id)
+    return {
+        "version": version,
+        "teams": teams,
+        "teams_by_id": teams_by_id,
+        "teams_for_merge": teams_for_merge,
+        "players": players,
+        "guard_suggestions": [item for item in players if item.get("bucket") == "guard"],
+        "forward_suggestions": [item for item in players if item.get("bucket") != "guard"],
+        "player_lookup": {
+            item["name"].lower(): {
+                "team": item.get("team"),
+                "position": item.get("position"),
+                "bucket": item.get("bucket"),
+            }
+            for item in players
+        },
+        "slot_entries": [
+            {"slot": slot, "label": data["label"], "bucket": data["bucket"]}
+            for slot, data in NBA_ALL_NBA_SLOT_DEFS.items()
+        ],
+        "search_index": PlayerSearchIndex(players),
+        "suggestions_body": json.dumps({"version": version, "players": players}, separators=(",", ":")).encode(),
+    }
+
+
+async def _build_nba_reference_data(version: int) -> dict[str, Any]:
+    teams = await _fetch_nba_teams_by_conference()
+    players = await _fetch_nba_player_suggestions()
+    print(f"[NBA] Reference data v{version}: {len(players)} players, {sum(len(t) for t in teams.values())} teams")
+    return _nba_reference_payload(version, teams, players)
+
+
+nba_reference_cache: VersionedCache[dict[str, Any]] = VersionedCache(
+    "reference",
+    _build_nba_reference_data,
+    poll_interval=NBA_REFERENCE_POLL_SECONDS,
+)
+
+
+async def _nba_reference_data() -> dict[str, Any]:
+    if async_db.is_ready():
+        try:
+            return await nba_reference_cache.get()
+        except Exception as exc:
+            print(f"[NBA] Unable to load reference data: {exc}")
+    return _nba_reference_payload(0, {conf: [] for conf in NBA_CONFERENCES}, [])
+
+
+async def _load_nba_teams_by_conference() -> dict[str, list[dict[str, Any]]]:
+    return (await _nba_reference_data())["teams"]
+
+
+async def _load_nba_player_suggestions(limit: int | None = None) -> list[dict[str, str]]:
+    players = (await _nba_reference_data())["players"]
+    return players if limit is None else players[:limit]
+
+
+async def _search_nba_players(term: str, limit: int, bucket: str | None = None) -> list[dict[str, str]]:
+    """Accent-insensitive search: substring matches (word prefixes first), then fuzzy ones.
+
+    With ``bucket`` set, players from that bucket are ranked ahead of the rest.
+    """
+    normalized = normalize_name(term)
+    if not normalized:
+        return []
+    if NBA_PLAYER_SEARCH_MODE == "trgm":
+        escaped = like_escape(normalized)
+        try:
+            async with async_db.connection() as conn, conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT p.full_name, COALESCE(p.position, ''), COALESCE(t.full_name, ''), p.bucket
+                    FROM nba_players p
+                    LEFT JOIN nba_teams t ON t.id = p.team_id
+                    WHERE nba_search_norm(p.full_name) LIKE %s
+                       OR %s <%% nba_search_norm(p.full_name)
+                    ORDER BY (%s::text IS NOT NULL AND p.bucket IS DISTINCT FROM %s),
+                             nba_search_norm(p.full_name) LIKE %s DESC,
+                             (nba_search_norm(p.full_name) LIKE %s OR nba_search_norm(p.full_name) LIKE %s) DESC,
+                             word_similarity(%s, nba_search_norm(p.full_name)) DESC,
+                             p.full_name
+                    LIMIT %s
+                    """,
+                    (
+                        f"%{escaped}%",
+                        normalized,
+                        bucket,
+                        bucket,
+                        f"%{escaped}%",
+                        f"{escaped}%",
+                        f"% {escaped}%",
+                        normalized,
+                        limit,
+                    ),
+                )
+                return [
                     {
                         "name": full_name,
                         "position": (raw_position or "").strip().upper(),
-                        "bucket": bucket,
                         "team": team_name,
+                        "bucket": stored_bucket or classify_player_position(raw_position),
                     }
-                )
-    except Exception as exc:
-        print(f"[NBA] Unable to load player suggestions: {exc}")
-    finally:
-        pool.putconn(conn)
-    return suggestions
+                    for full_name, raw_position, team_name, stored_bucket in await cur.fetchall()
+                ]
+        except (async_errors.UndefinedFunction, async_errors.UndefinedObject) as exc:
+            _disable_trgm_player_search(exc.sqlstate or type(exc).__name__)
+        except Exception as exc:
+            print(f"[NBA] player search failed: {exc}")
+            return []
+    reference = await _nba_reference_data()
+    return reference["search_index"].search(normalized, limit, bucket)
+
+
+def _subset_player_lookup(player_lookup: dict[str, dict[str, Any]], names) -> dict[str, dict[str, Any]]:
+    """Lookup entries for just the given names, so pages don't embed the whole roster."""
+    wanted = {name.strip().lower() for name in names if name and name.strip()}
+    return {key: player_lookup[key] for key in wanted if key in player_lookup}
+
+
+def _picked_player_names(picks: dict[str, Any]) -> list[str]:
+    names = [entry.get("nominee") for entry in picks.get("honors", {}).values()]
+    names += [entry.get("player_name") for entry in picks.get("all_nba", {}).values()]
+    return [name for name in names if name]
+
+
+@app.get("/api/nba/players/suggestions")
+async def nba_player_suggestions(request: Request, v: str | None = Query(None)):
+    """Full suggestion list, versioned so browsers can cache it until nba_players changes."""
+    reference = await _nba_reference_data()
+    version = str(reference["version"])
+    body = reference["suggestions_body"]
+    etag = f'"{version}"'
+    # A URL pinned to the current version can be cached for a day; anything else must revalidate.
+    cache_control = "public, max-age=86400" if v == version else "public, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/nba/players/search")
-def nba_player_search(
+async def nba_player_search(
     q: str = Query("", min_length=1),
     bucket: str | None = Query(None),
     limit: int = Query(25, ge=1, le=50),
@@ -816,203 +1184,266 @@ def nba_player_search(
         if candidate in {"guard", "forward"}:
             normalized_bucket = candidate
 
-    if not pool:
+    if not async_db.is_ready():
         return {"items": []}
 
-    search_cap = limit * 4 if normalized_bucket else limit
-    items: list[dict[str, str]] = []
-    overflow: list[dict[str, str]] = []
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT p.full_name, COALESCE(p.position, ''), COALESCE(t.full_name, '')
-                FROM nba_players p
-                LEFT JOIN nba_teams t ON t.id = p.team_id
-                WHERE p.full_name ILIKE %s
-                ORDER BY p.full_name
-                LIMIT %s
-                """,
-                (f"%{term}%", search_cap),
-            )
-            for full_name, raw_position, team_name in cur.fetchall():
-                bucket_value = _classify_player_position(raw_position)
-                record = {
-                    "name": full_name,
-                    "position": (raw_position or "").strip().upper(),
-                    "team": team_name,
-                    "bucket": bucket_value,
-                }
-                if normalized_bucket and bucket_value != normalized_bucket:
-                    if len(overflow) < limit:
-                        overflow.append(record)
-                    continue
-                items.append(record)
-                if len(items) >= limit:
-                    break
-    except Exception as exc:
-        print(f"[NBA] player search failed: {exc}")
-    finally:
-        pool.putconn(conn)
-    if normalized_bucket and len(items) < limit:
-        remaining = max(0, limit - len(items))
-        items.extend(overflow[:remaining])
+    items = await _search_nba_players(term, limit, normalized_bucket)
     return {"items": items}
 
 
-def _load_user_nba_picks(user_uid: str) -> dict[str, Any]:
-    data = {
+# One round trip for a user's whole pick sheet; ``kind`` says which table a row came from.
+_USER_NBA_PICKS_SQL = """
+    SELECT 'playoff' AS kind, p.conference AS label, p.seed AS slot, p.team_id,
+           t.full_name AS name, t.abbreviation AS detail, NULL::text AS team_name
+    FROM nba_playoff_picks p
+    LEFT JOIN nba_teams t ON t.id = p.team_id
+    WHERE p.season_id = %s
+      AND p.user_uid = %s
+    UNION ALL
+    SELECT 'honor', h.category, NULL, h.nominee_team_id,
+           h.nominee, NULL, COALESCE(NULLIF(h.nominee_team_name, ''), t.full_name)
+    FROM nba_honor_picks h
+    LEFT JOIN nba_teams t ON t.id = h.nominee_team_id
+    WHERE h.season_id = %s
+      AND h.user_uid = %s
+    UNION ALL
+    SELECT 'all_nba', NULL, a.slot, NULL,
+           a.player_name, a.position, a.team_name
+    FROM nba_all_nba_picks a
+    WHERE a.season_id = %s
+      AND a.user_uid = %s
+    ORDER BY kind, label, slot
+"""
+
+
+def _empty_pick_sheet() -> dict[str, Any]:
+    return {
         "playoff": {conf: {} for conf in NBA_CONFERENCES},
         "honors": {},
         "all_nba": {},
     }
-    if not pool or NBA_CURRENT_SEASON_ID is None:
-        return data
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT p.conference,
-                       p.seed,
-                       p.team_id,
-                       t.full_name,
-                       t.abbreviation
-                FROM nba_playoff_picks p
-                LEFT JOIN nba_teams t ON t.id = p.team_id
-                WHERE p.season_id = %s
-                  AND p.user_uid = %s
-                ORDER BY p.conference, p.seed
-                """,
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for conference, seed, team_id, team_name, abbrev in cur.fetchall():
-                conf_key = (conference or "").title()
-                data["playoff"].setdefault(conf_key, {})
-                data["playoff"][conf_key][int(seed)] = {
-                    "team_id": team_id,
-                    "team_name": team_name,
-                    "abbreviation": abbrev,
-                }
 
-            cur.execute(
-                """
-                SELECT h.category,
-                       h.nominee,
-                       h.nominee_team_id,
-                       h.nominee_team_name,
-                       t.full_name
-                FROM nba_honor_picks h
-                LEFT JOIN nba_teams t ON t.id = h.nominee_team_id
-                WHERE h.season_id = %s
-                  AND h.user_uid = %s
-                """,
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for category, nominee, team_id, team_name_override, team_name in cur.fetchall():
-                team_label = team_name_override or team_name
-                data["honors"][category] = {
-                    "nominee": nominee,
-                    "team_id": team_id,
-                    "team_name": team_label,
-                }
 
-            cur.execute(
-                """
-                SELECT slot, player_name, position, team_name
-                FROM nba_all_nba_picks
-                WHERE season_id = %s
-                  AND user_uid = %s
-                ORDER BY slot
-                """,
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for slot, player_name, position, team_name in cur.fetchall():
-                data["all_nba"][int(slot)] = {
-                    "player_name": player_name,
-                    "position": position,
-                    "team_name": team_name,
-                }
+def _add_pick_row(data: dict[str, Any], kind: str, label, slot, team_id, name, detail, team_name) -> None:
+    """Place one row of the pick sheet queries (see _USER_NBA_PICKS_SQL) into ``data``."""
+    if kind == "playoff":
+        conf_key = (label or "").title()
+        data["playoff"].setdefault(conf_key, {})
+        data["playoff"][conf_key][int(slot)] = {
+            "team_id": team_id,
+            "team_name": name,
+            "abbreviation": detail,
+        }
+    elif kind == "honor":
+        data["honors"][label] = {
+            "nominee": name,
+            "team_id": team_id,
+            "team_name": team_name,
+        }
+    else:
+        data["all_nba"][int(slot)] = {
+            "player_name": name,
+            "position": detail,
+            "team_name": team_name,
+        }
+
+
+async def _load_user_nba_picks(user_uid: str) -> dict[str, Any]:
+    data = _empty_pick_sheet()
+    if not async_db.is_ready() or NBA_CURRENT_SEASON_ID is None:
+        return data
+    try:
+        rows = await async_db.fetch_all(
+            _USER_NBA_PICKS_SQL,
+            (NBA_CURRENT_SEASON_ID, user_uid) * 3,
+        )
     except Exception as exc:
         print(f"[NBA] Unable to load picks for {user_uid}: {exc}")
-    finally:
-        pool.putconn(conn)
+        return data
+    for row in rows:
+        _add_pick_row(data, *row)
     return data
 
 
-def _replace_user_nba_picks(
+async def _replace_user_nba_picks(
     user_uid: str,
     *,
     playoff: dict[str, dict[int, int | None]],
     honors: dict[str, dict[str, Any]],
     all_nba: dict[int, dict[str, str | None]],
-) -> None:
-    if not pool or NBA_CURRENT_SEASON_ID is None:
+) -> dict[str, dict[str, int]]:
+    if not async_db.is_ready() or NBA_CURRENT_SEASON_ID is None:
         raise HTTPException(status_code=500, detail="NBA picks feature no disponible")
 
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "DELETE FROM nba_playoff_picks WHERE season_id = %s AND user_uid = %s",
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for conference, seeds in playoff.items():
-                for seed, team_id in seeds.items():
-                    if not team_id:
-                        continue
-                    cur.execute(
-                        """
-                        INSERT INTO nba_playoff_picks (season_id, user_uid, conference, seed, team_id)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """,
-                        (NBA_CURRENT_SEASON_ID, user_uid, conference, seed, team_id),
-                    )
+    rows = nba_picks.pick_rows(playoff, honors, all_nba)
+    # The pooled connection commits on success and rolls back on error.
+    deltas: list[tuple[str, str, str, int]] = []
+    async with async_db.connection() as conn, conn.cursor() as cur:
+        if NBA_PICK_STATS_ENABLED:
+            previous = await _lock_user_nba_pick_keys(cur, user_uid)
+        written = await nba_picks.write_user_picks(cur, NBA_CURRENT_SEASON_ID, user_uid, rows)
+        if NBA_PICK_STATS_ENABLED:
+            deltas = nba_picks.count_deltas(previous, nba_picks.count_keys(rows))
+            await _apply_nba_pick_count_deltas(cur, deltas)
+    if deltas:
+        nba_pick_analytics_cache.invalidate()
+    return written
+
+
+async def _lock_user_nba_pick_keys(cur, user_uid: str):
+    """Serialize saves of the same user, then read their current pick keys.
+
+    Two saves of one user must not both compute deltas from the same previous
+    picks. Saves of different users only meet on the nba_pick_counts rows they
+    touch, which _apply_nba_pick_count_deltas locks in sorted order.
+    """
+    await cur.execute(
+        "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+        (NBA_PICKS_LOCK_CLASS, user_uid),
+    )
+    await cur.execute(
+        f"""
+        SELECT kind, slot, choice
+        FROM ({nba_picks.PICK_KEYS_SQL}) k
+        WHERE season_id = %s
+          AND user_uid = %s
+        """,
+        (NBA_CURRENT_SEASON_ID, user_uid),
+    )
+    return nba_picks.stored_count_keys(await cur.fetchall())
 
-            cur.execute(
-                "DELETE FROM nba_honor_picks WHERE season_id = %s AND user_uid = %s",
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for category, payload in honors.items():
-                nominee = (payload.get("nominee") or "").strip()
-                team_id = payload.get("team_id")
-                team_name = payload.get("team_name")
-                if not nominee:
-                    continue
-                cur.execute(
-                    """
-                    INSERT INTO nba_honor_picks (season_id, user_uid, category, nominee, nominee_team_id, nominee_team_name)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    (NBA_CURRENT_SEASON_ID, user_uid, category, nominee, team_id, team_name),
-                )
 
-            cur.execute(
-                "DELETE FROM nba_all_nba_picks WHERE season_id = %s AND user_uid = %s",
-                (NBA_CURRENT_SEASON_ID, user_uid),
-            )
-            for slot, payload in all_nba.items():
-                player_name = (payload.get("player_name") or "").strip()
-                team_name = payload.get("team_name")
-                position = (payload.get("position") or None)
-                if not player_name:
-                    continue
-                cur.execute(
-                    """
-                    INSERT INTO nba_all_nba_picks (season_id, user_uid, slot, player_name, position, team_name)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    (NBA_CURRENT_SEASON_ID, user_uid, slot, player_name, position, team_name),
-                )
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        pool.putconn(conn)
+async def _apply_nba_pick_count_deltas(cur, deltas: list[tuple[str, str, str, int]]) -> None:
+    """Add the (kind, slot, choice, delta) rows to nba_pick_counts inside the caller's transaction.
+
+    The 'picks' version is only bumped (and NOTIFY sent with the commit) when a count changed.
+    """
+    if not deltas:
+        return
+    kinds, slots, choices, amounts = (list(column) for column in zip(*deltas))
+    await cur.execute(
+        """
+        INSERT INTO nba_pick_counts AS c (season_id, kind, slot, choice, picks)
+        SELECT %s, d.kind, d.slot, d.choice, d.delta
+        FROM unnest(%s::text[], %s::text[], %s::text[], %s::integer[]) AS d(kind, slot, choice, delta)
+        ORDER BY d.kind, d.slot, d.choice
+        ON CONFLICT (season_id, kind, slot, choice) DO UPDATE
+        SET picks = c.picks + EXCLUDED.picks,
+            updated_at = NOW()
+        """,
+        (NBA_CURRENT_SEASON_ID, kinds, slots, choices, amounts),
+    )
+    await cur.execute(
+        """
+        UPDATE nba_data_versions
+        SET version = version + 1, updated_at = NOW()
+        WHERE name = 'picks'
+        """
+    )
+    await cur.execute("SELECT pg_notify(%s, 'picks')", (NBA_DATA_NOTIFY_CHANNEL,))
+
+
+_NBA_PICK_COUNTS_DRIFT_QUERY = f"""
+    SELECT COALESCE(s.kind, a.kind),
+           COALESCE(s.slot, a.slot),
+           COALESCE(s.choice, a.choice),
+           COALESCE(s.picks, 0),
+           COALESCE(a.picks, 0)
+    FROM (
+        SELECT kind, slot, choice, picks
+        FROM nba_pick_counts
+        WHERE season_id = %s AND picks <> 0
+    ) s
+    FULL JOIN (
+        SELECT kind, slot, choice, picks
+        FROM ({nba_picks.PICK_COUNTS_SOURCE_SQL}) source
+        WHERE season_id = %s
+    ) a ON a.kind = s.kind AND a.slot = s.slot AND a.choice = s.choice
+    WHERE s.picks IS DISTINCT FROM a.picks
+    ORDER BY 1, 2, 3
+"""
+
+
+def _verify_nba_pick_counts(cur) -> list[dict[str, Any]]:
+    """Return pick counts that differ from the pick tables for the current season."""
+    cur.execute(_NBA_PICK_COUNTS_DRIFT_QUERY, (NBA_CURRENT_SEASON_ID, NBA_CURRENT_SEASON_ID))
+    return [
+        {"kind": kind, "slot": slot, "choice": choice, "stored": int(stored), "actual": int(actual)}
+        for kind, slot, choice, stored, actual in cur.fetchall()
+    ]
+
+
+def _rebuild_nba_pick_counts(cur) -> int:
+    """Recompute the current season's pick counts from scratch; returns rows written."""
+    # Waits for in-flight saves and keeps new ones out until the commit; they
+    # take the count rows before the version row, and so does this.
+    cur.execute("LOCK TABLE nba_pick_counts IN EXCLUSIVE MODE")
+    cur.execute("DELETE FROM nba_pick_counts WHERE season_id = %s", (NBA_CURRENT_SEASON_ID,))
+    cur.execute(
+        f"""
+        INSERT INTO nba_pick_counts (season_id, kind, slot, choice, picks)
+        SELECT season_id, kind, slot, choice, picks
+        FROM ({nba_picks.PICK_COUNTS_SOURCE_SQL}) source
+        WHERE season_id = %s
+        """,
+        (NBA_CURRENT_SEASON_ID,),
+    )
+    written = cur.rowcount
+    cur.execute("UPDATE nba_data_versions SET version = version + 1, updated_at = NOW() WHERE name = 'picks'")
+    cur.execute("SELECT pg_notify(%s, 'picks')", (NBA_DATA_NOTIFY_CHANNEL,))
+    return written
+
+
+def _empty_nba_pick_analytics(version: int = 0) -> dict[str, Any]:
+    return {
+        "version": version,
+        "enabled": NBA_PICK_STATS_ENABLED,
+        **nba_picks.summarize_counts([], {}, NBA_CONFERENCES),
+        "contrarian": [],
+    }
+
+
+async def _build_nba_pick_analytics(version: int) -> dict[str, Any]:
+    if not NBA_PICK_STATS_ENABLED or NBA_CURRENT_SEASON_ID is None:
+        return _empty_nba_pick_analytics(version)
+    counts = await async_db.fetch_all(
+        """
+        SELECT kind, slot, choice, picks
+        FROM nba_pick_counts
+        WHERE season_id = %s
+          AND picks > 0
+        """,
+        (NBA_CURRENT_SEASON_ID,),
+    )
+    contrarian = await async_db.fetch_all(nba_picks.CONTRARIAN_SQL, {"season_id": NBA_CURRENT_SEASON_ID})
+    reference = await _nba_reference_data()
+    return {
+        "version": version,
+        "enabled": True,
+        **nba_picks.summarize_counts(counts, reference["teams_by_id"], NBA_CONFERENCES),
+        "contrarian": [
+            {"user_uid": uid, "picks": int(picks), "score": round(float(score) * 100, 1)}
+            for uid, picks, score in contrarian
+        ],
+    }
+
+
+nba_pick_analytics_cache: VersionedCache[dict[str, Any]] = VersionedCache(
+    "picks",
+    _build_nba_pick_analytics,
+    poll_interval=NBA_REFERENCE_POLL_SECONDS,
+    min_rebuild_interval=NBA_PICK_ANALYTICS_MIN_REBUILD_SECONDS,
+)
 
 
+async def _nba_pick_analytics() -> dict[str, Any]:
+    if async_db.is_ready() and NBA_PICK_STATS_ENABLED:
+        try:
+            return await nba_pick_analytics_cache.get()
+        except Exception as exc:
+            print(f"[NBA] Unable to load pick analytics: {exc}")
+    return _empty_nba_pick_analytics()
+
 def _merge_form_into_picks(
     picks: dict[str, Any],
     *,
@@ -1070,99 +1501,112 @@ def _merge_form_into_picks(
     return merged
 
 
-def _load_all_users_nba_picks() -> list[dict[str, Any]]:
-    if not pool or NBA_CURRENT_SEASON_ID is None:
-        return []
-    conn = pool.getconn()
-    try:
-        users: dict[str, dict[str, Any]] = {}
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT p.user_uid,
-                       p.conference,
-                       p.seed,
-                       t.full_name,
-                       t.abbreviation
-                FROM nba_playoff_picks p
-                LEFT JOIN nba_teams t ON t.id = p.team_id
-                WHERE p.season_id = %s
-                ORDER BY p.user_uid, p.conference, p.seed
-                """,
-                (NBA_CURRENT_SEASON_ID,),
-            )
-            for uid, conference, seed, team_name, abbreviation in cur.fetchall():
-                record = users.setdefault(
-                    uid,
-                    {
-                        "user_uid": uid,
-                        "playoff": {conf: {} for conf in NBA_CONFERENCES},
-                        "honors": {},
-                        "all_nba": {},
-                    },
-                )
-                conf_key = (conference or "").title()
-                record["playoff"].setdefault(conf_key, {})
-                record["playoff"][conf_key][int(seed)] = {
-                    "team_name": team_name,
-                    "abbreviation": abbreviation,
-                }
+# Every user's sheet for one page of users, ordered so rows of a user are contiguous.
+_ALL_USERS_NBA_PICKS_SQL = """
+    WITH page_users AS (
+        SELECT user_uid
+        FROM (
+            SELECT user_uid FROM nba_playoff_picks WHERE season_id = %(season_id)s
+            UNION
+            SELECT user_uid FROM nba_honor_picks WHERE season_id = %(season_id)s
+            UNION
+            SELECT user_uid FROM nba_all_nba_picks WHERE season_id = %(season_id)s
+        ) users
+        WHERE user_uid > %(after)s
+          AND user_uid ILIKE %(pattern)s
+        ORDER BY user_uid
+        LIMIT %(limit)s
+    )
+    SELECT p.user_uid, 'playoff' AS kind, p.conference AS label, p.seed AS slot, p.team_id,
+           t.full_name AS name, t.abbreviation AS detail, NULL::text AS team_name
+    FROM page_users u
+    JOIN nba_playoff_picks p ON p.user_uid = u.user_uid AND p.season_id = %(season_id)s
+    LEFT JOIN nba_teams t ON t.id = p.team_id
+    UNION ALL
+    SELECT h.user_uid, 'honor', h.category, NULL, h.nominee_team_id,
+           h.nominee, NULL, h.nominee_team_name
+    FROM page_users u
+    JOIN nba_honor_picks h ON h.user_uid = u.user_uid AND h.season_id = %(season_id)s
+    UNION ALL
+    SELECT a.user_uid, 'all_nba', NULL, a.slot, NULL,
+           a.player_name, a.position, a.team_name
+    FROM page_users u
+    JOIN nba_all_nba_picks a ON a.user_uid = u.user_uid AND a.season_id = %(season_id)s
+    ORDER BY user_uid, kind, label, slot
+"""
+
+
+def _group_nba_pick_rows(rows: list[tuple]) -> list[dict[str, Any]]:
+    """Fold rows ordered by user_uid into one pick sheet per user."""
+    sheets: list[dict[str, Any]] = []
+    for uid, *row in rows:
+        if not sheets or sheets[-1]["user_uid"] != uid:
+            sheets.append({"user_uid": uid, **_empty_pick_sheet()})
+        _add_pick_row(sheets[-1], *row)
+    return sheets
+
+
+async def _iter_all_users_nba_picks(
+    page: dict[str, Any],
+    *,
+    after: str = "",
+    user_filter: str = "",
+    limit: int = NBA_OVERVIEW_PAGE_SIZE,
+):
+    """Yield one user's pick sheet at a time, NBA_OVERVIEW_FETCH_USERS users per query.
 
-            cur.execute(
-                """
-                SELECT user_uid, category, nominee, nominee_team_name
-                FROM nba_honor_picks
-                WHERE season_id = %s
-                ORDER BY user_uid, category
-                """,
-                (NBA_CURRENT_SEASON_ID,),
+    Reads at most ``limit`` users after ``after`` (keyset pagination on
+    user_uid). Each batch runs on its own short checkout, so a slow client
+    never keeps a pooled connection while the page streams. Once the generator
+    is exhausted ``page["next_after"]`` holds the uid to continue from, or None
+    on the last page; ``page["error"]`` is set if a batch failed.
+    """
+    page["next_after"] = None
+    page["error"] = False
+    if not async_db.is_ready() or NBA_CURRENT_SEASON_ID is None:
+        return
+    params = {
+        "season_id": NBA_CURRENT_SEASON_ID,
+        "pattern": f"%{like_escape(user_filter.strip())}%" if user_filter.strip() else "%",
+    }
+    cursor_uid = after or ""
+    remaining = limit
+    while remaining > 0:
+        wanted = min(remaining, max(NBA_OVERVIEW_FETCH_USERS, 1))
+        # On the last batch one extra user tells us whether there is a next page.
+        last_batch = wanted == remaining
+        try:
+            rows = await async_db.fetch_all(
+                _ALL_USERS_NBA_PICKS_SQL,
+                {**params, "after": cursor_uid, "limit": wanted + 1 if last_batch else wanted},
             )
-            for uid, category, nominee, team_name in cur.fetchall():
-                record = users.setdefault(
-                    uid,
-                    {
-                        "user_uid": uid,
-                        "playoff": {conf: {} for conf in NBA_CONFERENCES},
-                        "honors": {},
-                        "all_nba": {},
-                    },
-                )
-                record["honors"][category] = {
-                    "nominee": nominee,
-                    "team_name": team_name,
-                }
+        except Exception as exc:
+            print(f"[NBA] Unable to load aggregated picks after {cursor_uid!r}: {exc}")
+            page["error"] = True
+            return
+        sheets = _group_nba_pick_rows(rows)
+        if last_batch and len(sheets) > wanted:
+            sheets = sheets[:wanted]
+            page["next_after"] = sheets[-1]["user_uid"]
+        for sheet in sheets:
+            yield sheet
+        if last_batch or len(sheets) < wanted:
+            return
+        remaining -= wanted
+        cursor_uid = sheets[-1]["user_uid"]
 
-            cur.execute(
-                """
-                SELECT user_uid, slot, player_name, position, team_name
-                FROM nba_all_nba_picks
-                WHERE season_id = %s
-                ORDER BY user_uid, slot
-                """,
-                (NBA_CURRENT_SEASON_ID,),
-            )
-            for uid, slot, player_name, position, team_name in cur.fetchall():
-                record = users.setdefault(
-                    uid,
-                    {
-                        "user_uid": uid,
-                        "playoff": {conf: {} for conf in NBA_CONFERENCES},
-                        "honors": {},
-                        "all_nba": {},
-                    },
-                )
-                record["all_nba"][int(slot)] = {
-                    "player_name": player_name,
-                    "position": position,
-                    "team_name": team_name,
-                }
-        ordered = sorted(users.values(), key=lambda item: item["user_uid"])
-        return ordered
+
+async def _stream_overview(body):
+    """Pass the rendered chunks through; log and close the page cleanly if rendering fails midway."""
+    try:
+        async for chunk in body:
+            yield chunk
     except Exception as exc:
-        print(f"[NBA] Unable to load aggregated picks: {exc}")
-        return []
-    finally:
-        pool.putconn(conn)
+        print(f"[NBA] Overview stream failed after the headers were sent: {exc}")
+        yield (
+            '<p class="stream-error">No se pudieron cargar todos los picks; recarga la página.</p>'
+            "</div></body></html>"
+        )
 
 def _store_frame_key(cur, entry_id: int, frame_key: str) -> None:
     key = _normalize_frame_key(frame_key)
@@ -1311,59 +1755,88 @@ def _seed_hall_of_hate_defaults(conn) -> None:
             raise
 
 
-def _fetch_hall_of_hate_db_entries(current_uid: str | None) -> list[dict[str, str | None | float | int]]:
-    if not pool:
-        return []
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            if FRAME_STORAGE_MODE == "column":
-                frame_expr = "COALESCE(h.frame_key, 'default')"
-                join_clause = ""
-                group_columns = "h.id, h.name, h.image_filename, h.frame_key, h.created_at"
-            elif FRAME_STORAGE_MODE == "table":
-                frame_expr = "COALESCE(f.frame_key, 'default')"
-                join_clause = "LEFT JOIN hall_of_hate_frames f ON f.entry_id = h.id"
-                group_columns = "h.id, h.name, h.image_filename, f.frame_key, h.created_at"
-            else:  # none
-                frame_expr = "'default'"
-                join_clause = ""
-                group_columns = "h.id, h.name, h.image_filename, h.created_at"
-
-            if RATINGS_ENABLED:
-                ratings_join = "LEFT JOIN hall_of_hate_ratings r ON r.entry_id = h.id"
-                select_ratings = "COALESCE(AVG(r.rating), 99) AS avg_rating, COUNT(r.rating) AS rating_count, COALESCE(MAX(CASE WHEN r.uid = %s THEN r.rating END), 99) AS current_user_rating"
-                group_by = group_columns
-                params = (current_uid,)
-            else:
-                ratings_join = ""
-                select_ratings = "99 AS avg_rating, 0 AS rating_count, 99 AS current_user_rating"
-                group_by = group_columns
-                params = tuple()
+async def _fetch_hall_of_hate_db_entries(
+    current_uid: str | None,
+    roster_uids: list[str] | None = None,
+) -> list[dict[str, str | None | float | int]]:
+    """Return v1 entries with the roster-wide average computed in one statement.
 
-            query = f"""
-                SELECT
-                    h.id,
-                    h.name,
-                    h.image_filename,
-                    {frame_expr} AS frame_key,
-                    {select_ratings}
-                FROM hall_of_hate h
-                {join_clause}
-                {ratings_join}
-                GROUP BY {group_by}
-                ORDER BY h.created_at DESC, h.id DESC
+    Every LDAP user counts towards the average, defaulting to 99 when they have
+    not rated an entry. The roster is fetched at most once per call (callers
+    that already have it can pass ``roster_uids``) and sent to Postgres as a
+    text array so the whole listing costs a single query.
+    """
+    if not async_db.is_ready():
+        return []
+    if RATINGS_ENABLED and roster_uids is None:
+        roster_uids = await run_in_threadpool(auth_ldap.fetch_all_user_uids)
+    roster = sorted(set(roster_uids or []))
+    async with async_db.connection() as conn, conn.cursor() as cur:
+        if FRAME_STORAGE_MODE == "column":
+            frame_expr = "COALESCE(h.frame_key, 'default')"
+            join_clause = ""
+            group_columns = "h.id, h.name, h.image_filename, h.frame_key, h.created_at"
+        elif FRAME_STORAGE_MODE == "table":
+            frame_expr = "COALESCE(f.frame_key, 'default')"
+            join_clause = "LEFT JOIN hall_of_hate_frames f ON f.entry_id = h.id"
+            group_columns = "h.id, h.name, h.image_filename, f.frame_key, h.created_at"
+        else:  # none
+            frame_expr = "'default'"
+            join_clause = ""
+            group_columns = "h.id, h.name, h.image_filename, h.created_at"
+
+        if RATINGS_ENABLED:
+            # Unrated roster members count as 99:
+            # (sum of roster ratings + 99 * roster members without a rating) / roster size
+            ratings_join = (
+                "CROSS JOIN (SELECT %s::text[] AS uids) roster "
+                "LEFT JOIN hall_of_hate_ratings r ON r.entry_id = h.id"
+            )
+            select_ratings = """
+                CASE
+                    WHEN cardinality(roster.uids) = 0 THEN 99
+                    ELSE (
+                        COALESCE(SUM(r.rating) FILTER (WHERE r.uid = ANY(roster.uids)), 0)
+                        + 99 * (cardinality(roster.uids) - COUNT(r.rating) FILTER (WHERE r.uid = ANY(roster.uids)))
+                    )::float / cardinality(roster.uids)
+                END AS avg_rating,
+                COUNT(r.rating) AS rating_count,
+                COALESCE(MAX(CASE WHEN r.uid = %s THEN r.rating END), 99) AS current_user_rating
             """
-            try:
-                cur.execute(query, params)
-            except errors.UndefinedTable:
-                _disable_frame_storage("hall_of_hate_frames table missing")
-                if FRAME_STORAGE_MODE != "table":
-                    return _fetch_hall_of_hate_db_entries(current_uid)
+            group_by = f"{group_columns}, roster.uids"
+            params = (current_uid, roster)
+        else:
+            ratings_join = ""
+            select_ratings = "99 AS avg_rating, 0 AS rating_count, 99 AS current_user_rating"
+            group_by = group_columns
+            params = tuple()
+
+        query = f"""
+            SELECT
+                h.id,
+                h.name,
+                h.image_filename,
+                {frame_expr} AS frame_key,
+                {select_ratings}
+            FROM hall_of_hate h
+            {join_clause}
+            {ratings_join}
+            GROUP BY {group_by}
+            ORDER BY h.created_at DESC, h.id DESC
+        """
+        try:
+            await cur.execute(query, params)
+            rows = await cur.fetchall()
+        except async_errors.UndefinedTable:
+            await conn.rollback()
+            _disable_frame_storage("hall_of_hate_frames table missing")
+            if FRAME_STORAGE_MODE == "table":
                 raise
-            rows = cur.fetchall()
-    finally:
-        pool.putconn(conn)
+            rows = None
+
+    if rows is None:
+        # Retry with the new frame mode only after this connection went back to the pool.
+        return await _fetch_hall_of_hate_db_entries(current_uid, roster)
 
     entries: list[dict[str, str | None | float | int]] = []
     for entry_id, name, image_filename, frame_key, avg_rating, rating_count, user_rating in rows:
@@ -1373,9 +1846,7 @@ def _fetch_hall_of_hate_db_entries(current_uid: str | None) -> list[dict[str, st
             if _static_path_exists(candidate):
                 image_path = candidate
         frame_key = _normalize_frame_key(frame_key)
-        
-        # Use proper average calculation that considers all LDAP users default to 99
-        proper_avg_value = _calculate_proper_average_hate(entry_id)
+        proper_avg_value = float(avg_rating) if avg_rating is not None else 99.0
         count_value = int(rating_count or 0)
         user_rating_value = int(user_rating) if user_rating is not None else 99
         entries.append({
@@ -1639,58 +2110,122 @@ def _set_hall_of_hate_rating(entry_id: int, uid: str, rating: int) -> None:
         pool.putconn(conn)
 
 
-def _calculate_proper_average_hate(entry_id: int) -> float:
-    """Calculate average hate considering all LDAP users default to 99"""
-    if not pool or not RATINGS_ENABLED:
-        print(f"[DEBUG] Ratings disabled or no pool for entry {entry_id}")
-        return 99.0
-    
-    # Get all LDAP users
-    all_users = auth_ldap.fetch_all_user_uids()
-    if not all_users:
-        print(f"[DEBUG] No LDAP users found for entry {entry_id}")
-        return 99.0
-    
-    total_users = len(all_users)
-    print(f"[DEBUG] Total LDAP users: {total_users}, users: {all_users}")
-    
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            # Get all current ratings for this entry
-            cur.execute(
-                """
-                SELECT uid, rating 
-                FROM hall_of_hate_ratings 
-                WHERE entry_id = %s
-                """,
-                (entry_id,)
-            )
-            ratings = cur.fetchall()
-            print(f"[DEBUG] Found ratings for entry {entry_id}: {ratings}")
-            
-            # Create a map of user ratings
-            user_ratings = {uid: rating for uid, rating in ratings}
-            
-            # Calculate average with all users defaulting to 99
-            total_score = 0
-            user_scores = []
-            for user in all_users:
-                score = user_ratings.get(user, 99)  # Default to 99 if not rated
-                total_score += score
-                user_scores.append(f"{user}:{score}")
-                
-            average = total_score / total_users
-            print(f"[DEBUG] Entry {entry_id} calculation: {' + '.join(user_scores)} = {total_score} / {total_users} = {average}")
-            return average
-            
-    finally:
-        pool.putconn(conn)
+async def _apply_v2_rating_stats_delta(cur, villain_id: int, sum_delta: int, count_delta: int) -> None:
+    """Adjust a villain's rating aggregate inside the caller's transaction."""
+    if not V2_RATING_STATS_ENABLED:
+        return
+    await cur.execute(
+        """
+        INSERT INTO hall_of_hate_v2_rating_stats AS s (villain_id, rating_sum, rating_count, average_hate)
+        VALUES (%s, %s, %s, %s::numeric / NULLIF(%s, 0))
+        ON CONFLICT (villain_id) DO UPDATE
+        SET rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+            rating_count = s.rating_count + EXCLUDED.rating_count,
+            average_hate = (s.rating_sum + EXCLUDED.rating_sum)::numeric
+                           / NULLIF(s.rating_count + EXCLUDED.rating_count, 0),
+            updated_at = NOW()
+        """,
+        (villain_id, sum_delta, count_delta, sum_delta, count_delta),
+    )
+
+
+async def _lock_v2_rating_stats(cur, villain_id: int) -> None:
+    """Serialize rating writers for one villain on its aggregate row."""
+    if not V2_RATING_STATS_ENABLED:
+        return
+    await cur.execute(
+        """
+        INSERT INTO hall_of_hate_v2_rating_stats (villain_id)
+        VALUES (%s)
+        ON CONFLICT (villain_id) DO NOTHING
+        """,
+        (villain_id,),
+    )
+    await cur.execute(
+        "SELECT 1 FROM hall_of_hate_v2_rating_stats WHERE villain_id = %s FOR UPDATE",
+        (villain_id,),
+    )
+
+
+def _get_v2_average_hate(cur, villain_id: int) -> float:
+    if V2_RATING_STATS_ENABLED:
+        cur.execute(
+            "SELECT average_hate FROM hall_of_hate_v2_rating_stats WHERE villain_id = %s",
+            (villain_id,),
+        )
+    else:
+        cur.execute(
+            "SELECT AVG(rating) FROM hall_of_hate_v2_ratings WHERE villain_id = %s",
+            (villain_id,),
+        )
+    row = cur.fetchone()
+    if not row or row[0] is None:
+        return 99
+    return row[0]
+
+
+_V2_RATING_STATS_DRIFT_QUERY = """
+    SELECT v.id,
+           s.villain_id IS NOT NULL AS has_stats,
+           COALESCE(s.rating_sum, 0),
+           COALESCE(s.rating_count, 0),
+           COALESCE(a.rating_sum, 0),
+           COALESCE(a.rating_count, 0)
+    FROM hall_of_hate_v2 v
+    LEFT JOIN hall_of_hate_v2_rating_stats s ON s.villain_id = v.id
+    LEFT JOIN (
+        SELECT villain_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+        FROM hall_of_hate_v2_ratings
+        GROUP BY villain_id
+    ) a ON a.villain_id = v.id
+    WHERE s.villain_id IS NULL
+       OR s.rating_sum <> COALESCE(a.rating_sum, 0)
+       OR s.rating_count <> COALESCE(a.rating_count, 0)
+       OR s.average_hate IS DISTINCT FROM a.rating_sum::numeric / NULLIF(a.rating_count, 0)
+    ORDER BY v.id
+"""
+
+
+def _verify_v2_rating_stats(cur) -> list[dict[str, Any]]:
+    """Return villains whose stored aggregate differs from the ratings table."""
+    cur.execute(_V2_RATING_STATS_DRIFT_QUERY)
+    drift: list[dict[str, Any]] = []
+    for villain_id, has_stats, stored_sum, stored_count, actual_sum, actual_count in cur.fetchall():
+        drift.append(
+            {
+                "villain_id": villain_id,
+                "missing": not has_stats,
+                "stored_sum": int(stored_sum),
+                "stored_count": int(stored_count),
+                "actual_sum": int(actual_sum),
+                "actual_count": int(actual_count),
+            }
+        )
+    return drift
+
+
+def _rebuild_v2_rating_stats(cur) -> int:
+    """Recompute every villain aggregate from scratch; returns rows written."""
+    cur.execute(
+        """
+        INSERT INTO hall_of_hate_v2_rating_stats AS s (villain_id, rating_sum, rating_count, average_hate, updated_at)
+        SELECT v.id, COALESCE(SUM(r.rating), 0), COUNT(r.rating), SUM(r.rating)::numeric / NULLIF(COUNT(r.rating), 0), NOW()
+        FROM hall_of_hate_v2 v
+        LEFT JOIN hall_of_hate_v2_ratings r ON r.villain_id = v.id
+        GROUP BY v.id
+        ON CONFLICT (villain_id) DO UPDATE
+        SET rating_sum = EXCLUDED.rating_sum,
+            rating_count = EXCLUDED.rating_count,
+            average_hate = EXCLUDED.average_hate,
+            updated_at = EXCLUDED.updated_at
+        """
+    )
+    return cur.rowcount
 
 
-def _hall_of_hate_entries(current_user: SessionUser | None) -> list[dict[str, str | None | float | int]]:
+async def _hall_of_hate_entries(current_user: SessionUser | None) -> list[dict[str, str | None | float | int]]:
     uid = current_user["uid"] if current_user else None
-    return _fetch_hall_of_hate_db_entries(uid)
+    return await _fetch_hall_of_hate_db_entries(uid)
 
 def _get_hall_of_hate_entries(current_user: SessionUser | None) -> list[dict[str, str | None | float | int]]:
     """Get Hall of Hate v2 entries with calculated averages"""
@@ -1704,51 +2239,60 @@ def _get_hall_of_hate_entries(current_user: SessionUser | None) -> list[dict[str
     # except Exception as e:
     #     print(f"Warning: Could not clean up orphaned ratings: {e}")
     
+    # Handle both test users (with "id") and authenticated users (with "uid")
+    user_id = None
+    if current_user:
+        user_id = current_user.get("id") or current_user.get("uid")
+
     conn = pool.getconn()
     try:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                hv2.id,
-                hv2.name, 
-                hv2.image_filename,
-                hv2.frame_type,
-                COALESCE(
-                    (SELECT AVG(rating) FROM hall_of_hate_v2_ratings WHERE villain_id = hv2.id), 
-                    99
-                ) as average_hate
-            FROM hall_of_hate_v2 hv2
-            ORDER BY average_hate DESC
-        """)
+        if V2_RATING_STATS_ENABLED:
+            # Averages are maintained on write; the user's rating is a lookup
+            # on the (villain_id, user_name) unique index.
+            cursor.execute("""
+                SELECT
+                    hv2.id,
+                    hv2.name,
+                    hv2.image_filename,
+                    hv2.frame_type,
+                    COALESCE(s.average_hate, 99) AS average_hate,
+                    r.rating AS user_rating
+                FROM hall_of_hate_v2 hv2
+                LEFT JOIN hall_of_hate_v2_rating_stats s ON s.villain_id = hv2.id
+                LEFT JOIN hall_of_hate_v2_ratings r ON r.villain_id = hv2.id AND r.user_name = %s
+                ORDER BY average_hate DESC
+            """, (user_id,))
+        else:
+            # One pass over the ratings: the average and the current user's own
+            # rating come out of the same GROUP BY, so the page cost does not grow
+            # with the number of villains.
+            cursor.execute("""
+                SELECT
+                    hv2.id,
+                    hv2.name,
+                    hv2.image_filename,
+                    hv2.frame_type,
+                    COALESCE(AVG(r.rating), 99) AS average_hate,
+                    MAX(r.rating) FILTER (WHERE r.user_name = %s) AS user_rating
+                FROM hall_of_hate_v2 hv2
+                LEFT JOIN hall_of_hate_v2_ratings r ON r.villain_id = hv2.id
+                GROUP BY hv2.id
+                ORDER BY average_hate DESC
+            """, (user_id,))
         results = cursor.fetchall()
-        
+
         entries = []
-        for row in results:
-            villain_id, name, image_filename, frame_type, average_hate = row
-            
-            # Get user's rating if available
-            user_rating = 99  # Default for unrated
-            if current_user:
-                # Handle both test users (with "id") and authenticated users (with "uid")
-                user_id = current_user.get("id") or current_user.get("uid")
-                if user_id:
-                    cursor.execute(
-                        "SELECT rating FROM hall_of_hate_v2_ratings WHERE villain_id = %s AND user_name = %s",
-                        (villain_id, user_id)
-                    )
-                    rating_result = cursor.fetchone()
-                    if rating_result:
-                        user_rating = rating_result[0]
-            
+        for villain_id, name, image_filename, frame_type, average_hate, user_rating in results:
             entries.append({
                 "id": villain_id,
                 "name": name,
                 "hate_score": int(average_hate),
                 "image_filename": image_filename,
                 "frame_type": frame_type or "default",
-                "user_rating": user_rating
+                "user_rating": user_rating if user_rating is not None else 99  # Default for unrated
             })
-        
+
         return entries
     except Exception as e:
         print(f"Error fetching v2 entries: {e}")
@@ -1756,13 +2300,37 @@ def _get_hall_of_hate_entries(current_user: SessionUser | None) -> list[dict[str
     finally:
         pool.putconn(conn)
 
+def _start_background_jobs() -> None:
+    """Runs in the process that won the jobs election (see app.services.leader)."""
+    if nba_stats.cache_is_shared():
+        nba_stats.start_warmer()
+    if NBA_SCORING_ENABLED:
+        nba_scoring.start_scorer(pool, lambda: NBA_CURRENT_SEASON_ID)
+    if NBA_SYNC_ENABLED:
+        nba_sync.start_sync_worker(DATABASE_URL)
+
+
+def _stop_background_jobs() -> None:
+    if nba_stats.cache_is_shared():
+        nba_stats.stop_warmer()
+    nba_scoring.stop_scorer()
+    nba_sync.stop_sync_worker()
+
+
+jobs_leader: leader.JobsLeader | None = None
+
+
 @app.on_event("startup")
 def startup_db():
     global pool
     if not DATABASE_URL:
         # Usa el ConfigMap ya desplegado en K8s; localmente puedes exportar DATABASE_URL
         raise RuntimeError("DATABASE_URL no está definido")
-    pool = SimpleConnectionPool(minconn=1, maxconn=5, dsn=DATABASE_URL)
+    pool = pool_from_env(DATABASE_URL)
+    nba_stats.configure_cache(pool)
+    if not nba_stats.cache_is_shared():
+        # A per-process cache is only warmed by its own process.
+        nba_stats.start_warmer()
     HALL_OF_HATE_DIR.mkdir(parents=True, exist_ok=True)
     HALL_OF_HATE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     conn = pool.getconn()
@@ -1775,14 +2343,44 @@ def startup_db():
             print("[NBA] Warning: could not initialize NBA season record.")
     finally:
         pool.putconn(conn)
+    global jobs_leader
+    jobs_leader = leader.JobsLeader(DATABASE_URL, _start_background_jobs, _stop_background_jobs)
+    jobs_leader.start()
+
+@app.on_event("startup")
+async def startup_async_db():
+    # Runs after startup_db, so the schema is already in place.
+    await async_db.open_pool(DATABASE_URL)
+    nba_reference_cache.start_listener(DATABASE_URL)
+    nba_pick_analytics_cache.start_listener(DATABASE_URL)
 
 @app.on_event("shutdown")
 def shutdown_db():
     global pool
+    if jobs_leader is not None:
+        jobs_leader.stop()
+    nba_stats.stop_warmer()
     if pool:
         pool.closeall()
         pool = None
 
+@app.on_event("shutdown")
+async def shutdown_async_db():
+    await nba_reference_cache.stop_listener()
+    await nba_pick_analytics_cache.stop_listener()
+    await async_db.close_pool()
+
+@app.exception_handler(PoolExhausted)
+@app.exception_handler(async_db.PoolTimeout)
+@app.exception_handler(async_db.TooManyRequests)
+async def pool_exhausted_handler(request: Request, exc: Exception):
+    print(f"[DB] {exc}")
+    return Response(
+        content="Servicio saturado, inténtalo de nuevo en unos segundos",
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "2"},
+    )
+
 @app.get("/", response_class=HTMLResponse)
 def root_redirect(current_user: SessionUser | None = Depends(optional_user)):
     # redirect logged users to their dashboard, others to login
@@ -1810,24 +2408,13 @@ def test_download_page(request: Request):
 
 
 @app.get("/nba-playoffs", response_class=HTMLResponse)
-def nba_playoffs_page(request: Request, current_user: SessionUser = Depends(require_user)):
-    teams = _load_nba_teams_by_conference()
-    picks = _load_user_nba_picks(current_user["uid"])
-    player_suggestions = _load_nba_player_suggestions()
-    guard_suggestions = [item for item in player_suggestions if item.get("bucket") == "guard"]
-    forward_suggestions = [item for item in player_suggestions if item.get("bucket") != "guard"]
-    player_lookup = {
-        item["name"].lower(): {
-            "team": item.get("team"),
-            "position": item.get("position"),
-            "bucket": item.get("bucket"),
-        }
-        for item in player_suggestions
-    }
-    slot_entries = [
-        {"slot": slot, "label": data["label"], "bucket": data["bucket"]}
-        for slot, data in NBA_ALL_NBA_SLOT_DEFS.items()
-    ]
+async def nba_playoffs_page(request: Request, current_user: SessionUser = Depends(require_user)):
+    reference = await _nba_reference_data()
+    teams = reference["teams"]
+    picks = await _load_user_nba_picks(current_user["uid"])
+    player_lookup = _subset_player_lookup(reference["player_lookup"], _picked_player_names(picks))
+    suggestions_url = f"/api/nba/players/suggestions?v={reference['version']}"
+    slot_entries = reference["slot_entries"]
     saved = request.query_params.get("saved")
     status_message = "✅ Selecciones guardadas" if saved else None
     context = {
@@ -1835,10 +2422,8 @@ def nba_playoffs_page(request: Request, current_user: SessionUser = Depends(requ
         "season_year": NBA_TARGET_SEASON_YEAR,
         "teams": teams,
         "picks": picks,
-        "player_suggestions": player_suggestions,
-        "guard_suggestions": guard_suggestions,
-        "forward_suggestions": forward_suggestions,
         "player_lookup": player_lookup,
+        "suggestions_url": suggestions_url,
         "slot_entries": slot_entries,
         "honor_categories": NBA_HONOR_CATEGORIES,
         "status_message": status_message,
@@ -1853,27 +2438,12 @@ def nba_playoffs_page(request: Request, current_user: SessionUser = Depends(requ
 @app.post("/nba-playoffs", response_class=HTMLResponse)
 async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depends(require_user)):
     form = await request.form()
-    teams = _load_nba_teams_by_conference()
-    player_suggestions = _load_nba_player_suggestions()
-    guard_suggestions = [item for item in player_suggestions if item.get("bucket") == "guard"]
-    forward_suggestions = [item for item in player_suggestions if item.get("bucket") != "guard"]
-    player_lookup = {
-        item["name"].lower(): {
-            "team": item.get("team"),
-            "position": item.get("position"),
-            "bucket": item.get("bucket"),
-        }
-        for item in player_suggestions
-    }
-    slot_entries = [
-        {"slot": slot, "label": data["label"], "bucket": data["bucket"]}
-        for slot, data in NBA_ALL_NBA_SLOT_DEFS.items()
-    ]
-    teams_by_id_int = {team["id"]: team for bucket in teams.values() for team in bucket}
-    teams_by_id = {str(team_id): team for team_id, team in teams_by_id_int.items()}
-    teams_for_merge: dict[Any, dict[str, Any]] = {}
-    teams_for_merge.update(teams_by_id_int)
-    teams_for_merge.update(teams_by_id)
+    reference = await _nba_reference_data()
+    teams = reference["teams"]
+    slot_entries = reference["slot_entries"]
+    player_lookup = reference["player_lookup"]
+    teams_by_id = reference["teams_by_id"]
+    teams_for_merge = reference["teams_for_merge"]
 
     playoff_payload: dict[str, dict[int, int | None]] = {conf: {} for conf in NBA_CONFERENCES}
     duplicates: list[str] = []
@@ -1936,7 +2506,7 @@ async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depe
         }
         if player:
             lookup_entry = player_lookup.get(player.lower())
-            bucket = _classify_player_position(lookup_entry.get("position") if lookup_entry else None)
+            bucket = classify_player_position(lookup_entry.get("position") if lookup_entry else None)
             if not team_name and lookup_entry and lookup_entry.get("team"):
                 team_name = lookup_entry["team"]
                 all_nba_payload[slot]["team_name"] = team_name
@@ -1963,7 +2533,7 @@ async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depe
         error_messages.append("Debes elegir máximo 2 guards y máximo 3 forwards.")
 
     if error_messages:
-        base_picks = _load_user_nba_picks(current_user["uid"])
+        base_picks = await _load_user_nba_picks(current_user["uid"])
         attempt_picks = _merge_form_into_picks(
             base_picks,
             playoff_payload=playoff_payload,
@@ -1979,10 +2549,8 @@ async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depe
                 "season_year": NBA_TARGET_SEASON_YEAR,
                 "teams": teams,
                 "picks": attempt_picks,
-                "player_suggestions": player_suggestions,
-                "guard_suggestions": guard_suggestions,
-                "forward_suggestions": forward_suggestions,
-                "player_lookup": player_lookup,
+                "player_lookup": _subset_player_lookup(player_lookup, _picked_player_names(attempt_picks)),
+                "suggestions_url": f"/api/nba/players/suggestions?v={reference['version']}",
                 "slot_entries": slot_entries,
                 "honor_categories": NBA_HONOR_CATEGORIES,
                 "error_message": " ".join(error_messages),
@@ -1990,7 +2558,7 @@ async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depe
             },
         )
 
-    _replace_user_nba_picks(
+    await _replace_user_nba_picks(
         current_user["uid"],
         playoff=playoff_payload,
         honors=honors_payload,
@@ -1999,24 +2567,90 @@ async def nba_playoffs_submit(request: Request, current_user: SessionUser = Depe
     return RedirectResponse(url="/nba-playoffs?saved=1", status_code=status.HTTP_303_SEE_OTHER)
 
 
+@app.get("/api/nba/picks/analytics")
+async def nba_pick_analytics(current_user: SessionUser = Depends(require_user)):
+    """Consensus view of the season's picks: seed matrices, most-picked players and contrarian scores."""
+    return await _nba_pick_analytics()
+
+
+@app.get("/api/nba/leaderboard")
+async def nba_leaderboard(current_user: SessionUser = Depends(require_user)):
+    """Projected leaderboard from the latest score snapshot."""
+    if not async_db.is_ready() or not NBA_SCORING_ENABLED or NBA_CURRENT_SEASON_ID is None:
+        return {"snapshot": None, "entries": []}
+    snapshot = await async_db.fetch_one(
+        """
+        SELECT id, taken_at, users, context
+        FROM nba_score_snapshots
+        WHERE season_id = %s
+        ORDER BY taken_at DESC, id DESC
+        LIMIT 1
+        """,
+        (NBA_CURRENT_SEASON_ID,),
+    )
+    if not snapshot:
+        return {"snapshot": None, "entries": []}
+    snapshot_id, taken_at, users, context = snapshot
+    rows = await async_db.fetch_all(
+        """
+        SELECT user_uid, rank, playoff_points, honor_points, all_nba_points, total_points
+        FROM nba_score_entries
+        WHERE snapshot_id = %s
+        ORDER BY rank, user_uid
+        """,
+        (snapshot_id,),
+    )
+    return {
+        "snapshot": {"id": snapshot_id, "taken_at": taken_at.isoformat(), "users": users, "context": context},
+        "points": nba_scoring.POINTS,
+        "entries": [
+            {
+                "user_uid": uid,
+                "rank": rank,
+                "playoff_points": playoff_points,
+                "honor_points": honor_points,
+                "all_nba_points": all_nba_points,
+                "total_points": total_points,
+            }
+            for uid, rank, playoff_points, honor_points, all_nba_points, total_points in rows
+        ],
+    }
+
+
 @app.get("/nba-playoffs/all", response_class=HTMLResponse)
-def nba_playoffs_all_picks(request: Request, current_user: SessionUser = Depends(require_user)):
-    picks = _load_all_users_nba_picks()
+async def nba_playoffs_all_picks(
+    request: Request,
+    current_user: SessionUser = Depends(require_user),
+    user: str = Query("", max_length=64),
+    after: str = Query("", max_length=128),
+    limit: int = Query(NBA_OVERVIEW_PAGE_SIZE, ge=1, le=200),
+):
+    page: dict[str, Any] = {}
+    analytics = await _nba_pick_analytics()
     slot_entries = [
         {"slot": slot, "label": data["label"], "bucket": data["bucket"]}
         for slot, data in NBA_ALL_NBA_SLOT_DEFS.items()
     ]
-    return templates.TemplateResponse(
-        "nba_playoffs_overview.html",
+    template = streaming_templates.get_template("nba_playoffs_overview.html")
+    # Rendered lazily: the header goes out before the first pick row is read,
+    # and each card is sent as soon as its user's rows have been consumed.
+    body = template.generate_async(
         {
             "request": request,
             "season_year": NBA_TARGET_SEASON_YEAR,
-            "picks": picks,
+            "picks": _iter_all_users_nba_picks(page, after=after, user_filter=user, limit=limit),
+            "page": page,
+            "analytics": analytics,
+            "contrarian": {row["user_uid"]: row["score"] for row in analytics["contrarian"]},
+            "user_filter": user,
+            "after": after,
+            "limit": limit,
             "conferences": NBA_CONFERENCES,
             "slot_entries": slot_entries,
             "honor_categories": NBA_HONOR_CATEGORIES,
-        },
+        }
     )
+    return StreamingResponse(_stream_overview(body), media_type="text/html; charset=utf-8")
 
 # Test routes removed - implementing proper v2 system
 
@@ -2192,12 +2826,11 @@ async def hall_of_hate_create(
         f.write(content)
     
     # Save to database
-    conn = pool.getconn()
     try:
-        with conn.cursor() as cur:
+        async with async_db.connection() as conn, conn.cursor() as cur:
             print(f"[DEBUG] Creating villain: name='{name}', frame_type='{frame_type}', filename='uploads/{filename}'")
             # Create the villain
-            cur.execute(
+            await cur.execute(
                 """
                 INSERT INTO hall_of_hate_v2 (name, image_filename, frame_type)
                 VALUES (%s, %s, %s)
@@ -2205,7 +2838,7 @@ async def hall_of_hate_create(
                 """,
                 (name, f"uploads/{filename}", frame_type)
             )
-            villain_id = cur.fetchone()[0]
+            villain_id = (await cur.fetchone())[0]
             print(f"[DEBUG] Villain created with ID: {villain_id}")
             
             # Get all LDAP users and create automatic 99 ratings
@@ -2213,9 +2846,10 @@ async def hall_of_hate_create(
             user_ids = _get_all_ldap_user_ids()
             print(f"[DEBUG] Found {len(user_ids)} LDAP users: {user_ids}")
             
+            inserted_ratings = 0
             for user_id in user_ids:
                 print(f"[DEBUG] Creating rating for user: {user_id}")
-                cur.execute(
+                await cur.execute(
                     """
                     INSERT INTO hall_of_hate_v2_ratings (villain_id, user_name, rating)
                     VALUES (%s, %s, 99)
@@ -2223,21 +2857,18 @@ async def hall_of_hate_create(
                     """,
                     (villain_id, user_id)
                 )
-            
+                inserted_ratings += cur.rowcount
+            await _apply_v2_rating_stats_delta(cur, villain_id, 99 * inserted_ratings, inserted_ratings)
+
             print(f"Created villain '{name}' with automatic 99 ratings for {len(user_ids)} users")
-        conn.commit()
         print(f"[DEBUG] Successfully created villain '{name}' with automatic ratings")
-    except psycopg2.IntegrityError as e:
+    except async_errors.IntegrityError as e:
         print(f"[DEBUG] IntegrityError: {e}")
-        conn.rollback()
         raise HTTPException(status_code=400, detail="Villain name already exists")
     except Exception as e:
         print(f"[DEBUG] Unexpected error creating villain: {e}")
         print(f"[DEBUG] Error type: {type(e)}")
-        conn.rollback()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-    finally:
-        pool.putconn(conn)
     
     return RedirectResponse(url="/hall-of-hate", status_code=303)
 
@@ -2270,12 +2901,7 @@ def hall_of_hate_edit_view(
         db_id, name, image_filename, frame_type = result
         
         # Get average hate score
-        cursor.execute(
-            "SELECT COALESCE(AVG(rating), 99) FROM hall_of_hate_v2_ratings WHERE villain_id = %s",
-            (villain_id,)
-        )
-        avg_result = cursor.fetchone()
-        average_hate = avg_result[0] if avg_result else 99
+        average_hate = _get_v2_average_hate(cursor, villain_id)
         
         villain_data = {
             "id": db_id,
@@ -2312,17 +2938,15 @@ async def hall_of_hate_edit_update(
     current_user: SessionUser = Depends(require_user)
 ):
     """Update villain in Hall of Hate v2"""
-    global pool
-    if not pool:
+    if not async_db.is_ready():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
-    conn = pool.getconn()
-    try:
+    async with async_db.connection() as conn:
         cursor = conn.cursor()
         
         # Verify villain exists
-        cursor.execute("SELECT id, image_filename FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
-        result = cursor.fetchone()
+        await cursor.execute("SELECT id, image_filename FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
+        result = await cursor.fetchone()
         if not result:
             raise HTTPException(status_code=404, detail="Villain not found")
         
@@ -2354,15 +2978,11 @@ async def hall_of_hate_edit_update(
                 shutil.copyfileobj(image.file, buffer)
         
         # Update database
-        cursor.execute("""
+        await cursor.execute("""
             UPDATE hall_of_hate_v2 
             SET name = %s, frame_type = %s, image_filename = %s, updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """, (name, frame_type, new_image_filename, villain_id))
-        
-        conn.commit()
-    finally:
-        pool.putconn(conn)
     
     return RedirectResponse(url="/hall-of-hate", status_code=303)
 
@@ -2404,12 +3024,7 @@ def hall_of_hate_rate_view(
                 current_rating = rating_result[0]
         
         # Get average hate score
-        cursor.execute(
-            "SELECT COALESCE(AVG(rating), 99) FROM hall_of_hate_v2_ratings WHERE villain_id = %s",
-            (villain_id,)
-        )
-        avg_result = cursor.fetchone()
-        average_hate = avg_result[0] if avg_result else 99
+        average_hate = _get_v2_average_hate(cursor, villain_id)
         
         villain_data = {
             "id": db_id,
@@ -2439,8 +3054,7 @@ async def hall_of_hate_rate_submit(
     current_user: SessionUser = Depends(require_user)
 ):
     """Submit rating for villain in Hall of Hate v2"""
-    global pool
-    if not pool:
+    if not async_db.is_ready():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
     # Get user identifier
@@ -2448,26 +3062,35 @@ async def hall_of_hate_rate_submit(
     if not user_id:
         raise HTTPException(status_code=400, detail="User ID not available")
     
-    conn = pool.getconn()
-    try:
+    async with async_db.connection() as conn:
         cursor = conn.cursor()
         
         # Verify villain exists
-        cursor.execute("SELECT id FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
-        if not cursor.fetchone():
+        await cursor.execute("SELECT id FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
+        if not await cursor.fetchone():
             raise HTTPException(status_code=404, detail="Villain not found")
         
+        # Lock the aggregate row first so the previous rating we read cannot
+        # change before the delta is applied.
+        await _lock_v2_rating_stats(cursor, villain_id)
+        await cursor.execute(
+            "SELECT rating FROM hall_of_hate_v2_ratings WHERE villain_id = %s AND user_name = %s",
+            (villain_id, user_id)
+        )
+        previous = await cursor.fetchone()
+
         # Insert or update rating using UPSERT
-        cursor.execute("""
+        await cursor.execute("""
             INSERT INTO hall_of_hate_v2_ratings (villain_id, user_name, rating)
             VALUES (%s, %s, %s)
             ON CONFLICT (villain_id, user_name)
             DO UPDATE SET rating = EXCLUDED.rating
         """, (villain_id, user_id, hate_rating))
-        
-        conn.commit()
-    finally:
-        pool.putconn(conn)
+
+        if previous:
+            await _apply_v2_rating_stats_delta(cursor, villain_id, hate_rating - previous[0], 0)
+        else:
+            await _apply_v2_rating_stats_delta(cursor, villain_id, hate_rating, 1)
     
     return RedirectResponse(url="/hall-of-hate", status_code=303)
 
@@ -2478,25 +3101,23 @@ async def hall_of_hate_delete(
     current_user: SessionUser = Depends(require_user)
 ):
     """Delete villain from Hall of Hate"""
-    global pool
-    if not pool:
+    if not async_db.is_ready():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
-    conn = pool.getconn()
-    try:
+    async with async_db.connection() as conn:
         cursor = conn.cursor()
         
         # Get villain info before deletion for cleanup
-        cursor.execute("SELECT image_filename FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
-        result = cursor.fetchone()
+        await cursor.execute("SELECT image_filename FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
+        result = await cursor.fetchone()
         if not result:
             raise HTTPException(status_code=404, detail="Villain not found")
         
         image_filename = result[0]
         
         # Delete from database (cascade will handle ratings)
-        cursor.execute("DELETE FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
-        conn.commit()
+        await cursor.execute("DELETE FROM hall_of_hate_v2 WHERE id = %s", (villain_id,))
+        await conn.commit()
         
         # Try to delete image file
         try:
@@ -2511,9 +3132,6 @@ async def hall_of_hate_delete(
         except Exception as e:
             # Log but don't fail the deletion if file cleanup fails
             print(f"Warning: Could not delete image file {image_filename}: {e}")
-        
-    finally:
-        pool.putconn(conn)
     
     return RedirectResponse(url="/hall-of-hate", status_code=303)
 
@@ -3151,6 +3769,170 @@ async def cleanup_orphaned_ratings_endpoint(
         print(f"Error in cleanup endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
 
+@app.get("/admin/db-pool/stats")
+def db_pool_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint exposing connection pool occupancy and checkout-wait histogram"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    return {"sync": pool.stats(), "async": async_db.stats()}
+
+@app.get("/admin/nba/reference-data")
+def nba_reference_data_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint showing which teams/players version this process has cached"""
+    return nba_reference_cache.stats()
+
+@app.post("/admin/nba/reference-data/refresh")
+async def refresh_nba_reference_data(current_user: SessionUser = Depends(require_admin)):
+    """Bump the reference data version after editing teams/players by hand"""
+    if not async_db.is_ready():
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    async with async_db.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE nba_data_versions
+            SET version = version + 1, updated_at = NOW()
+            WHERE name = 'reference'
+            RETURNING version
+            """
+        )
+        row = await cur.fetchone()
+        await cur.execute("SELECT pg_notify(%s, 'reference')", (NBA_DATA_NOTIFY_CHANNEL,))
+    nba_reference_cache.invalidate()
+    return {"version": row[0] if row else None, "cache": nba_reference_cache.stats()}
+
+@app.get("/admin/nba/pick-stats/verify")
+def verify_nba_pick_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to compare stored NBA pick counts with the pick tables"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not NBA_PICK_STATS_ENABLED or NBA_CURRENT_SEASON_ID is None:
+        raise HTTPException(status_code=503, detail="Pick aggregates are disabled")
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            drift = _verify_nba_pick_counts(cur)
+        conn.rollback()
+    finally:
+        pool.putconn(conn)
+    return {"status": "ok" if not drift else "drift", "drift": drift}
+
+@app.post("/admin/nba/pick-stats/rebuild")
+def rebuild_nba_pick_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to recompute the season's NBA pick counts from the pick tables"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not NBA_PICK_STATS_ENABLED or NBA_CURRENT_SEASON_ID is None:
+        raise HTTPException(status_code=503, detail="Pick aggregates are disabled")
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            drift = _verify_nba_pick_counts(cur)
+            rebuilt = _rebuild_nba_pick_counts(cur)
+        conn.commit()
+    except Exception as e:
+        print(f"Error rebuilding NBA pick counts: {e}")
+        conn.rollback()
+        raise HTTPException(status_code=500, detail=f"Rebuild failed: {str(e)}")
+    finally:
+        pool.putconn(conn)
+    nba_pick_analytics_cache.invalidate()
+    return {"status": "success", "rebuilt": rebuilt, "corrected": drift}
+
+@app.post("/admin/nba/scoring/run")
+async def run_nba_scoring(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to write a score snapshot now instead of waiting for the scorer thread"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not NBA_SCORING_ENABLED or NBA_CURRENT_SEASON_ID is None:
+        raise HTTPException(status_code=503, detail="NBA scoring is disabled")
+    try:
+        return await run_in_threadpool(nba_scoring.run_snapshot, pool, NBA_CURRENT_SEASON_ID)
+    except Exception as e:
+        print(f"Error running NBA scoring: {e}")
+        raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
+
+@app.get("/admin/nba/sync/runs")
+def list_nba_sync_runs(limit: int = 20, current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint listing the latest NBA team/player sync runs"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not NBA_SYNC_ENABLED:
+        raise HTTPException(status_code=503, detail="NBA sync is disabled")
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            runs = nba_sync.recent_runs(cur, max(1, min(limit, 200)))
+        conn.rollback()
+    finally:
+        pool.putconn(conn)
+    return {
+        "worker_enabled": nba_sync.SYNC_ENABLED,
+        "interval_seconds": nba_sync.SYNC_INTERVAL,
+        "jobs_leader": jobs_leader.stats() if jobs_leader is not None else None,
+        "runs": runs,
+    }
+
+def _run_nba_sync(force: bool) -> dict:
+    return nba_sync.sync_with_dsn(DATABASE_URL, trigger="admin", force=force)
+
+@app.post("/admin/nba/sync/run")
+async def run_nba_sync(force: bool = False, current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to sync teams and players now instead of waiting for the next scheduled run"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not NBA_SYNC_ENABLED:
+        raise HTTPException(status_code=503, detail="NBA sync is disabled")
+    try:
+        result = await run_in_threadpool(_run_nba_sync, force)
+    except Exception as e:
+        print(f"Error running NBA sync: {e}")
+        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+    # NOTIFY reaches this process too, but the admin expects the new data on the next page load.
+    if result.get("version") is not None:
+        nba_reference_cache.invalidate()
+    return result
+
+@app.get("/admin/hall-of-hate/rating-stats/verify")
+def verify_hall_of_hate_rating_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to compare stored v2 rating aggregates with the ratings table"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not V2_RATING_STATS_ENABLED:
+        raise HTTPException(status_code=503, detail="Rating aggregates are disabled")
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            drift = _verify_v2_rating_stats(cur)
+        conn.rollback()
+    finally:
+        pool.putconn(conn)
+    return {"status": "ok" if not drift else "drift", "drift": drift}
+
+@app.post("/admin/hall-of-hate/rating-stats/rebuild")
+def rebuild_hall_of_hate_rating_stats(current_user: SessionUser = Depends(require_admin)):
+    """Admin endpoint to recompute every v2 rating aggregate from the ratings table"""
+    if not pool:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    if not V2_RATING_STATS_ENABLED:
+        raise HTTPException(status_code=503, detail="Rating aggregates are disabled")
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            drift = _verify_v2_rating_stats(cur)
+            rebuilt = _rebuild_v2_rating_stats(cur)
+        conn.commit()
+    except Exception as e:
+        print(f"Error rebuilding rating aggregates: {e}")
+        conn.rollback()
+        raise HTTPException(status_code=500, detail=f"Rebuild failed: {str(e)}")
+    finally:
+        pool.putconn(conn)
+    return {"status": "success", "rebuilt": rebuilt, "corrected": drift}
+
 @app.delete("/admin/user/{username}/ratings")
 async def delete_user_ratings(
     username: str,
@@ -3158,20 +3940,63 @@ async def delete_user_ratings(
     current_user: SessionUser = Depends(require_admin)
 ):
     """Admin endpoint to delete all ratings for a specific user"""
-    global pool
-    if not pool:
+    if not async_db.is_ready():
         raise HTTPException(status_code=500, detail="Database connection not available")
     
-    conn = pool.getconn()
     try:
-        with conn.cursor() as cur:
+        async with async_db.connection() as conn, conn.cursor() as cur:
             # Delete all ratings for the specified user
-            cur.execute(
-                "DELETE FROM hall_of_hate_v2_ratings WHERE user_name = %s",
-                (username,)
-            )
-            deleted_count = cur.rowcount
-            conn.commit()
+            if V2_RATING_STATS_ENABLED:
+                # Take the aggregate rows first, in villain order, like
+                # hall_of_hate_rate_submit does; locking the ratings before the
+                # stats would deadlock against a concurrent rating.
+                await cur.execute(
+                    """
+                    SELECT 1 FROM hall_of_hate_v2_rating_stats
+                    WHERE villain_id IN (
+                        SELECT villain_id FROM hall_of_hate_v2_ratings WHERE user_name = %s
+                    )
+                    ORDER BY villain_id
+                    FOR UPDATE
+                    """,
+                    (username,)
+                )
+                # Subtract the removed ratings from each villain's aggregate in
+                # the same statement as the delete.
+                await cur.execute(
+                    """
+                    WITH removed AS (
+                        DELETE FROM hall_of_hate_v2_ratings
+                        WHERE user_name = %s
+                        RETURNING villain_id, rating
+                    ),
+                    per_villain AS (
+                        SELECT villain_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+                        FROM removed
+                        GROUP BY villain_id
+                    ),
+                    updated AS (
+                        UPDATE hall_of_hate_v2_rating_stats s
+                        SET rating_sum = s.rating_sum - d.rating_sum,
+                            rating_count = s.rating_count - d.rating_count,
+                            average_hate = (s.rating_sum - d.rating_sum)::numeric
+                                           / NULLIF(s.rating_count - d.rating_count, 0),
+                            updated_at = NOW()
+                        FROM per_villain d
+                        WHERE s.villain_id = d.villain_id
+                        RETURNING s.villain_id
+                    )
+                    SELECT COALESCE(SUM(rating_count), 0) FROM per_villain
+                    """,
+                    (username,)
+                )
+                deleted_count = int((await cur.fetchone())[0])
+            else:
+                await cur.execute(
+                    "DELETE FROM hall_of_hate_v2_ratings WHERE user_name = %s",
+                    (username,)
+                )
+                deleted_count = cur.rowcount
             
             return {
                 "status": "success", 
@@ -3179,7 +4004,4 @@ async def delete_user_ratings(
             }
     except Exception as e:
         print(f"Error deleting user ratings: {e}")
-        conn.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete ratings: {str(e)}")
-    finally:
-        pool.putconn(conn)
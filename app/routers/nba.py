@@ -1,29 +1,75 @@
 # app/routers/nba.py
 import asyncio
-from fastapi import APIRouter, Request
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import APIRouter, Request, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.concurrency import run_in_threadpool
 
+from app.services import nba_stats
 from app.services.nba_stats import get_team_advanced, get_mvp_ladder, get_roy_ladder
+from app.services.stats_cache import dumps
 
 router = APIRouter(prefix="/nba", tags=["nba"])
 templates = Jinja2Templates(directory="app/templates")
 
-@router.get("/tracker", response_class=HTMLResponse)
-async def tracker(request: Request):
+def _num(value, pattern: str) -> str:
+    # Las estadísticas ausentes llegan como None (caché compartida) o NaN (caché en memoria).
+    if value is None or value != value:
+        return "–"
+    return pattern % value
+
+templates.env.filters["num"] = _num
+
+SEASON_LABEL = "2025-26"
+
+async def _tracker_data() -> Dict:
     team_adv, mvp, roy = await asyncio.gather(
         run_in_threadpool(get_team_advanced),
         run_in_threadpool(get_mvp_ladder),
         run_in_threadpool(get_roy_ladder),
     )
-    return templates.TemplateResponse(
-        "nba_tracker.html",
-        {
-            "request": request,
-            "team_adv": team_adv,
-            "mvp": mvp,
-            "roy": roy,
-            "season": "2025-26",
-        },
-    )
+    return {"team_adv": team_adv, "mvp": mvp, "roy": roy, "season": SEASON_LABEL}
+
+def _render_html(data: Dict) -> bytes:
+    # La plantilla no usa `request`, así que el HTML solo depende de los datos.
+    return templates.get_template("nba_tracker.html").render(**data).encode("utf-8")
+
+def _render_json(data: Dict) -> bytes:
+    return dumps(data).encode("utf-8")
+
+async def _tracker_body(kind: str, render: Callable[[Dict], bytes]) -> Tuple[Optional[str], bytes]:
+    """
+    (versión, cuerpo) del tracker. Mientras las entradas cacheadas no cambien se
+    reutilizan los bytes ya generados: ni to_dict ni Jinja por petición.
+    """
+    keys = nba_stats.tracker_keys()
+    version = await run_in_threadpool(nba_stats.data_version, keys)
+    body = nba_stats.get_rendered(kind, version)
+    if body is not None:
+        return version, body
+    body = render(await _tracker_data())
+    # Solo se guarda si nada cambió mientras se generaba; si no, la versión no describiría el cuerpo.
+    if version is not None and await run_in_threadpool(nba_stats.data_version, keys) == version:
+        nba_stats.set_rendered(kind, version, body)
+    return version, body
+
+def _versioned_response(request: Request, version: Optional[str], body: bytes, media_type: str) -> Response:
+    if version is None:
+        return Response(content=body, media_type=media_type)
+    etag = f'W/"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@router.get("/tracker", response_class=HTMLResponse)
+async def tracker(request: Request):
+    version, body = await _tracker_body("html", _render_html)
+    return _versioned_response(request, version, body, "text/html; charset=utf-8")
+
+@router.get("/tracker.json")
+async def tracker_json(request: Request):
+    """Mismos datos que /nba/tracker en JSON (bytes pregenerados por versión de datos)."""
+    version, body = await _tracker_body("json", _render_json)
+    return _versioned_response(request, version, body, "application/json")
@@ -0,0 +1,88 @@
+# app/services/async_db.py
+"""
+asyncio-native database access for the request path.
+
+psycopg2 only offers blocking I/O, so every query issued from an ``async def``
+route used to stall the event loop and every sync route pinned a threadpool
+slot for the duration of its queries. This module wraps a psycopg 3
+``AsyncConnectionPool`` so handlers can simply ``await`` their database work:
+
+    async with async_db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT ...", (param,))
+
+The SQL keeps the ``%s`` placeholder style used everywhere else. A connection
+checked out with `connection()` commits when the block exits normally and
+rolls back if it raises. Schema management still runs on the psycopg2 pool at
+startup; this pool only serves request handlers.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool, PoolTimeout, TooManyRequests
+
+from app.services.db_pool import env_number
+
+_pool: AsyncConnectionPool | None = None
+
+
+async def open_pool(dsn: str) -> None:
+    """Create and open the process-wide async pool using DB_ASYNC_POOL_* variables."""
+    global _pool
+    if _pool is not None:
+        return
+    candidate = AsyncConnectionPool(
+        dsn,
+        min_size=env_number("DB_ASYNC_POOL_MIN_SIZE", 1, int),
+        max_size=env_number("DB_ASYNC_POOL_MAX_SIZE", 10, int),
+        timeout=env_number("DB_ASYNC_POOL_TIMEOUT_SECONDS", 10.0, float),
+        max_waiting=env_number("DB_ASYNC_POOL_MAX_WAITING", 200, int),
+        max_idle=env_number("DB_ASYNC_POOL_MAX_IDLE_SECONDS", 300.0, float),
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+    await candidate.open(wait=True)
+    _pool = candidate
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def is_ready() -> bool:
+    return _pool is not None
+
+
+@asynccontextmanager
+async def connection() -> AsyncIterator[AsyncConnection]:
+    if _pool is None:
+        raise RuntimeError("async database pool is not initialized")
+    async with _pool.connection() as conn:
+        yield conn
+
+
+async def fetch_all(query: str, params: Sequence[Any] = ()) -> list[tuple]:
+    async with connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+async def fetch_one(query: str, params: Sequence[Any] = ()) -> tuple | None:
+    async with connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return await cur.fetchone()
+
+
+def stats() -> dict[str, Any]:
+    if _pool is None:
+        return {}
+    return dict(_pool.get_stats())
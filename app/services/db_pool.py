@@ -0,0 +1,272 @@
+# app/services/db_pool.py
+"""
+Thread-safe psycopg2 connection pool for the request path.
+
+The sync FastAPI handlers run on AnyIO's worker threads (40 by default), so
+the pool has to be safe to share between threads and must make callers wait
+for a free connection instead of failing the moment ``maxconn`` is reached.
+Waiting is bounded both in time (``timeout``) and in queue length
+(``max_waiting``); when either limit is hit ``PoolExhausted`` is raised so the
+request can fail fast with a 503.
+
+Idle connections are health-checked before being handed out again once they
+have been idle for ``healthcheck_after`` seconds, and broken connections are
+replaced transparently. Checkout wait times are recorded in a histogram that
+`stats()` exposes, which is what we use to size the pool against pgpool.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+# Upper bounds (seconds) of the checkout-wait histogram buckets.
+WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolExhausted(PoolError):
+    """Raised when no connection could be checked out in time."""
+
+
+class WaitHistogram:
+    """Fixed-bucket histogram of checkout wait times (Prometheus-style)."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(self._buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total_count = self._count
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self._buckets, counts):
+            running += count
+            cumulative[f"{bound:g}"] = running
+        cumulative["+Inf"] = total_count
+        return {"buckets": cumulative, "sum": total_sum, "count": total_count}
+
+
+class InstrumentedConnectionPool:
+    """Drop-in replacement for ``SimpleConnectionPool`` (getconn/putconn/closeall)."""
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        minconn: int = 1,
+        maxconn: int = 10,
+        timeout: float = 10.0,
+        max_waiting: int = 40,
+        healthcheck_after: float = 30.0,
+        connect: Callable[..., Any] = psycopg2.connect,
+    ):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"invalid pool bounds minconn={minconn} maxconn={maxconn}")
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_waiting = max_waiting
+        self.healthcheck_after = healthcheck_after
+        self._connect_fn = connect
+
+        self._cond = threading.Condition()
+        self._idle: list[tuple[Any, float]] = []  # (connection, idle since), used as a LIFO stack
+        self._used: dict[int, Any] = {}
+        self._size = 0  # idle + in use + being opened
+        self._waiting = 0
+        self._closed = False
+
+        self.wait_histogram = WaitHistogram()
+        self._counters = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "healthcheck_failures": 0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+        }
+
+        for _ in range(minconn):
+            conn = self._connect()
+            with self._cond:
+                self._size += 1
+                self._idle.append((conn, time.monotonic()))
+
+    # -- internal helpers -------------------------------------------------
+
+    def _bump(self, counter: str) -> None:
+        with self._cond:
+            self._counters[counter] += 1
+
+    def _connect(self):
+        conn = self._connect_fn(self.dsn)
+        self._bump("connections_opened")
+        return conn
+
+    def _close(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._bump("connections_closed")
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.healthcheck_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+        except Exception:
+            return False
+        return True
+
+    # -- public API --------------------------------------------------------
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        conn = None
+        idle_since = 0.0
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1  # reserve the slot, connect outside the lock
+                    break
+                if self._waiting >= self.max_waiting:
+                    self._counters["rejected"] += 1
+                    raise PoolExhausted(
+                        f"connection pool exhausted ({self.maxconn} in use, {self._waiting} waiting)"
+                    )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolExhausted(f"timed out after {self.timeout:g}s waiting for a database connection")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        if conn is not None and not self._is_healthy(conn, idle_since):
+            self._bump("healthcheck_failures")
+            self._close(conn)
+            conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+
+        self.wait_histogram.observe(time.monotonic() - started)
+        with self._cond:
+            self._used[id(conn)] = conn
+            self._counters["checkouts"] += 1
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        with self._cond:
+            if self._used.pop(id(conn), None) is None:
+                raise PoolError("trying to put unkeyed connection")
+
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except Exception:
+                    close = True
+
+        if close or conn.closed or self._closed:
+            self._close(conn)
+            self._release_slot()
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            snapshot: dict[str, Any] = {
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._used),
+                "waiting": self._waiting,
+                "max_waiting": self.max_waiting,
+                "timeout_seconds": self.timeout,
+            }
+            snapshot.update(self._counters)
+        snapshot["checkout_wait_seconds"] = self.wait_histogram.snapshot()
+        return snapshot
+
+
+def env_number(name: str, default: float, cast: Callable[[str], float]) -> Any:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return cast(raw)
+    except (TypeError, ValueError):
+        print(f"[DB] Invalid value for {name}={raw!r}; using {default}")
+        return default
+
+
+def pool_from_env(dsn: str) -> InstrumentedConnectionPool:
+    """Build the pool using the DB_POOL_* environment variables."""
+    return InstrumentedConnectionPool(
+        dsn,
+        minconn=env_number("DB_POOL_MIN_SIZE", 1, int),
+        maxconn=env_number("DB_POOL_MAX_SIZE", 10, int),
+        timeout=env_number("DB_POOL_TIMEOUT_SECONDS", 10.0, float),
+        max_waiting=env_number("DB_POOL_MAX_WAITING", 40, int),
+        healthcheck_after=env_number("DB_POOL_HEALTHCHECK_AFTER_SECONDS", 30.0, float),
+    )
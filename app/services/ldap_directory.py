@@ -0,0 +1,202 @@
+# app/services/ldap_directory.py
+"""
+Process-wide LDAP directory client.
+
+Keeps a small pool of service-account binds against a single ``Server`` (no
+schema download per call) and caches the user roster with a TTL. Once the TTL
+elapses the last roster is still served while one background thread refreshes
+it (stale-while-revalidate), and if LDAP is slow or down callers keep getting
+the last good roster instead of an empty list.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from ldap3 import NONE, SUBTREE, Connection, Server
+from ldap3.core.exceptions import LDAPException
+
+ROSTER_TTL_SECONDS = int(os.getenv("LDAP_ROSTER_TTL_SECONDS", "300"))
+ROSTER_MAX_STALE_SECONDS = int(os.getenv("LDAP_ROSTER_MAX_STALE_SECONDS", "3600"))
+POOL_SIZE = int(os.getenv("LDAP_POOL_SIZE", "4"))
+CONNECT_TIMEOUT_SECONDS = int(os.getenv("LDAP_CONNECT_TIMEOUT_SECONDS", "5"))
+RECEIVE_TIMEOUT_SECONDS = int(os.getenv("LDAP_RECEIVE_TIMEOUT_SECONDS", "10"))
+# After a failed reload, keep serving the old roster this long before retrying inline.
+ERROR_BACKOFF_SECONDS = 30
+
+
+class LdapConnectionPool:
+    """Bounded pool of connections bound with the service account."""
+
+    def __init__(self, uri: str, bind_dn: str, bind_password: str, *, size: int = POOL_SIZE):
+        self.server = Server(uri, get_info=NONE, connect_timeout=CONNECT_TIMEOUT_SECONDS)
+        self._bind_dn = bind_dn
+        self._bind_password = bind_password
+        self._idle: queue.LifoQueue[Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(size, 1))
+
+    def _open(self) -> Connection:
+        return Connection(
+            self.server,
+            self._bind_dn,
+            self._bind_password,
+            auto_bind=True,
+            receive_timeout=RECEIVE_TIMEOUT_SECONDS,
+        )
+
+    @staticmethod
+    def _discard(conn: Connection) -> None:
+        try:
+            conn.unbind()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        if not self._slots.acquire(timeout=CONNECT_TIMEOUT_SECONDS + RECEIVE_TIMEOUT_SECONDS):
+            raise TimeoutError("timed out waiting for a pooled LDAP connection")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+            if conn is None or conn.closed or not conn.bound:
+                conn = self._open()
+            try:
+                yield conn
+            except Exception:
+                # The bind may have been dropped server-side; never reuse it.
+                self._discard(conn)
+                raise
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+
+class RosterCache:
+    """TTL cache with stale-while-revalidate and last-good fallback."""
+
+    def __init__(
+        self,
+        loader: Callable[[], list[str]],
+        *,
+        ttl: float = ROSTER_TTL_SECONDS,
+        max_stale: float = ROSTER_MAX_STALE_SECONDS,
+    ):
+        self._loader = loader
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._value: list[str] | None = None
+        self._fetched_at = 0.0
+        self._last_error_at = float("-inf")
+        self._refreshing = False
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def _age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    def _load(self) -> list[str] | None:
+        """Run the loader once; returns None (and keeps the old value) on failure."""
+        try:
+            value = sorted(set(self._loader()))
+            if not value and self._value:
+                # The directory does not empty itself between two reads; a search that does is broken.
+                raise LDAPException("LDAP returned no users while a roster is cached")
+        except Exception as exc:  # pragma: no cover - defensive logging for ops
+            print(f"⚠️  Unable to fetch LDAP users: {exc}")
+            with self._lock:
+                self._counters["errors"] += 1
+                self._last_error_at = time.monotonic()
+            return None
+        with self._lock:
+            self._value = value
+            self._fetched_at = time.monotonic()
+            self._counters["refreshes"] += 1
+        return value
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self._refresh_lock:
+                self._load()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self) -> list[str]:
+        with self._lock:
+            value = self._value
+            age = self._age()
+            if value is not None and age < self._ttl:
+                self._counters["hits"] += 1
+                return list(value)
+            if value is not None and age < self._ttl + self._max_stale:
+                self._counters["stale_hits"] += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh_in_background, daemon=True).start()
+                return list(value)
+            if value is not None and time.monotonic() - self._last_error_at < ERROR_BACKOFF_SECONDS:
+                # LDAP just failed; don't make every request wait on it again.
+                self._counters["stale_hits"] += 1
+                return list(value)
+            self._counters["misses"] += 1
+
+        # Nothing usable cached: load inline, but only one caller hits LDAP.
+        with self._refresh_lock:
+            with self._lock:
+                if self._value is not None and self._age() < self._ttl:
+                    return list(self._value)
+                if time.monotonic() - self._last_error_at < ERROR_BACKOFF_SECONDS:
+                    # The caller holding the lock before us just failed; don't queue up on LDAP.
+                    return list(self._value or [])
+            loaded = self._load()
+        if loaded is not None:
+            return list(loaded)
+        with self._lock:
+            return list(self._value or [])
+
+    def invalidate(self) -> None:
+        """Force the next read to reload (keeping the old roster as fallback)."""
+        with self._lock:
+            # Past ttl + max_stale, but finite so stats() can still report the age as JSON.
+            self._fetched_at = time.monotonic() - self._ttl - self._max_stale
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            snapshot: dict[str, Any] = dict(self._counters)
+            snapshot["cached_users"] = len(self._value) if self._value is not None else None
+            snapshot["age_seconds"] = round(self._age(), 1) if self._value is not None else None
+            snapshot["ttl_seconds"] = self._ttl
+            snapshot["refreshing"] = self._refreshing
+        return snapshot
+
+
+class DirectoryClient:
+    def __init__(self, uri: str, base_dn: str, bind_dn: str, bind_password: str):
+        self.base_dn = base_dn
+        self.pool = LdapConnectionPool(uri, bind_dn, bind_password)
+        self.roster = RosterCache(self._search_user_uids)
+
+    def _search_user_uids(self) -> list[str]:
+        with self.pool.connection() as conn:
+            found = conn.search(
+                search_base=self.base_dn,
+                search_filter="(objectClass=inetOrgPerson)",
+                search_scope=SUBTREE,
+                attributes=["uid"],
+            )
+            if not found and (conn.result or {}).get("description") != "success":
+                # busy, timeLimitExceeded, lost access...: raising also keeps the connection out of the pool.
+                raise LDAPException(f"LDAP search failed: {conn.result}")
+            return [str(entry.uid) for entry in conn.entries if "uid" in entry and str(entry.uid)]
+
+    def user_uids(self) -> list[str]:
+        return self.roster.get()
@@ -0,0 +1,135 @@
+# app/services/leader.py
+"""
+Pick the one process that runs the background jobs.
+
+Every uvicorn worker of every replica goes through startup, so the stats
+warmer, the scorer and the sync thread used to run workers × replicas times.
+`JobsLeader` elects one process instead: it holds a session-level Postgres
+advisory lock on a dedicated connection for as long as it runs the jobs. The
+other processes try again every ``NBA_JOBS_LEADER_RETRY_SECONDS`` with a
+short-lived connection and take over once the leader exits or its connection
+drops (which releases the lock).
+
+``NBA_JOBS_LEADER`` overrides the election: ``auto`` (default) elects,
+``true`` always runs the jobs in this process and ``false`` never does.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import psycopg2
+
+MODES = ("auto", "true", "false")
+MODE = os.getenv("NBA_JOBS_LEADER", "auto").lower()
+RETRY_SECONDS = float(os.getenv("NBA_JOBS_LEADER_RETRY_SECONDS", "30"))
+# How often the leader checks that its connection (and so the lock) is still there.
+HEARTBEAT_SECONDS = 10.0
+CONNECT_TIMEOUT_SECONDS = 5
+# Any constant works; it only has to be the same for every replica.
+ADVISORY_LOCK_KEY = 4_202_622
+
+
+class JobsLeader:
+    def __init__(
+        self,
+        dsn: str,
+        on_elected: Callable[[], None],
+        on_lost: Callable[[], None],
+        *,
+        mode: str = MODE,
+        retry_seconds: float = RETRY_SECONDS,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"NBA_JOBS_LEADER must be one of {', '.join(MODES)}, not {mode!r}")
+        self._dsn = dsn
+        self._on_elected = on_elected
+        self._on_lost = on_lost
+        self.mode = mode
+        self._retry_seconds = retry_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_leader = False
+
+    def _try_acquire(self):
+        """A connection holding the lock, or None if another process has it."""
+        conn = psycopg2.connect(self._dsn, connect_timeout=CONNECT_TIMEOUT_SECONDS)
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+                acquired = bool(cur.fetchone()[0])
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return None
+        return conn
+
+    @staticmethod
+    def _alive(conn) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except Exception as exc:
+            print(f"[NBA] Jobs leader connection lost ({exc}); stopping background jobs")
+            return False
+
+    def _lead(self, conn) -> None:
+        self.is_leader = True
+        print(f"[NBA] Process {os.getpid()} runs the background jobs")
+        try:
+            self._on_elected()
+            while not self._stop.wait(HEARTBEAT_SECONDS) and self._alive(conn):
+                pass
+        finally:
+            self.is_leader = False
+            self._on_lost()
+            try:
+                # Closing the session releases the lock for the next leader.
+                conn.close()
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn = self._try_acquire()
+            except Exception as exc:
+                print(f"[NBA] Jobs leader election failed: {exc}")
+                conn = None
+            if conn is not None:
+                self._lead(conn)
+            self._stop.wait(self._retry_seconds * random.uniform(0.8, 1.2))
+
+    def start(self) -> None:
+        """Run the jobs here (``true``), nowhere (``false``) or wherever the lock is won (``auto``)."""
+        if self.mode == "false":
+            print("[NBA] NBA_JOBS_LEADER=false: background jobs do not run in this process")
+            return
+        if self.mode == "true":
+            self.is_leader = True
+            self._on_elected()
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nba-jobs-leader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=HEARTBEAT_SECONDS)
+            self._thread = None
+        elif self.is_leader:
+            self.is_leader = False
+            self._on_lost()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "pid": os.getpid(), "leader": self.is_leader}
@@ -0,0 +1,237 @@
+# app/services/nba_fixtures.py
+"""
+Record/replay of stats.nba.com responses for offline runs.
+
+``NBA_FIXTURES_MODE`` selects what `install` does to a ``requests.Session``
+(the one in `nba_stats`, which nba_api's ``NBAStatsHTTP`` is then pointed
+at, so every endpoint class goes through it too):
+
+* ``off`` (default): nothing, requests go to stats.nba.com as usual.
+* ``record``: requests go out as usual and every 200 response is written to
+  ``NBA_FIXTURES_DIR`` as ``<endpoint>/<key>.json.gz``.
+* ``replay``: nothing leaves the process. Responses come from the fixtures
+  and a request without one fails like a connection error would.
+
+The key is a hash of the endpoint and its sorted query parameters, so the
+same season and filters always map to the same file and fixtures can be
+committed. In replay mode ``NBA_FIXTURES_PROFILE`` adds latency and
+failures for load tests: a preset (``slow``, ``flaky``, ``outage``) and/or
+``key=value`` overrides of `FaultProfile`, e.g. ``flaky,latency_ms=500``.
+``NBA_FIXTURES_SEED`` makes the injected faults repeatable: each draw
+depends only on the seed, the request and how many times that request was
+made, not on the order in which threads get there.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ("off", "record", "replay")
+FIXTURES_MODE = os.getenv("NBA_FIXTURES_MODE", "off").lower()
+FIXTURES_DIR = Path(os.getenv("NBA_FIXTURES_DIR", str(Path(__file__).resolve().parents[2] / "dev" / "nba_fixtures")))
+FIXTURES_PROFILE = os.getenv("NBA_FIXTURES_PROFILE", "")
+FIXTURES_SEED = int(os.getenv("NBA_FIXTURES_SEED", "0"))
+
+
+class FixtureMissing(requests.exceptions.ConnectionError):
+    """Replay mode got a request that was never recorded."""
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Share of requests answered with error_status / raising a read timeout.
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+
+
+PROFILES: Dict[str, FaultProfile] = {
+    "none": FaultProfile(),
+    "slow": FaultProfile(latency_ms=800, jitter_ms=400),
+    "flaky": FaultProfile(latency_ms=150, jitter_ms=100, error_rate=0.1, timeout_rate=0.05),
+    "outage": FaultProfile(error_rate=1.0),
+}
+
+
+def parse_profile(spec: str) -> FaultProfile:
+    """``"flaky,latency_ms=500"`` -> the flaky preset with its latency replaced."""
+    profile = PROFILES["none"]
+    types = {field.name: field.type for field in fields(FaultProfile)}
+    for part in filter(None, (chunk.strip() for chunk in spec.split(","))):
+        if "=" not in part:
+            if part not in PROFILES:
+                raise ValueError(f"unknown fault profile {part!r} (known: {', '.join(PROFILES)})")
+            profile = PROFILES[part]
+            continue
+        name, value = (item.strip() for item in part.split("=", 1))
+        if name not in types:
+            raise ValueError(f"unknown fault profile setting {name!r}")
+        profile = replace(profile, **{name: int(value) if types[name] == "int" else float(value)})
+    return profile
+
+
+def fixture_key(url: str) -> tuple[str, str]:
+    """(endpoint, digest) for a request URL; parameter order does not matter."""
+    parts = urlsplit(url)
+    endpoint = parts.path.rstrip("/").rsplit("/", 1)[-1] or "root"
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    digest = sha1(json.dumps([parts.netloc, parts.path, params]).encode()).hexdigest()[:20]
+    return endpoint, digest
+
+
+class FixtureStore:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path(self, url: str) -> Path:
+        endpoint, digest = fixture_key(url)
+        return self.directory / endpoint / f"{digest}.json.gz"
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(gzip.decompress(self.path(url).read_bytes()))
+        except FileNotFoundError:
+            return None
+
+    def save(self, url: str, response: requests.Response) -> Path:
+        path = self.path(url)
+        record = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")},
+            "body": response.text,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            # mtime=0 keeps re-recorded identical responses byte-identical.
+            fh.write(gzip.compress(json.dumps(record, sort_keys=True).encode(), mtime=0))
+        os.replace(tmp_path, path)
+        return path
+
+
+def _response(request: requests.PreparedRequest, status: int, body: str, headers: Dict[str, str]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK" if status == 200 else "Injected"
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter that records live responses or replays stored ones."""
+
+    def __init__(self, mode: str, store: FixtureStore, profile: FaultProfile, seed: int = 0):
+        super().__init__()
+        self.mode = mode
+        self.store = store
+        self.profile = profile
+        self.seed = seed
+        self._attempts: Dict[str, int] = {}
+        self._attempts_lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0, "injected_errors": 0, "injected_timeouts": 0}
+
+    def _draw(self, url: str) -> tuple[float, float]:
+        """(fault roll, latency jitter) for the n-th request of ``url`` under this seed."""
+        endpoint, digest = fixture_key(url)
+        with self._attempts_lock:
+            attempt = self._attempts[digest] = self._attempts.get(digest, 0) + 1
+        rng = random.Random(f"{self.seed}:{endpoint}:{digest}:{attempt}")
+        return rng.random(), rng.uniform(-1.0, 1.0)
+
+    def _inject(self, request: requests.PreparedRequest) -> Optional[requests.Response]:
+        profile = self.profile
+        roll, jitter = self._draw(request.url)
+        delay = max(profile.latency_ms + profile.jitter_ms * jitter, 0.0) / 1000
+        if delay:
+            time.sleep(delay)
+        if roll < profile.timeout_rate:
+            self.stats["injected_timeouts"] += 1
+            raise requests.exceptions.ReadTimeout(f"injected timeout for {request.url}", request=request)
+        if roll < profile.timeout_rate + profile.error_rate:
+            self.stats["injected_errors"] += 1
+            return _response(request, profile.error_status, "", {"Content-Type": "text/html"})
+        return None
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode != "replay":
+            response = super().send(request, **kwargs)
+            if self.mode == "record" and response.status_code == 200:
+                self.store.save(request.url, response)
+                self.stats["recorded"] += 1
+            return response
+        injected = self._inject(request)
+        if injected is not None:
+            return injected
+        fixture = self.store.load(request.url)
+        if fixture is None:
+            self.stats["missing"] += 1
+            raise FixtureMissing(f"no fixture for {request.url} in {self.store.directory}", request=request)
+        self.stats["replayed"] += 1
+        return _response(request, fixture["status"], fixture["body"], fixture.get("headers") or {})
+
+
+_adapter: Optional[FixtureAdapter] = None
+_session: Optional[requests.Session] = None
+_install_lock = threading.Lock()
+
+
+def install(session: requests.Session) -> Optional[FixtureAdapter]:
+    """Mount the fixture adapter on ``session`` and make nba_api use it; no-op when the mode is off.
+
+    Only the first session passed in is bound (``nba_stats.session``, which
+    carries the hardened headers). Later calls return the existing adapter
+    instead of pointing nba_api somewhere else, so import order does not matter.
+    """
+    global _adapter, _session
+    if FIXTURES_MODE not in MODES:
+        raise ValueError(f"NBA_FIXTURES_MODE must be one of {', '.join(MODES)}, not {FIXTURES_MODE!r}")
+    if FIXTURES_MODE == "off":
+        return None
+    with _install_lock:
+        if _session is not None:
+            if session is not _session:
+                print("[NBA] fixtures already installed on another session; keeping it")
+            return _adapter
+        _adapter = FixtureAdapter(
+            FIXTURES_MODE,
+            FixtureStore(FIXTURES_DIR),
+            parse_profile(FIXTURES_PROFILE),
+            seed=FIXTURES_SEED,
+        )
+        session.mount("https://", _adapter)
+        session.mount("http://", _adapter)
+
+        from nba_api.stats.library.http import NBAStatsHTTP  # type: ignore
+
+        NBAStatsHTTP.set_session(session)
+        _session = session
+    print(f"[NBA] fixtures {FIXTURES_MODE} ({FIXTURES_DIR}, profile {_adapter.profile})")
+    return _adapter
+
+
+def stats() -> Dict[str, Any]:
+    if _adapter is None:
+        return {"mode": FIXTURES_MODE}
+    return {"mode": _adapter.mode, "directory": str(_adapter.store.directory), **_adapter.stats}
@@ -0,0 +1,167 @@
+# app/services/nba_ladders.py
+"""
+Weighted z-score ladders (MVP, ROY, ...) over the league player frame.
+
+An award is a `LadderSpec`: which stat columns to z-score and their weights,
+an optional boolean column that restricts the pool (``IS_ROOKIE``), values
+for missing stats, and the columns to show. Specs live in
+``app/config/nba_ladders.json`` (``NBA_LADDERS_CONFIG``). Entries there
+override the defaults below key by key, and new keys add awards. Adding an
+award or retuning weights is a config change.
+
+Scoring builds one float matrix per pool with every weighted column, z-scores
+all columns at once (NaN-aware, population std, constant columns score 0)
+and takes a matrix-vector product with the weights. `top` selects the best N
+rows with ``argpartition`` and only sorts those.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+LADDERS_CONFIG_PATH = Path(
+    os.getenv("NBA_LADDERS_CONFIG", str(Path(__file__).resolve().parents[1] / "config" / "nba_ladders.json"))
+)
+
+_PLAYER_COLUMNS = ("PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "GP", "PTS", "AST", "REB", "TS_PCT")
+
+
+@dataclass(frozen=True)
+class LadderSpec:
+    name: str
+    score_column: str
+    weights: Mapping[str, float]
+    columns: Tuple[str, ...] = _PLAYER_COLUMNS
+    # Boolean column selecting the players ranked (and z-scored) for this award.
+    pool: Optional[str] = None
+    fill: Mapping[str, float] = field(default_factory=dict)
+    top: int = 10
+
+    @property
+    def stats(self) -> Tuple[str, ...]:
+        return tuple(self.weights)
+
+    def needs(self) -> set[str]:
+        return set(self.columns) | set(self.weights) | set(self.fill) | ({self.pool} if self.pool else set())
+
+
+DEFAULT_LADDERS: Dict[str, LadderSpec] = {
+    # Individual production plus team success; players on unknown teams get a .500 record.
+    "mvp": LadderSpec(
+        name="mvp",
+        score_column="MVP_SCORE",
+        weights={"PTS": 1.0, "AST": 1.2, "REB": 0.8, "TS_PCT": 1.5, "TEAM_WPCT": 1.8},
+        columns=_PLAYER_COLUMNS + ("TEAM_WPCT",),
+        fill={"TEAM_WPCT": 0.5},
+    ),
+    # No team win % so rookies are not penalised for landing on a bad team.
+    "roy": LadderSpec(
+        name="roy",
+        score_column="ROY_SCORE",
+        weights={"PTS": 1.0, "AST": 1.0, "REB": 1.0, "TS_PCT": 1.2},
+        pool="IS_ROOKIE",
+    ),
+}
+
+
+def _spec_from_config(name: str, data: Mapping[str, Any], base: Optional[LadderSpec]) -> LadderSpec:
+    weights = {str(column): float(weight) for column, weight in (data.get("weights") or (base.weights if base else {})).items()}
+    if not weights:
+        raise ValueError("weights is required")
+    columns = data.get("columns")
+    return LadderSpec(
+        name=name,
+        score_column=str(data.get("score_column") or (base.score_column if base else f"{name.upper()}_SCORE")),
+        weights=weights,
+        columns=tuple(columns) if columns else (base.columns if base else _PLAYER_COLUMNS),
+        pool=data.get("pool", base.pool if base else None),
+        fill={str(column): float(value) for column, value in (data.get("fill", base.fill if base else {}) or {}).items()},
+        top=int(data.get("top", base.top if base else 10)),
+    )
+
+
+def load_specs(path: Path = LADDERS_CONFIG_PATH) -> Dict[str, LadderSpec]:
+    """Defaults merged with the JSON config; a broken file or entry falls back to the defaults."""
+    specs = dict(DEFAULT_LADDERS)
+    try:
+        with path.open("r", encoding="utf-8") as config_file:
+            overrides = json.load(config_file)
+    except FileNotFoundError:
+        return specs
+    except Exception as exc:
+        print(f"[NBA] Unable to read {path}: {exc}")
+        return specs
+    if not isinstance(overrides, dict):
+        print(f"[NBA] {path} is not a JSON object; using the default ladders")
+        return specs
+    for name, data in overrides.items():
+        if not isinstance(data, dict):
+            continue
+        try:
+            specs[name] = _spec_from_config(name, data, specs.get(name))
+        except (TypeError, ValueError) as exc:
+            print(f"[NBA] Ignoring ladder {name!r} in {path}: {exc}")
+    return specs
+
+
+def zscores(matrix: np.ndarray) -> np.ndarray:
+    """Column-wise z-scores of a 2-D float matrix; NaNs stay NaN, constant columns become 0."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(matrix, axis=0)
+        std = np.nanstd(matrix, axis=0)
+        z = (matrix - mean) / np.where(std > 0, std, 1.0)
+    z[:, ~(std > 0)] *= 0
+    return z
+
+
+def _pool(frame: pd.DataFrame, spec: LadderSpec) -> pd.DataFrame:
+    if spec.pool is None:
+        return frame
+    return frame[frame[spec.pool].fillna(False).astype(bool).to_numpy()]
+
+
+def scored(frame: pd.DataFrame, spec: LadderSpec) -> Tuple[pd.DataFrame, np.ndarray]:
+    """(pool rows with fills applied, one score per row; NaN when a weighted stat is missing)."""
+    rows = _pool(frame, spec)
+    if spec.fill:
+        rows = rows.fillna({column: value for column, value in spec.fill.items() if column in rows.columns})
+    if rows.empty:
+        return rows, np.empty(0)
+    matrix = rows[list(spec.stats)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    weights = np.fromiter(spec.weights.values(), dtype=float, count=len(spec.weights))
+    return rows, zscores(matrix) @ weights
+
+
+def _order(scores: np.ndarray, n: Optional[int]) -> np.ndarray:
+    """Positions of the n best non-NaN scores, best first (all of them when n is None)."""
+    valid = np.flatnonzero(~np.isnan(scores))
+    if n is not None and len(valid) > n:
+        valid = valid[np.argpartition(-scores[valid], n - 1)[:n]]
+    return valid[np.argsort(-scores[valid], kind="stable")]
+
+
+def _output(rows: pd.DataFrame, scores: np.ndarray, positions: np.ndarray, spec: LadderSpec) -> pd.DataFrame:
+    columns = [column for column in spec.columns if column in rows.columns]
+    out = rows.iloc[positions][columns].copy()
+    out[spec.score_column] = scores[positions]
+    return out
+
+
+def top(frame: pd.DataFrame, spec: LadderSpec, n: Optional[int] = None) -> pd.DataFrame:
+    """The best ``n`` (default ``spec.top``) rows of the award, best first."""
+    rows, scores = scored(frame, spec)
+    return _output(rows, scores, _order(scores, spec.top if n is None else n), spec)
+
+
+def ranked(frame: pd.DataFrame, spec: LadderSpec) -> pd.DataFrame:
+    """Every scorable row of the award's pool, best first."""
+    rows, scores = scored(frame, spec)
+    return _output(rows, scores, _order(scores, None), spec)
+
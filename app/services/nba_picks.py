@@ -0,0 +1,299 @@
+# app/services/nba_picks.py
+"""
+Diff-based writes for a user's NBA picks.
+
+A submission used to delete every pick the user had and insert them again
+one ``execute`` at a time (up to 16 playoff seeds, 3 honors and 5 All-NBA
+slots). Each table is now written with a single statement: the submitted
+rows arrive as arrays and are ``unnest``-ed, rows missing from the
+submission are deleted, and the rest go through ``INSERT ... ON CONFLICT DO
+UPDATE`` guarded by ``IS DISTINCT FROM`` so unchanged rows are not
+rewritten (no new tuple, no WAL, ``updated_at`` keeps meaning something).
+
+The same save keeps ``nba_pick_counts`` up to date: how many users picked
+each choice for each slot (team per conference seed, nominee per honor,
+player for All-NBA), plus participant counts. A pick is identified by a
+``(kind, slot, choice)`` key, built the same way here and in
+`PICK_KEYS_SQL`, so the aggregate can be diffed in Python and verified or
+rebuilt in SQL.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Iterable, Sequence
+
+
+class PickTable:
+    """One per-user picks table: its natural key columns and value columns, with SQL types."""
+
+    def __init__(self, name: str, keys: Sequence[tuple[str, str]], values: Sequence[tuple[str, str]]):
+        self.name = name
+        self.keys = tuple(keys)
+        self.values = tuple(values)
+        self.sql = self._build_sql()
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(column for column, _ in self.keys + self.values)
+
+    def _build_sql(self) -> str:
+        columns = ", ".join(self.columns)
+        arrays = ", ".join(f"%s::{sql_type}[]" for _, sql_type in self.keys + self.values)
+        key_columns = ", ".join(column for column, _ in self.keys)
+        key_match = " AND ".join(f"i.{column} = t.{column}" for column, _ in self.keys)
+        assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column, _ in self.values)
+        current = ", ".join(f"{self.name}.{column}" for column, _ in self.values)
+        excluded = ", ".join(f"EXCLUDED.{column}" for column, _ in self.values)
+        return f"""
+            WITH incoming ({columns}) AS (
+                SELECT * FROM unnest({arrays})
+            ),
+            removed AS (
+                DELETE FROM {self.name} t
+                WHERE t.season_id = %s
+                  AND t.user_uid = %s
+                  AND NOT EXISTS (SELECT 1 FROM incoming i WHERE {key_match})
+                RETURNING 1
+            ),
+            written AS (
+                INSERT INTO {self.name} (season_id, user_uid, {columns})
+                SELECT %s, %s, {columns} FROM incoming
+                ON CONFLICT (season_id, user_uid, {key_columns}) DO UPDATE
+                SET {assignments}, updated_at = NOW()
+                WHERE ({current}) IS DISTINCT FROM ({excluded})
+                RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM removed), (SELECT COUNT(*) FROM written)
+        """
+
+    def params(self, season_id: int, user_uid: str, rows: Sequence[Sequence[Any]]) -> tuple[Any, ...]:
+        width = len(self.columns)
+        arrays = [[row[index] for row in rows] for index in range(width)]
+        return (*arrays, season_id, user_uid, season_id, user_uid)
+
+
+PLAYOFF_PICKS = PickTable(
+    "nba_playoff_picks",
+    keys=(("conference", "text"), ("seed", "integer")),
+    values=(("team_id", "integer"),),
+)
+HONOR_PICKS = PickTable(
+    "nba_honor_picks",
+    keys=(("category", "text"),),
+    values=(("nominee", "text"), ("nominee_team_id", "integer"), ("nominee_team_name", "text")),
+)
+ALL_NBA_PICKS = PickTable(
+    "nba_all_nba_picks",
+    keys=(("slot", "integer"),),
+    values=(("player_name", "text"), ("position", "text"), ("team_name", "text")),
+)
+
+
+def pick_rows(
+    playoff: dict[str, dict[int, int | None]],
+    honors: dict[str, dict[str, Any]],
+    all_nba: dict[int, dict[str, str | None]],
+) -> dict[PickTable, list[tuple[Any, ...]]]:
+    """Turn the validated form payloads into rows per table; blank picks are left out (and so deleted)."""
+    playoff_rows = [
+        (conference, int(seed), team_id)
+        for conference, seeds in playoff.items()
+        for seed, team_id in seeds.items()
+        if team_id
+    ]
+    honor_rows = []
+    for category, payload in honors.items():
+        nominee = (payload.get("nominee") or "").strip()
+        if nominee:
+            honor_rows.append((category, nominee, payload.get("team_id"), payload.get("team_name")))
+    all_nba_rows = []
+    for slot, payload in all_nba.items():
+        player_name = (payload.get("player_name") or "").strip()
+        if player_name:
+            all_nba_rows.append((int(slot), player_name, payload.get("position") or None, payload.get("team_name")))
+    return {PLAYOFF_PICKS: playoff_rows, HONOR_PICKS: honor_rows, ALL_NBA_PICKS: all_nba_rows}
+
+
+async def write_user_picks(cur, season_id: int, user_uid: str, rows: dict[PickTable, list[tuple[Any, ...]]]) -> dict[str, dict[str, int]]:
+    """Apply ``rows`` on an open (async psycopg) cursor; returns removed/written counts per table."""
+    counts: dict[str, dict[str, int]] = {}
+    for table, table_rows in rows.items():
+        await cur.execute(table.sql, table.params(season_id, user_uid, table_rows))
+        removed, written = await cur.fetchone()
+        counts[table.name] = {"removed": int(removed), "written": int(written)}
+    return counts
+
+
+# (season_id, user_uid, kind, slot, choice) for every stored pick.
+PICK_KEYS_SQL = """
+    SELECT season_id, user_uid, 'seed' AS kind, conference || ':' || seed AS slot, team_id::text AS choice
+    FROM nba_playoff_picks
+    WHERE team_id IS NOT NULL
+    UNION ALL
+    SELECT season_id, user_uid, 'honor', category, nominee
+    FROM nba_honor_picks
+    UNION ALL
+    SELECT season_id, user_uid, 'all_nba', '', player_name
+    FROM nba_all_nba_picks
+"""
+
+# What nba_pick_counts should contain, computed from the pick tables.
+PICK_COUNTS_SOURCE_SQL = f"""
+    SELECT season_id, kind, slot, choice, COUNT(*) AS picks
+    FROM ({PICK_KEYS_SQL}) k
+    GROUP BY season_id, kind, slot, choice
+    UNION ALL
+    SELECT season_id, 'participants', 'any', '', COUNT(DISTINCT user_uid)
+    FROM ({PICK_KEYS_SQL}) k
+    GROUP BY season_id
+    UNION ALL
+    SELECT season_id, 'participants', 'all_nba', '', COUNT(DISTINCT user_uid)
+    FROM nba_all_nba_picks
+    GROUP BY season_id
+"""
+
+
+def _with_participants(keys: Counter) -> Counter:
+    if keys:
+        keys[("participants", "any", "")] = 1
+    if any(kind == "all_nba" for kind, _, _ in keys):
+        keys[("participants", "all_nba", "")] = 1
+    return keys
+
+
+def count_keys(rows: dict[PickTable, list[tuple[Any, ...]]]) -> Counter:
+    """Aggregate keys for rows produced by `pick_rows` (must match PICK_KEYS_SQL)."""
+    keys: Counter = Counter()
+    for conference, seed, team_id in rows.get(PLAYOFF_PICKS, ()):
+        keys[("seed", f"{conference}:{seed}", str(team_id))] += 1
+    for category, nominee, *_ in rows.get(HONOR_PICKS, ()):
+        keys[("honor", category, nominee)] += 1
+    for _, player_name, *_ in rows.get(ALL_NBA_PICKS, ()):
+        keys[("all_nba", "", player_name)] += 1
+    return _with_participants(keys)
+
+
+def stored_count_keys(key_rows: Iterable[Sequence[str]]) -> Counter:
+    """Aggregate keys for (kind, slot, choice) rows read back through PICK_KEYS_SQL."""
+    return _with_participants(Counter((kind, slot, choice) for kind, slot, choice in key_rows))
+
+
+def count_deltas(before: Counter, after: Counter) -> list[tuple[str, str, str, int]]:
+    """Non-zero (kind, slot, choice, delta) rows, sorted so concurrent writers lock rows in the same order."""
+    return sorted(
+        (*key, after[key] - before[key])
+        for key in before.keys() | after.keys()
+        if after[key] != before[key]
+    )
+
+
+# Per-user contrarian score: average over the user's picks of the share of
+# users who did *not* make the same pick (0 = pure consensus, 1 = alone on every pick).
+CONTRARIAN_SQL = f"""
+    WITH picks AS (
+        SELECT user_uid, kind, slot, choice
+        FROM ({PICK_KEYS_SQL}) k
+        WHERE season_id = %(season_id)s
+    ),
+    counts AS (
+        SELECT kind, slot, choice, picks
+        FROM nba_pick_counts
+        WHERE season_id = %(season_id)s
+          AND picks > 0
+    ),
+    totals AS (
+        SELECT kind, slot, SUM(picks) AS total
+        FROM counts
+        WHERE kind IN ('seed', 'honor')
+        GROUP BY kind, slot
+        UNION ALL
+        SELECT 'all_nba', '', picks
+        FROM counts
+        WHERE kind = 'participants' AND slot = 'all_nba'
+    )
+    SELECT p.user_uid, COUNT(*) AS picks, AVG(1 - c.picks::numeric / t.total) AS score
+    FROM picks p
+    JOIN counts c USING (kind, slot, choice)
+    JOIN totals t USING (kind, slot)
+    GROUP BY p.user_uid
+    ORDER BY score DESC, p.user_uid
+"""
+
+
+def _share(picks: int, total: int) -> float:
+    return round(picks / total, 4) if total else 0.0
+
+
+def summarize_counts(
+    count_rows: Iterable[Sequence[Any]],
+    teams_by_id: dict[str, dict[str, Any]],
+    conferences: Sequence[str],
+    *,
+    top: int = 10,
+) -> dict[str, Any]:
+    """Shape nba_pick_counts rows (kind, slot, choice, picks) for the analytics API and overview page."""
+    participants = {"any": 0, "all_nba": 0}
+    seeds: dict[str, dict[int, list[tuple[str, int]]]] = {conf: {seed: [] for seed in range(1, 9)} for conf in conferences}
+    honors: dict[str, list[tuple[str, int]]] = {}
+    all_nba: list[tuple[str, int]] = []
+    for kind, slot, choice, picks in count_rows:
+        picks = int(picks)
+        if picks <= 0:
+            continue
+        if kind == "participants":
+            participants[slot] = picks
+        elif kind == "seed":
+            conference, _, seed = slot.partition(":")
+            seeds.setdefault(conference, {}).setdefault(int(seed), []).append((choice, picks))
+        elif kind == "honor":
+            honors.setdefault(slot, []).append((choice, picks))
+        elif kind == "all_nba":
+            all_nba.append((choice, picks))
+
+    def ranked(entries: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        return sorted(entries, key=lambda item: (-item[1], item[0]))
+
+    def team_info(team_id: str) -> dict[str, Any]:
+        team = teams_by_id.get(team_id) or {}
+        return {
+            "team_id": int(team_id) if team_id.isdigit() else team_id,
+            "team_name": team.get("name"),
+            "abbreviation": team.get("abbreviation"),
+        }
+
+    seed_leaders: dict[str, dict[int, list[dict[str, Any]]]] = {}
+    matrix: dict[str, list[dict[str, Any]]] = {}
+    for conference, by_seed in seeds.items():
+        seed_leaders[conference] = {}
+        rows: dict[str, list[int]] = {}
+        for seed, entries in sorted(by_seed.items()):
+            total = sum(picks for _, picks in entries)
+            seed_leaders[conference][seed] = [
+                {**team_info(team_id), "picks": picks, "share": _share(picks, total)}
+                for team_id, picks in ranked(entries)[:top]
+            ]
+            for team_id, picks in entries:
+                rows.setdefault(team_id, [0] * 8)[seed - 1] = picks
+        # One row per team with its pick count at seeds 1-8, ordered by where it is most often placed.
+        matrix[conference] = sorted(
+            ({**team_info(team_id), "counts": counts} for team_id, counts in rows.items()),
+            key=lambda row: (row["counts"].index(max(row["counts"])), -max(row["counts"]), row["team_name"] or ""),
+        )
+
+    return {
+        "users": participants["any"],
+        "seeds": seed_leaders,
+        "seed_matrix": matrix,
+        "honors": {
+            category: [
+                {"nominee": nominee, "picks": picks, "share": _share(picks, sum(p for _, p in entries))}
+                for nominee, picks in ranked(entries)[:top]
+            ]
+            for category, entries in honors.items()
+        },
+        "all_nba": [
+            {"player_name": name, "picks": picks, "share": _share(picks, participants["all_nba"])}
+            for name, picks in ranked(all_nba)[:top]
+        ],
+    }
@@ -0,0 +1,284 @@
+# app/services/nba_scoring.py
+"""
+Projected scoring of NBA picks against the live season.
+
+Every ``NBA_SCORING_INTERVAL_SECONDS`` one replica (guarded by a Postgres
+advisory lock) loads every user's picks into DataFrames, joins them against
+the current standings and the MVP/ROY frames from `nba_stats`, and writes the
+result as a snapshot: one ``nba_score_snapshots`` row plus one
+``nba_score_entries`` row per user. The leaderboard is then a plain read of
+the latest snapshot. A snapshot whose scores match the previous one is not
+written again.
+
+Rules (``POINTS``):
+
+* Playoff seeds: exact seed, off by one, or at least in the conference top 8.
+* Best record: the picked team has the league's best win %.
+* MVP / ROY: the nominee leads the projected ladder, or is in its top 5.
+* All-NBA: the player is in the MVP top 5 or top 15 (positions are not
+  checked; the ladder has none).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+from hashlib import sha1
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from app.services import nba_stats
+from app.services.player_search import normalize_name
+
+SCORING_ENABLED = os.getenv("NBA_SCORING_ENABLED", "true").lower() in ("1", "true", "yes")
+SCORING_INTERVAL = int(os.getenv("NBA_SCORING_INTERVAL_SECONDS", "3600"))
+# Any constant works; it only has to be the same in every replica.
+ADVISORY_LOCK_KEY = 4_202_619
+
+POINTS = {
+    "seed_exact": 5,
+    "seed_off_by_one": 3,
+    "seed_in_top8": 1,
+    "best_record": 10,
+    "award_winner": 10,
+    "award_top5": 3,
+    "all_nba_top5": 4,
+    "all_nba_top15": 2,
+}
+
+SCORE_COLUMNS = ["playoff_points", "honor_points", "all_nba_points"]
+
+
+def _frame(cur, query: str, params: tuple, columns: list[str]) -> pd.DataFrame:
+    cur.execute(query, params)
+    return pd.DataFrame.from_records(cur.fetchall(), columns=columns)
+
+
+def load_picks(cur, season_id: int) -> dict[str, pd.DataFrame]:
+    return {
+        "playoff": _frame(
+            cur,
+            """
+            SELECT p.user_uid, p.conference, p.seed, t.nba_team_id
+            FROM nba_playoff_picks p
+            JOIN nba_teams t ON t.id = p.team_id
+            WHERE p.season_id = %s
+            """,
+            (season_id,),
+            ["user_uid", "conference", "seed", "nba_team_id"],
+        ),
+        "honors": _frame(
+            cur,
+            """
+            SELECT h.user_uid, h.category, h.nominee, t.nba_team_id
+            FROM nba_honor_picks h
+            LEFT JOIN nba_teams t ON t.id = h.nominee_team_id
+            WHERE h.season_id = %s
+            """,
+            (season_id,),
+            ["user_uid", "category", "nominee", "nba_team_id"],
+        ),
+        "all_nba": _frame(
+            cur,
+            "SELECT user_uid, slot, player_name FROM nba_all_nba_picks WHERE season_id = %s",
+            (season_id,),
+            ["user_uid", "slot", "player_name"],
+        ),
+    }
+
+
+def _ranked_names(frame: pd.DataFrame) -> pd.DataFrame:
+    """(name_key, RANK) for a frame already sorted best-first."""
+    return pd.DataFrame({
+        "name_key": frame["PLAYER_NAME"].map(normalize_name).to_numpy(),
+        "RANK": np.arange(1, len(frame) + 1),
+    }).drop_duplicates("name_key")
+
+
+def score_playoff(picks: pd.DataFrame, standings: pd.DataFrame) -> pd.Series:
+    if picks.empty or standings.empty:
+        return pd.Series(dtype=float)
+    # Both sides numeric: a NULL nba_team_id would otherwise make the column object-typed.
+    merged = picks.assign(nba_team_id=pd.to_numeric(picks["nba_team_id"], errors="coerce")).merge(
+        standings[["TEAM_ID", "PLAYOFF_RANK"]].astype({"TEAM_ID": float}),
+        left_on="nba_team_id",
+        right_on="TEAM_ID",
+        how="left",
+    )
+    rank = pd.to_numeric(merged["PLAYOFF_RANK"], errors="coerce")
+    diff = (merged["seed"] - rank).abs()
+    merged["points"] = np.select(
+        [diff == 0, diff == 1, rank <= 8],
+        [POINTS["seed_exact"], POINTS["seed_off_by_one"], POINTS["seed_in_top8"]],
+        0,
+    )
+    return merged.groupby("user_uid")["points"].sum()
+
+
+def score_honors(picks: pd.DataFrame, standings: pd.DataFrame, mvp: pd.DataFrame, roy: pd.DataFrame) -> pd.Series:
+    if picks.empty:
+        return pd.Series(dtype=float)
+    picks = picks.assign(name_key=picks["nominee"].map(normalize_name), points=0)
+
+    best = picks["category"] == "best_record"
+    if not standings.empty:
+        wpct = pd.to_numeric(standings["TEAM_WPCT"], errors="coerce")
+        leaders = standings[wpct == wpct.max()]
+        leader_names = set(leaders.get("TEAM_NAME", pd.Series(dtype=str)).map(normalize_name))
+        hit = picks["nba_team_id"].isin(leaders["TEAM_ID"]) | picks["name_key"].isin(leader_names)
+        picks.loc[best & hit, "points"] = POINTS["best_record"]
+
+    for category, ladder in (("mvp", mvp), ("roy", roy)):
+        if ladder.empty:
+            continue
+        ranks = picks.loc[picks["category"] == category, ["name_key"]].merge(_ranked_names(ladder), on="name_key", how="left")
+        rank = ranks["RANK"].to_numpy()
+        picks.loc[picks["category"] == category, "points"] = np.select(
+            [rank == 1, rank <= 5],
+            [POINTS["award_winner"], POINTS["award_top5"]],
+            0,
+        )
+    return picks.groupby("user_uid")["points"].sum()
+
+
+def score_all_nba(picks: pd.DataFrame, mvp: pd.DataFrame) -> pd.Series:
+    if picks.empty or mvp.empty:
+        return pd.Series(dtype=float)
+    merged = picks.assign(name_key=picks["player_name"].map(normalize_name)).merge(
+        _ranked_names(mvp), on="name_key", how="left"
+    )
+    merged["points"] = np.select(
+        [merged["RANK"] <= 5, merged["RANK"] <= 15],
+        [POINTS["all_nba_top5"], POINTS["all_nba_top15"]],
+        0,
+    )
+    return merged.groupby("user_uid")["points"].sum()
+
+
+def score_picks(picks: dict[str, pd.DataFrame], standings: pd.DataFrame, mvp: pd.DataFrame, roy: pd.DataFrame) -> pd.DataFrame:
+    """One row per user: points per section, total and competition rank (ties share a rank)."""
+    scores = pd.concat(
+        {
+            "playoff_points": score_playoff(picks["playoff"], standings),
+            "honor_points": score_honors(picks["honors"], standings, mvp, roy),
+            "all_nba_points": score_all_nba(picks["all_nba"], mvp),
+        },
+        axis=1,
+    ).reindex(columns=SCORE_COLUMNS).fillna(0).astype(int)
+    scores["total_points"] = scores[SCORE_COLUMNS].sum(axis=1)
+    scores["rank"] = scores["total_points"].rank(method="min", ascending=False).astype(int)
+    scores.index.name = "user_uid"
+    return scores.reset_index().sort_values(["rank", "user_uid"])
+
+
+def _context(standings: pd.DataFrame, mvp: pd.DataFrame, roy: pd.DataFrame) -> dict[str, Any]:
+    """What the snapshot was scored against, stored with it for auditing."""
+    seeds: dict[str, list[Any]] = {}
+    if not standings.empty:
+        for conference, group in standings.sort_values("PLAYOFF_RANK").groupby("CONFERENCE"):
+            seeds[str(conference)] = group["TEAM_ID"].head(8).astype(int).tolist()
+    return {
+        "seeds": seeds,
+        "mvp_top5": mvp["PLAYER_NAME"].head(5).tolist() if not mvp.empty else [],
+        "roy_top5": roy["PLAYER_NAME"].head(5).tolist() if not roy.empty else [],
+    }
+
+
+def _digest(scores: pd.DataFrame) -> str:
+    rows = scores[["user_uid", "total_points", *SCORE_COLUMNS]].to_numpy().tolist()
+    return sha1(json.dumps(rows, default=str).encode()).hexdigest()
+
+
+def run_snapshot(pool, season_id: int) -> dict[str, Any]:
+    """Score every user's picks and store a snapshot; skipped if another replica holds the lock or nothing changed."""
+    standings = nba_stats.standings_frame()
+    if standings.empty:
+        return {"status": "skipped", "reason": "no standings"}
+    mvp = nba_stats.mvp_frame()
+    roy = nba_stats.roy_frame()
+
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (ADVISORY_LOCK_KEY,))
+            if not cur.fetchone()[0]:
+                conn.rollback()
+                return {"status": "skipped", "reason": "running elsewhere"}
+            scores = score_picks(load_picks(cur, season_id), standings, mvp, roy)
+            digest = _digest(scores)
+            cur.execute(
+                "SELECT digest FROM nba_score_snapshots WHERE season_id = %s ORDER BY taken_at DESC, id DESC LIMIT 1",
+                (season_id,),
+            )
+            previous = cur.fetchone()
+            if previous and previous[0] == digest:
+                conn.rollback()
+                return {"status": "unchanged", "users": len(scores)}
+            cur.execute(
+                """
+                INSERT INTO nba_score_snapshots (season_id, digest, users, context)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id
+                """,
+                (season_id, digest, len(scores), json.dumps(_context(standings, mvp, roy))),
+            )
+            snapshot_id = cur.fetchone()[0]
+            execute_values(
+                cur,
+                """
+                INSERT INTO nba_score_entries
+                    (snapshot_id, user_uid, rank, playoff_points, honor_points, all_nba_points, total_points)
+                VALUES %s
+                """,
+                # to_dict() hands back Python ints, which psycopg2 can adapt (numpy ints it cannot).
+                [
+                    (snapshot_id, row["user_uid"], row["rank"], row["playoff_points"], row["honor_points"],
+                     row["all_nba_points"], row["total_points"])
+                    for row in scores.to_dict(orient="records")
+                ],
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+    print(f"[NBA] Score snapshot {snapshot_id}: {len(scores)} users")
+    return {"status": "created", "snapshot_id": snapshot_id, "users": len(scores)}
+
+
+_scorer: Optional[threading.Thread] = None
+_scorer_stop = threading.Event()
+
+
+def _score_loop(pool, season_id: Callable[[], Optional[int]], stop: threading.Event) -> None:
+    # Let the warmer fill the caches before the first run.
+    stop.wait(SCORING_INTERVAL * random.uniform(0.05, 0.15))
+    while not stop.is_set():
+        current = season_id()
+        if current is not None:
+            try:
+                run_snapshot(pool, current)
+            except Exception as exc:
+                print(f"[NBA] Scoring run failed: {exc}")
+        stop.wait(SCORING_INTERVAL * random.uniform(0.8, 1.2))
+
+
+def start_scorer(pool, season_id: Callable[[], Optional[int]]) -> None:
+    """Start (once per process) the thread that writes score snapshots."""
+    global _scorer, _scorer_stop
+    if not SCORING_ENABLED or (_scorer is not None and _scorer.is_alive() and not _scorer_stop.is_set()):
+        return
+    # A stopped thread may still be finishing a snapshot; it keeps its own (set) event.
+    _scorer_stop = threading.Event()
+    _scorer = threading.Thread(target=_score_loop, args=(pool, season_id, _scorer_stop), name="nba-scorer", daemon=True)
+    _scorer.start()
+
+
+def stop_scorer() -> None:
+    _scorer_stop.set()
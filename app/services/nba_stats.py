@@ -1,66 +1,197 @@
 # app/services/nba_stats.py
-from datetime import datetime, timedelta
-from typing import Dict, List
+import random
+import threading
+import time
+from hashlib import sha1
+from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
 from nba_api.stats.endpoints import (
+    commonallplayers,
     leaguedashteamstats,
     leaguedashplayerstats,
     leaguestandingsv3,
 )
 import requests
 import os
+from app.services import nba_fixtures, nba_ladders
 from app.services.nba_headers import attach_to_session, ensure_nba_api_headers
+from app.services.stats_cache import CacheEntry, build_backend
 
 SEASON = os.getenv("NBA_SEASON", "2025-26")  # formato 'YYYY-YY', p.e. '2025-26'
 CACHE_TTL = int(os.getenv("NBA_CACHE_TTL_SECONDS", "900"))  # 15 min
+# La lista de rookies no cambia durante la temporada; basta con pedirla una vez al día.
+ROOKIES_TTL = int(os.getenv("NBA_ROOKIES_TTL_SECONDS", "86400"))
+# memory | file | postgres; los dos últimos se comparten entre workers/réplicas
+CACHE_BACKEND = os.getenv("NBA_CACHE_BACKEND", "postgres")
+CACHE_DIR = os.getenv("NBA_CACHE_DIR", "/tmp/nba_stats_cache")
+# Pasado el TTL se sirve el valor viejo mientras se refresca en segundo plano,
+# salvo que sea más antiguo que esto (entonces se espera al refresco).
+CACHE_MAX_STALE = int(os.getenv("NBA_CACHE_MAX_STALE_SECONDS", "21600"))  # 6 h
+# El warmer revisa cada WARM_INTERVAL y refresca lo que caduque en menos de REFRESH_AHEAD.
+WARMER_ENABLED = os.getenv("NBA_CACHE_WARMER_ENABLED", "true").lower() in ("1", "true", "yes")
+WARM_INTERVAL = int(os.getenv("NBA_CACHE_WARM_INTERVAL_SECONDS", "60"))
+REFRESH_AHEAD = int(os.getenv("NBA_CACHE_REFRESH_AHEAD_SECONDS", "120"))
 
 # Sesión con headers realistas para evitar bloqueos de nba.com/stats
 ensure_nba_api_headers()
 session = requests.Session()
 attach_to_session(session)
+# Con NBA_FIXTURES_MODE=record|replay las peticiones de nba_api pasan por esta sesión (ver nba_fixtures).
+nba_fixtures.install(session)
 HTTP_TIMEOUT = 15
 
-_cache: Dict[str, Dict] = {}
+# Hasta que main llame a configure_cache() usamos el dict en memoria del proceso.
+_cache = build_backend("memory")
 
-def _now():
-    return datetime.utcnow()
+def configure_cache(pool=None):
+    """Selecciona el backend de caché (NBA_CACHE_BACKEND); 'postgres' necesita el pool de main."""
+    global _cache
+    _cache = build_backend(CACHE_BACKEND, pool=pool, directory=CACHE_DIR)
+    print(f"[NBA] stats cache backend: {_cache.name}")
+
+def cache_is_shared() -> bool:
+    """True when other processes read the same entries (file/postgres), so one warmer is enough."""
+    return _cache.name != "memory"
+
+def _get_entry(key: str) -> Optional[CacheEntry]:
+    """Entrada cacheada aunque esté caducada (para servirla si nba.com falla)."""
+    try:
+        return _cache.get(key)
+    except Exception as exc:
+        print(f"[NBA] cache read failed for {key}: {exc}")
+        return None
+
+def _latest_entry(key: str) -> Optional[CacheEntry]:
+    """Como _get_entry pero consultando siempre el backend compartido."""
+    try:
+        return _cache.latest(key)
+    except Exception as exc:
+        print(f"[NBA] cache read failed for {key}: {exc}")
+        return None
 
 def _get_cache(key: str):
-    hit = _cache.get(key)
-    if hit and hit["expires_at"] > _now():
-        return hit["value"]
+    entry = _get_entry(key)
+    if entry is not None and entry.fresh:
+        return entry.value
     return None
 
-def _set_cache(key: str, value):
-    _cache[key] = {"value": value, "expires_at": _now() + timedelta(seconds=CACHE_TTL)}
+def _set_cache(key: str, value, ttl: Optional[int] = None):
+    now = time.time()
+    try:
+        _cache.set(key, CacheEntry(value, now, now + (CACHE_TTL if ttl is None else ttl)))
+    except Exception as exc:
+        print(f"[NBA] cache write failed for {key}: {exc}")
 
-def _zscore(s: pd.Series) -> pd.Series:
-    if s.std(ddof=0) == 0:
-        return s * 0
-    return (s - s.mean()) / s.std(ddof=0)
+def _stale_or_empty(entry: Optional[CacheEntry], label: str) -> List[Dict]:
+    if entry is None:
+        return []
+    print(f"[NBA] serving stale {label} ({int(entry.age)}s old)")
+    return entry.value
 
-def get_team_advanced() -> List[Dict]:
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: List[Dict] = []
+        self.error: Optional[BaseException] = None
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+def _single_flight(key: str, compute: Callable[[], List[Dict]]) -> List[Dict]:
     """
-    TOP10 por Net Rating con métricas avanzadas.
+    Solo un hilo por clave ejecuta `compute`; el resto espera y recibe su resultado.
+    Evita que N peticiones concurrentes con la caché caducada lancen N veces las
+    mismas llamadas a stats.nba.com (y nos acaben limitando).
     """
-    cache_key = f"team_adv_{SEASON}"
-    cached = _get_cache(cache_key)
-    if cached is not None:
-        return cached
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = compute()
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+    return flight.result
 
+def _refresh(cache_key: str, load: Callable[[], List[Dict]], label: str, refresh_ahead: float = 0.0) -> List[Dict]:
+    entry = _latest_entry(cache_key)
+    if entry is not None and entry.expires_at - time.time() > refresh_ahead:
+        # Otro vuelo (o otro worker) lo refrescó justo antes de que empezara este.
+        return entry.value
     try:
-        df = leaguedashteamstats.LeagueDashTeamStats(
-            season=SEASON,
-            measure_type_detailed_defense="Advanced",
-            per_mode_detailed="PerGame",
-            season_type_all_star="Regular Season",
-            league_id_nullable="00",
-            headers=session.headers,
-            timeout=HTTP_TIMEOUT
-        ).get_data_frames()[0]
+        value = load()
     except Exception as exc:
-        print(f"[NBA] team_advanced fetch failed: {exc}")
-        return cached if cached is not None else []
+        print(f"[NBA] {label} fetch failed: {exc}")
+        return _stale_or_empty(entry, label)
+    _set_cache(cache_key, value)
+    return value
+
+def _fresh(cache_key: str, load: Callable[[], List], ttl: Optional[int] = None) -> List:
+    """
+    Datos sin caducar (de caché o recién descargados) para construir otros
+    valores cacheados; si nba.com falla se propaga la excepción en vez de
+    servir algo viejo, para no cachear como fresco un resultado derivado de él.
+    """
+    def fetch():
+        entry = _latest_entry(cache_key)
+        # Margen REFRESH_AHEAD: lo que el warmer deriva de aquí vivirá un TTL entero.
+        if entry is not None and entry.expires_at - time.time() > REFRESH_AHEAD:
+            return entry.value
+        value = load()
+        _set_cache(cache_key, value, ttl)
+        return value
+    return _single_flight(cache_key, fetch)
+
+def _refresh_in_background(cache_key: str, load: Callable[[], List[Dict]], label: str) -> None:
+    with _flights_lock:
+        if cache_key in _flights:
+            return
+    threading.Thread(
+        target=_single_flight,
+        args=(cache_key, lambda: _refresh(cache_key, load, label)),
+        name=f"nba-refresh-{cache_key}",
+        daemon=True,
+    ).start()
+
+def _cached(cache_key: str, load: Callable[[], List[Dict]], label: str) -> List[Dict]:
+    entry = _get_entry(cache_key)
+    if entry is not None and entry.fresh:
+        return entry.value
+    if entry is not None and entry.age < CACHE_TTL + CACHE_MAX_STALE:
+        # Stale-while-revalidate: respondemos ya y refrescamos fuera de la petición.
+        _refresh_in_background(cache_key, load, label)
+        return entry.value
+    return _single_flight(cache_key, lambda: _refresh(cache_key, load, label))
+
+def get_team_advanced() -> List[Dict]:
+    """
+    TOP10 por Net Rating con métricas avanzadas.
+    """
+    return _cached(f"team_adv_{SEASON}", _load_team_advanced, "team_advanced")
+
+def _load_team_advanced() -> List[Dict]:
+    df = leaguedashteamstats.LeagueDashTeamStats(
+        season=SEASON,
+        measure_type_detailed_defense="Advanced",
+        per_mode_detailed="PerGame",
+        season_type_all_star="Regular Season",
+        league_id_nullable="00",
+        headers=session.headers,
+        timeout=HTTP_TIMEOUT
+    ).get_data_frames()[0]
 
     df = df[df["TEAM_ID"].astype(str).str.startswith("161061")]  # solo franquicias NBA
 
@@ -83,56 +214,67 @@ def get_team_advanced() -> List[Dict]:
     ]
     available = [c for c in cols if c in df.columns]
     df = df[available].sort_values("NET_RATING", ascending=False)
-    top10 = df.head(10).to_dict(orient="records")
-    _set_cache(cache_key, top10)
-    return top10
+    return df.head(10).to_dict(orient="records")
 
-def get_mvp_ladder() -> List[Dict]:
+def _load_rookie_ids() -> List[int]:
+    players = commonallplayers.CommonAllPlayers(
+        is_only_current_season=1,
+        league_id="00",
+        season=SEASON,
+        headers=session.headers,
+        timeout=HTTP_TIMEOUT
+    ).get_data_frames()[0]
+    from_year = pd.to_numeric(players["FROM_YEAR"], errors="coerce")
+    return players.loc[from_year == int(SEASON[:4]), "PERSON_ID"].astype(int).tolist()
+
+# Columnas que guardamos del frame de liga; las que no vengan se ignoran.
+_PLAYER_ADVANCED_COLS = [
+    "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "AGE", "GP", "W", "L", "W_PCT", "MIN",
+    "TS_PCT", "USG_PCT", "NET_RATING", "PIE",
+]
+_PLAYER_BASE_COLS = ["PLAYER_ID", "PTS", "AST", "REB", "STL", "BLK", "TOV", "PLUS_MINUS"]
+
+def _load_league_players() -> List[Dict]:
     """
-    Heurística simple y transparente para MVP:
-    MVP_score = z(PTS) + 1.2*z(AST) + 0.8*z(REB) + 1.5*z(TS%) + 1.8*z(TEAM_WPCT)
-    (mezcla producción individual y rendimiento del equipo)
+    Un único frame de toda la liga (Advanced + Base) con la columna IS_ROOKIE;
+    los ladders se derivan de él filtrando, sin llamadas extra a nba.com.
     """
-    cache_key = f"mvp_{SEASON}"
-    cached = _get_cache(cache_key)
-    if cached is not None:
-        return cached
+    advanced = leaguedashplayerstats.LeagueDashPlayerStats(
+        season=SEASON,
+        per_mode_detailed="PerGame",
+        measure_type_detailed_defense="Advanced",
+        season_type_all_star="Regular Season",
+        league_id_nullable="00",
+        headers=session.headers,
+        timeout=HTTP_TIMEOUT
+    ).get_data_frames()[0]
+    base = leaguedashplayerstats.LeagueDashPlayerStats(
+        season=SEASON,
+        per_mode_detailed="PerGame",
+        measure_type_detailed_defense="Base",
+        season_type_all_star="Regular Season",
+        league_id_nullable="00",
+        headers=session.headers,
+        timeout=HTTP_TIMEOUT
+    ).get_data_frames()[0]
+    advanced = advanced[[c for c in _PLAYER_ADVANCED_COLS if c in advanced.columns]]
+    base = base[[c for c in _PLAYER_BASE_COLS if c in base.columns]]
+    frame = advanced.merge(base, on="PLAYER_ID", how="left")
+    rookie_ids = _fresh(f"rookies_{SEASON}", _load_rookie_ids, ttl=ROOKIES_TTL)
+    frame["IS_ROOKIE"] = frame["PLAYER_ID"].isin(rookie_ids)
+    return frame.to_dict(orient="records")
 
-    # Producción individual (Advanced para TS%)
-    try:
-        advanced_raw = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=SEASON,
-            per_mode_detailed="PerGame",
-            measure_type_detailed_defense="Advanced",
-            headers=session.headers,
-            timeout=HTTP_TIMEOUT
-        ).get_data_frames()[0]
-        advanced = advanced_raw[[
-            "TEAM_ID",
-            "PLAYER_ID",
-            "PLAYER_NAME",
-            "TEAM_ABBREVIATION",
-            "GP",
-            "W",
-            "L",
-            "W_PCT",
-            "TS_PCT",
-        ]]
-        base = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=SEASON,
-            per_mode_detailed="PerGame",
-            measure_type_detailed_defense="Base",
-            season_type_all_star="Regular Season",
-            league_id_nullable="00",
-            headers=session.headers,
-            timeout=HTTP_TIMEOUT
-        ).get_data_frames()[0][["PLAYER_ID", "PTS", "AST", "REB"]]
-        p = advanced.merge(base, on="PLAYER_ID", how="left")
-    except Exception as exc:
-        print(f"[NBA] mvp ladder fetch failed: {exc}")
-        return cached if cached is not None else []
+def _league_player_frame() -> pd.DataFrame:
+    return pd.DataFrame.from_records(_fresh(f"players_{SEASON}", _load_league_players))
 
-    # Win% del equipo
+def get_standings() -> List[Dict]:
+    """
+    Clasificación de temporada regular: TEAM_ID, TEAM_NAME, CONFERENCE,
+    PLAYOFF_RANK, W, L, TEAM_WPCT.
+    """
+    return _cached(f"standings_{SEASON}", _load_standings, "standings")
+
+def _load_standings() -> List[Dict]:
     st_raw = leaguestandingsv3.LeagueStandingsV3(
         season=SEASON,
         league_id="00",
@@ -140,85 +282,145 @@ def get_mvp_ladder() -> List[Dict]:
         headers=session.headers,
         timeout=HTTP_TIMEOUT
     ).get_data_frames()[0]
+
+    standings_cols = {
+        "TeamID": "TEAM_ID",
+        "Conference": "CONFERENCE",
+        "PlayoffRank": "PLAYOFF_RANK",
+        "WinPCT": "TEAM_WPCT",
+    }
     if {"W", "L"}.issubset(st_raw.columns):
-        standings_cols = {"TeamID": "TEAM_ID", "W": "W", "L": "L", "WinPCT": "TEAM_WPCT"}
+        standings_cols.update({"W": "W", "L": "L"})
     else:
-        standings_cols = {"TeamID": "TEAM_ID", "WINS": "W", "LOSSES": "L", "WinPCT": "TEAM_WPCT"}
-    available_cols = [c for c in standings_cols if c in st_raw.columns]
-    st = st_raw[available_cols].rename(columns=standings_cols)
-    st = st[["TEAM_ID", "TEAM_WPCT"]]
+        standings_cols.update({"WINS": "W", "LOSSES": "L"})
+    st = st_raw[[c for c in standings_cols if c in st_raw.columns]].rename(columns=standings_cols)
+    if {"TeamCity", "TeamName"}.issubset(st_raw.columns):
+        st["TEAM_NAME"] = st_raw["TeamCity"].str.cat(st_raw["TeamName"], sep=" ")
+    return st.to_dict(orient="records")
+
+def standings_frame() -> pd.DataFrame:
+    return pd.DataFrame.from_records(_fresh(f"standings_{SEASON}", _load_standings))
 
-    df = p.merge(st, on="TEAM_ID", how="left")
-    safe = df.fillna({"TEAM_WPCT": 0.5})
-    # columnas que usaremos
-    pick = safe[["PLAYER_ID","PLAYER_NAME","TEAM_ABBREVIATION","GP","W","L","TEAM_WPCT","PTS","AST","REB","TS_PCT"]].copy()
+# Ladders (MVP, ROY, ...) definidos en app/config/nba_ladders.json; ver nba_ladders.
+LADDERS = nba_ladders.load_specs()
 
-    # zscores
-    for c in ["PTS","AST","REB","TS_PCT","TEAM_WPCT"]:
-        pick[f"z_{c}"] = _zscore(pick[c])
+def get_ladder(name: str) -> List[Dict]:
+    """TOP-N del premio `name` según su LadderSpec (KeyError si no está configurado)."""
+    spec = LADDERS[name]
+    return _cached(f"{name}_{SEASON}", lambda: _load_ladder(spec), f"{name} ladder")
 
-    pick["MVP_SCORE"] = pick["z_PTS"] + 1.2*pick["z_AST"] + 0.8*pick["z_REB"] + 1.5*pick["z_TS_PCT"] + 1.8*pick["z_TEAM_WPCT"]
-    pick = pick.sort_values("MVP_SCORE", ascending=False)
+def _ladder_source(spec: nba_ladders.LadderSpec) -> pd.DataFrame:
+    """Frame de liga, con el Win% de la clasificación solo si el spec usa columnas de equipo."""
+    players = _league_player_frame()
+    missing = spec.needs() - set(players.columns)
+    if not missing:
+        return players
+    st = standings_frame()
+    team_cols = [c for c in st.columns if c in missing]
+    if not team_cols:
+        return players
+    return players.merge(st[["TEAM_ID", *team_cols]], on="TEAM_ID", how="left")
 
-    cols_out = ["PLAYER_ID","PLAYER_NAME","TEAM_ABBREVIATION","GP","PTS","AST","REB","TS_PCT","TEAM_WPCT","MVP_SCORE"]
-    top10 = pick[cols_out].head(10).to_dict(orient="records")
-    _set_cache(cache_key, top10)
-    return top10
+def _load_ladder(spec: nba_ladders.LadderSpec) -> List[Dict]:
+    return nba_ladders.top(_ladder_source(spec), spec).to_dict(orient="records")
+
+def ladder_frame(name: str) -> pd.DataFrame:
+    """Todos los candidatos del premio ordenados por su score."""
+    spec = LADDERS[name]
+    return nba_ladders.ranked(_ladder_source(spec), spec)
+
+def get_mvp_ladder() -> List[Dict]:
+    """
+    Heurística simple y transparente para MVP (pesos en nba_ladders.json):
+    MVP_score = z(PTS) + 1.2*z(AST) + 0.8*z(REB) + 1.5*z(TS%) + 1.8*z(TEAM_WPCT)
+    (mezcla producción individual y rendimiento del equipo)
+    """
+    return get_ladder("mvp")
+
+def mvp_frame() -> pd.DataFrame:
+    """Toda la liga ordenada por MVP_SCORE (el ladder se queda con las 10 primeras filas)."""
+    return ladder_frame("mvp")
 
 def get_roy_ladder() -> List[Dict]:
     """
-    ROY = mismos ingredientes pero filtrando rookies.
+    ROY = mismos ingredientes pero filtrando rookies (pesos en nba_ladders.json).
     ROY_score = z(PTS) + 1.0*z(AST) + 1.0*z(REB) + 1.2*z(TS%)
     (no metemos Win% del equipo para no penalizar al rookie por contexto)
     """
-    cache_key = f"roy_{SEASON}"
-    cached = _get_cache(cache_key)
-    if cached is not None:
-        return cached
+    return get_ladder("roy")
 
-    try:
-        rook_adv_raw = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=SEASON,
-            per_mode_detailed="PerGame",
-            measure_type_detailed_defense="Advanced",
-            player_experience_nullable="Rookie",
-            season_type_all_star="Regular Season",
-            league_id_nullable="00",
-            headers=session.headers,
-            timeout=HTTP_TIMEOUT
-        ).get_data_frames()[0]
-        rook_adv = rook_adv_raw[[
-            "TEAM_ID",
-            "PLAYER_ID",
-            "PLAYER_NAME",
-            "TEAM_ABBREVIATION",
-            "GP",
-            "W",
-            "L",
-            "W_PCT",
-            "TS_PCT",
-        ]]
-        rook_base = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=SEASON,
-            per_mode_detailed="PerGame",
-            measure_type_detailed_defense="Base",
-            player_experience_nullable="Rookie",
-            season_type_all_star="Regular Season",
-            league_id_nullable="00",
-            headers=session.headers,
-            timeout=HTTP_TIMEOUT
-        ).get_data_frames()[0][["PLAYER_ID", "PTS", "AST", "REB"]]
-        rook = rook_adv.merge(rook_base, on="PLAYER_ID", how="left")
-    except Exception as exc:
-        print(f"[NBA] roy ladder fetch failed: {exc}")
-        return cached if cached is not None else []
-
-    pick = rook[["PLAYER_ID","PLAYER_NAME","TEAM_ABBREVIATION","GP","PTS","AST","REB","TS_PCT"]].copy()
-    for c in ["PTS","AST","REB","TS_PCT"]:
-        pick[f"z_{c}"] = _zscore(pick[c])
-
-    pick["ROY_SCORE"] = pick["z_PTS"] + pick["z_AST"] + pick["z_REB"] + 1.2*pick["z_TS_PCT"]
-    cols_out = ["PLAYER_ID","PLAYER_NAME","TEAM_ABBREVIATION","GP","PTS","AST","REB","TS_PCT","ROY_SCORE"]
-    top10 = pick.sort_values("ROY_SCORE", ascending=False)[cols_out].head(10).to_dict(orient="records")
-    _set_cache(cache_key, top10)
-    return top10
+def roy_frame() -> pd.DataFrame:
+    """Todos los rookies ordenados por ROY_SCORE."""
+    return ladder_frame("roy")
+
+def tracker_keys() -> List[str]:
+    return [f"team_adv_{SEASON}", f"mvp_{SEASON}", f"roy_{SEASON}"]
+
+def data_version(keys: List[str]) -> Optional[str]:
+    """
+    Huella de las entradas cacheadas (clave + fetched_at). None si falta alguna
+    o alguna ha caducado: entonces hay que pasar por los getters para que
+    lancen el refresco en segundo plano.
+    """
+    stamps = []
+    for key in keys:
+        entry = _get_entry(key)
+        if entry is None or not entry.fresh:
+            return None
+        stamps.append(f"{key}@{entry.fetched_at:.6f}")
+    return sha1("|".join(stamps).encode()).hexdigest()[:16]
+
+# Representaciones ya generadas (HTML del tracker, JSON...) por tipo: (versión, bytes).
+_rendered: Dict[str, Tuple[str, bytes]] = {}
+_rendered_lock = threading.Lock()
+
+def get_rendered(kind: str, version: Optional[str]) -> Optional[bytes]:
+    if version is None:
+        return None
+    with _rendered_lock:
+        cached = _rendered.get(kind)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+def set_rendered(kind: str, version: str, body: bytes) -> None:
+    with _rendered_lock:
+        _rendered[kind] = (version, body)
+
+def _warm_targets():
+    return [
+        (f"team_adv_{SEASON}", _load_team_advanced, "team_advanced"),
+        *(
+            (f"{name}_{SEASON}", lambda spec=spec: _load_ladder(spec), f"{name} ladder")
+            for name, spec in LADDERS.items()
+        ),
+        (f"standings_{SEASON}", _load_standings, "standings"),
+    ]
+
+_warmer: Optional[threading.Thread] = None
+_warmer_stop = threading.Event()
+
+def _warm_loop(stop: threading.Event):
+    while not stop.is_set():
+        for cache_key, load, label in _warm_targets():
+            if stop.is_set():
+                return
+            _single_flight(
+                cache_key,
+                lambda key=cache_key, fn=load, name=label: _refresh(key, fn, name, refresh_ahead=REFRESH_AHEAD),
+            )
+        # Jitter para que réplicas y workers no se sincronicen contra nba.com.
+        stop.wait(WARM_INTERVAL * random.uniform(0.8, 1.2))
+
+def start_warmer():
+    """Arranca (una vez por proceso) el hilo que refresca la caché antes de que caduque."""
+    global _warmer, _warmer_stop
+    if not WARMER_ENABLED or (_warmer is not None and _warmer.is_alive() and not _warmer_stop.is_set()):
+        return
+    # Evento nuevo por hilo: uno ya parado puede seguir terminando un refresco y saldrá solo.
+    _warmer_stop = threading.Event()
+    _warmer = threading.Thread(target=_warm_loop, args=(_warmer_stop,), name="nba-cache-warmer", daemon=True)
+    _warmer.start()
+
+def stop_warmer():
+    _warmer_stop.set()
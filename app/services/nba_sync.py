@@ -0,0 +1,756 @@
+# app/services/nba_sync.py
+"""
+Incremental sync of NBA teams and players from nba_api.
+
+Used by ``scripts/fetch_nba_data.py`` (by hand or from the ``nba-sync``
+CronJob) and by an optional in-app thread (``NBA_SYNC_ENABLED``). Each run:
+
+1. Hashes the static team and player lists and compares them with the
+   hashes stored in ``nba_sync_state`` (one row per entity: ``teams``,
+   ``players``, ``roster:<nba_team_id>``, ``signature:<nba_team_id>``).
+2. Asks stats.nba.com for the league-wide list of current players (one
+   request) and hashes each team's player ids. Only rosters whose signature
+   changed (trades, signings, cuts), that were never stored, or that are
+   older than ``NBA_SYNC_ROSTER_MAX_AGE_SECONDS`` (position changes) are
+   downloaded; the rest come from the payload stored with their hash.
+3. Skips the team upsert when the team list is unchanged, and the player
+   upsert (and the ``reference`` version bump) when neither the player list
+   nor any roster changed.
+4. Records itself in ``nba_sync_runs`` with its status, per-phase durations
+   and change counts.
+
+A quiet 15-minute run therefore costs one request. A roster that fails to
+download keeps its old signature, so the next run retries only that team;
+meanwhile its last stored roster is used. Local checkpoints only help
+reruns inside the same container. A Postgres advisory lock keeps CronJob
+runs and app replicas from syncing at the same time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2.errors
+from psycopg2.extras import Json, execute_values
+from nba_api.stats.static import teams as nba_teams_static
+from nba_api.stats.static import players as nba_players_static
+from nba_api.stats.endpoints import commonallplayers, commonteamroster
+
+# nba_stats owns the shared stats.nba.com session (hardened headers, fixtures in record/replay mode).
+from app.services import nba_stats
+from app.services.player_search import classify_player_position
+
+FETCH_WORKERS = int(os.getenv("NBA_FETCH_WORKERS", "4"))
+# stats.nba.com starts answering with timeouts/403s above a couple of requests per second.
+FETCH_RATE_PER_SECOND = float(os.getenv("NBA_FETCH_RATE_PER_SECOND", "2"))
+FETCH_RETRIES = int(os.getenv("NBA_FETCH_RETRIES", "4"))
+FETCH_TIMEOUT_SECONDS = int(os.getenv("NBA_FETCH_TIMEOUT_SECONDS", "20"))
+# Local to the container: it only helps reruns in the same pod/process. Runs resume from nba_sync_state.
+CHECKPOINT_DIR = Path(os.getenv("NBA_FETCH_CHECKPOINT_DIR", "/tmp/nba_roster_checkpoints"))
+# Older checkpoints are refetched even if present.
+CHECKPOINT_MAX_AGE_SECONDS = int(os.getenv("NBA_FETCH_CHECKPOINT_MAX_AGE_SECONDS", "21600"))
+
+# Rosters whose player list did not change are still refetched this often (positions, names).
+ROSTER_MAX_AGE_SECONDS = int(os.getenv("NBA_SYNC_ROSTER_MAX_AGE_SECONDS", "86400"))
+
+# The CronJob is the default scheduler; enable this instead when there is none (docker compose).
+SYNC_ENABLED = os.getenv("NBA_SYNC_ENABLED", "false").lower() in ("1", "true", "yes")
+SYNC_INTERVAL = int(os.getenv("NBA_SYNC_INTERVAL_SECONDS", "900"))
+# Any constant works; it only has to be the same for the CronJob and every replica.
+ADVISORY_LOCK_KEY = 4_202_620
+
+
+WEST_ABBREVIATIONS = {
+    "DAL",
+    "DEN",
+    "GSW",
+    "HOU",
+    "LAC",
+    "LAL",
+    "MEM",
+    "MIN",
+    "NOP",
+    "OKC",
+    "PHX",
+    "POR",
+    "SAC",
+    "SAS",
+    "UTA",
+}
+
+
+def _conference_from_entry(entry: dict) -> str:
+    """Derive the team conference using available metadata or a static map."""
+    raw = entry.get("conference") or entry.get("confName")
+    if raw:
+        normalized = raw.strip().lower()
+        if "west" in normalized:
+            return "West"
+        if "east" in normalized:
+            return "East"
+    abbr = (entry.get("abbreviation") or "").upper()
+    if abbr in WEST_ABBREVIATIONS:
+        return "West"
+    return "East"
+
+
+def payload_hash(payload: Any) -> str:
+    """Stable digest of a JSON-like nba_api payload (key order does not matter)."""
+    return sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _change_counts(returned: List[Tuple[Any, ...]], total: int) -> Dict[str, int]:
+    """Split RETURNING (..., inserted) rows of a guarded upsert into inserted/updated/unchanged."""
+    inserted = sum(1 for row in returned if row[-1])
+    updated = len(returned) - inserted
+    return {"inserted": inserted, "updated": updated, "unchanged": total - inserted - updated}
+
+
+def _changed(counts: Dict[str, int]) -> bool:
+    return counts["inserted"] + counts["updated"] > 0
+
+
+def _report(label: str, counts: Dict[str, int]) -> None:
+    print(
+        f"✅ {label}: {counts['inserted']} nuevos, {counts['updated']} actualizados, "
+        f"{counts['unchanged']} sin cambios"
+    )
+
+
+def _team_records(payload: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    records = []
+    for entry in payload:
+        nba_team_id = entry.get("id")
+        if nba_team_id is None:
+            continue
+        records.append(
+            (
+                int(nba_team_id),
+                entry.get("full_name") or entry.get("nickname") or "Unknown",
+                entry.get("abbreviation") or entry.get("tricode") or "",
+                _conference_from_entry(entry),
+                entry.get("city"),
+                entry.get("nickname"),
+            )
+        )
+    return records
+
+
+def load_team_map(conn, nba_team_ids: List[int]) -> Dict[int, int]:
+    """nba_team_id -> internal id for the given teams."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT nba_team_id, id FROM nba_teams WHERE nba_team_id = ANY(%s)", (nba_team_ids,))
+        team_map = {int(nba_team_id): int(team_id) for nba_team_id, team_id in cur.fetchall()}
+    conn.commit()
+    return team_map
+
+
+def upsert_teams(conn, payload: List[Dict[str, Any]]) -> Tuple[Dict[int, int], Dict[str, int]]:
+    """Insert or update NBA teams; returns (nba_team_id -> internal id, change counts)."""
+    records = _team_records(payload)
+    if not records:
+        print("⚠️  nba_api.get_teams() devolvió una lista vacía", file=sys.stderr)
+        return {}, _change_counts([], 0)
+
+    with conn.cursor() as cur:
+        # Unchanged teams hit the WHERE guard: no new row version, and nothing returned.
+        returned = execute_values(
+            cur,
+            """
+            INSERT INTO nba_teams (nba_team_id, full_name, abbreviation, conference, city, nickname)
+            VALUES %s
+            ON CONFLICT (nba_team_id) DO UPDATE
+            SET full_name = EXCLUDED.full_name,
+                abbreviation = EXCLUDED.abbreviation,
+                conference = EXCLUDED.conference,
+                city = EXCLUDED.city,
+                nickname = EXCLUDED.nickname
+            WHERE (nba_teams.full_name, nba_teams.abbreviation, nba_teams.conference, nba_teams.city, nba_teams.nickname)
+                  IS DISTINCT FROM
+                  (EXCLUDED.full_name, EXCLUDED.abbreviation, EXCLUDED.conference, EXCLUDED.city, EXCLUDED.nickname)
+            RETURNING nba_team_id, (xmax = 0) AS inserted
+            """,
+            records,
+            fetch=True,
+        )
+    conn.commit()
+    team_map = load_team_map(conn, [record[0] for record in records])
+    counts = _change_counts(returned, len(records))
+    _report(f"{len(team_map)} equipos NBA", counts)
+    return team_map, counts
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/per_second apart across all threads."""
+
+    def __init__(self, per_second: float):
+        self._interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _checkpoint_path(nba_team_id: int) -> Path:
+    return CHECKPOINT_DIR / f"roster_{nba_team_id}.json"
+
+
+def _load_checkpoint(nba_team_id: int) -> Dict[str, Any] | None:
+    path = _checkpoint_path(nba_team_id)
+    try:
+        if time.time() - path.stat().st_mtime > CHECKPOINT_MAX_AGE_SECONDS:
+            return None
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        print(f"⚠️  Checkpoint ilegible para team_id={nba_team_id}: {exc}", file=sys.stderr)
+        return None
+
+
+def _save_checkpoint(nba_team_id: int, roster: Dict[str, Any]) -> None:
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CHECKPOINT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(roster, fh)
+    os.replace(tmp_path, _checkpoint_path(nba_team_id))
+
+
+def clear_checkpoints() -> None:
+    for path in CHECKPOINT_DIR.glob("roster_*.json"):
+        path.unlink(missing_ok=True)
+
+
+def _fetch_roster(nba_team_id: int, limiter: RateLimiter) -> Dict[str, Any]:
+    """One team's roster result set ({"headers": [...], "data": [...]}), retried with jittered backoff."""
+    attempts = max(FETCH_RETRIES, 1)
+    for attempt in range(1, attempts + 1):
+        limiter.wait()
+        try:
+            # Same season as _team_signatures; nba_api's default follows the calendar instead.
+            roster = commonteamroster.CommonTeamRoster(
+                team_id=nba_team_id,
+                season=nba_stats.SEASON,
+                headers=nba_stats.session.headers,
+                timeout=FETCH_TIMEOUT_SECONDS,
+            )
+            return roster.common_team_roster.get_dict()
+        except Exception as exc:
+            if attempt == attempts:
+                raise
+            delay = min(2 ** (attempt - 1), 30) * random.uniform(0.5, 1.5)
+            print(f"↻  team_id={nba_team_id} intento {attempt} falló ({exc}); reintento en {delay:.1f}s", file=sys.stderr)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def fetch_rosters(
+    team_ids: List[int],
+    *,
+    workers: int = FETCH_WORKERS,
+    rate: float = FETCH_RATE_PER_SECOND,
+    use_checkpoints: bool = True,
+) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+    """Return ({nba_team_id: roster}, failed_team_ids), reusing checkpoints when allowed."""
+    rosters: Dict[int, Dict[str, Any]] = {}
+    pending: List[int] = []
+    for nba_team_id in team_ids:
+        cached = _load_checkpoint(nba_team_id) if use_checkpoints else None
+        if cached is not None:
+            rosters[nba_team_id] = cached
+        else:
+            pending.append(nba_team_id)
+    print(f"⏳ Descargando {len(pending)} plantillas ({len(rosters)} desde checkpoint, {workers} hilos, {rate:g} req/s)")
+
+    started = time.monotonic()
+    limiter = RateLimiter(rate)
+    failed: List[int] = []
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = {executor.submit(_fetch_roster, nba_team_id, limiter): nba_team_id for nba_team_id in pending}
+        for future in as_completed(futures):
+            nba_team_id = futures[future]
+            try:
+                roster = future.result()
+            except Exception as exc:
+                print(f"⚠️  No se pudo obtener la plantilla para team_id={nba_team_id}: {exc}", file=sys.stderr)
+                failed.append(nba_team_id)
+                continue
+            _save_checkpoint(nba_team_id, roster)
+            rosters[nba_team_id] = roster
+    print(f"✅ {len(pending) - len(failed)} plantillas descargadas en {time.monotonic() - started:.1f}s")
+    return rosters, sorted(failed)
+
+
+def _player_metadata(team_map: Dict[int, int], rosters: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Return roster metadata keyed by nba_player_id."""
+    metadata: Dict[int, Dict[str, Any]] = {}
+    for nba_team_id, internal_team_id in team_map.items():
+        roster = rosters.get(nba_team_id) or {}
+        columns = {name: index for index, name in enumerate(roster.get("headers") or [])}
+        player_col = columns.get("PLAYER_ID", 14)
+        position_col = columns.get("POSITION", 7)
+        name_col = columns.get("PLAYER", 3)
+        for row in roster.get("data", []):
+            try:
+                player_id = int(row[player_col])
+            except (ValueError, TypeError, IndexError):
+                continue
+            position = row[position_col]
+            full_name = row[name_col]
+            payload = metadata.setdefault(
+                player_id,
+                {"position": "", "team_id": internal_team_id, "full_name": ""},
+            )
+            if position:
+                payload["position"] = position
+            payload["team_id"] = internal_team_id
+            if full_name:
+                payload["full_name"] = full_name
+    return metadata
+
+
+def upsert_players(conn, player_metadata: Dict[int, Dict[str, Any]], payload: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Insert or update active players; returns inserted/updated/unchanged counts."""
+    if not payload:
+        print("⚠️  nba_api.get_players() devolvió una lista vacía", file=sys.stderr)
+        return _change_counts([], 0)
+
+    active_records = []
+    seen_player_ids: set[int] = set()
+    for entry in payload:
+        nba_player_id = entry.get("id")
+        if nba_player_id is None:
+            continue
+        player_id_int = int(nba_player_id)
+        meta = player_metadata.get(player_id_int)
+        is_roster_player = meta is not None
+        if not entry.get("is_active") and not is_roster_player:
+            continue
+        full_name = next(
+            (value for value in (entry.get("full_name"), meta.get("full_name") if meta else None) if value),
+            "",
+        ).strip()
+        if not full_name:
+            continue
+        position = ""
+        if meta and meta.get("position"):
+            position = meta["position"]
+        elif entry.get("position"):
+            position = entry["position"]
+        internal_team_id = meta.get("team_id") if meta else None
+        active_records.append(
+            (
+                player_id_int,
+                full_name,
+                internal_team_id,
+                position,
+                classify_player_position(position),
+            )
+        )
+        seen_player_ids.add(player_id_int)
+
+    # Add players that only exist on the live roster payload (typically fresh rookies).
+    for player_id_int, meta in player_metadata.items():
+        if player_id_int in seen_player_ids:
+            continue
+        full_name = (meta.get("full_name") or "").strip()
+        if not full_name:
+            continue
+        active_records.append(
+            (
+                player_id_int,
+                full_name,
+                meta.get("team_id"),
+                meta.get("position") or "",
+                classify_player_position(meta.get("position")),
+            )
+        )
+
+    if not active_records:
+        print("⚠️  No se encontraron jugadores activos en la respuesta de nba_api", file=sys.stderr)
+        return _change_counts([], 0)
+
+    with conn.cursor() as cur:
+        returned = execute_values(
+            cur,
+            """
+            INSERT INTO nba_players (nba_player_id, full_name, team_id, position, bucket)
+            VALUES %s
+            ON CONFLICT (nba_player_id) DO UPDATE
+            SET full_name = EXCLUDED.full_name,
+                team_id = EXCLUDED.team_id,
+                position = EXCLUDED.position,
+                bucket = EXCLUDED.bucket
+            WHERE (nba_players.full_name, nba_players.team_id, nba_players.position, nba_players.bucket)
+                  IS DISTINCT FROM
+                  (EXCLUDED.full_name, EXCLUDED.team_id, EXCLUDED.position, EXCLUDED.bucket)
+            RETURNING nba_player_id, (xmax = 0) AS inserted
+            """,
+            active_records,
+            page_size=500,
+            fetch=True,
+        )
+    conn.commit()
+    counts = _change_counts(returned, len(active_records))
+    _report(f"{len(active_records)} jugadores activos", counts)
+    return counts
+
+
+def bump_reference_version(conn) -> int | None:
+    """Bump nba_data_versions so running app processes rebuild their cached teams/players."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO nba_data_versions (name) VALUES ('reference')
+                ON CONFLICT (name) DO UPDATE
+                SET version = nba_data_versions.version + 1,
+                    updated_at = NOW()
+                RETURNING version
+                """
+            )
+            version = cur.fetchone()[0]
+            cur.execute("SELECT pg_notify('nba_data_versions', 'reference')")
+        conn.commit()
+    except psycopg2.errors.UndefinedTable:
+        conn.rollback()
+        print("⚠️  nba_data_versions no existe todavía (arranca la app una vez); la caché se renovará por TTL", file=sys.stderr)
+        return None
+    print(f"✅ Versión de datos de referencia: {version}")
+    return int(version)
+
+
+def _load_state(conn) -> Dict[str, Dict[str, Any]]:
+    """entity -> {"hash", "payload", "checked_at" (epoch seconds)}."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT entity, hash, payload, EXTRACT(EPOCH FROM checked_at) FROM nba_sync_state")
+        state = {
+            entity: {"hash": digest, "payload": payload, "checked_at": float(checked_at)}
+            for entity, digest, payload, checked_at in cur.fetchall()
+        }
+    conn.commit()
+    return state
+
+
+def _save_state(conn, entries: Dict[str, Tuple[str, Any]]) -> None:
+    """Upsert (hash, payload) per entity; a None payload keeps the stored one."""
+    if not entries:
+        return
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            """
+            INSERT INTO nba_sync_state (entity, hash, payload) VALUES %s
+            ON CONFLICT (entity) DO UPDATE
+            SET changed_at = CASE WHEN nba_sync_state.hash IS DISTINCT FROM EXCLUDED.hash
+                                  THEN NOW() ELSE nba_sync_state.changed_at END,
+                hash = EXCLUDED.hash,
+                payload = COALESCE(EXCLUDED.payload, nba_sync_state.payload),
+                checked_at = NOW()
+            """,
+            [
+                (entity, digest, Json(payload) if payload is not None else None)
+                for entity, (digest, payload) in sorted(entries.items())
+            ],
+        )
+    conn.commit()
+
+
+def _team_signatures(team_ids: List[int]) -> Optional[Dict[int, str]]:
+    """Hash of each team's current player ids, from one league-wide request; None if it fails."""
+    try:
+        players = commonallplayers.CommonAllPlayers(
+            is_only_current_season=1,
+            league_id="00",
+            season=nba_stats.SEASON,
+            headers=nba_stats.session.headers,
+            timeout=FETCH_TIMEOUT_SECONDS,
+        ).common_all_players.get_dict()
+    except Exception as exc:
+        print(f"⚠️  No se pudo obtener la lista de jugadores de la liga ({exc}); solo se renuevan plantillas caducadas", file=sys.stderr)
+        return None
+    columns = {name: index for index, name in enumerate(players.get("headers") or [])}
+    if "TEAM_ID" not in columns or "PERSON_ID" not in columns:
+        print("⚠️  CommonAllPlayers sin TEAM_ID/PERSON_ID; solo se renuevan plantillas caducadas", file=sys.stderr)
+        return None
+    members: Dict[int, List[int]] = {nba_team_id: [] for nba_team_id in team_ids}
+    for row in players.get("data", []):
+        try:
+            nba_team_id = int(row[columns["TEAM_ID"]])
+            person_id = int(row[columns["PERSON_ID"]])
+        except (ValueError, TypeError, IndexError):
+            continue
+        if nba_team_id in members:
+            members[nba_team_id].append(person_id)
+    return {nba_team_id: payload_hash(sorted(ids)) for nba_team_id, ids in members.items()}
+
+
+def _start_run(conn, trigger: str) -> int:
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO nba_sync_runs (triggered_by) VALUES (%s) RETURNING id", (trigger,))
+        run_id = cur.fetchone()[0]
+    conn.commit()
+    return int(run_id)
+
+
+def _finish_run(conn, run_id: int, result: Dict[str, Any], duration_ms: int, error: str | None = None) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE nba_sync_runs
+            SET finished_at = NOW(), duration_ms = %s, status = %s, details = %s, error = %s
+            WHERE id = %s
+            """,
+            (duration_ms, result["status"], json.dumps(result), error, run_id),
+        )
+    conn.commit()
+
+
+def _try_lock(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+        locked = bool(cur.fetchone()[0])
+    conn.commit()
+    return locked
+
+
+def _unlock(conn) -> None:
+    conn.rollback()
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_KEY,))
+    conn.commit()
+
+
+def _due_rosters(
+    team_map: Dict[int, int],
+    stored: Dict[str, Dict[str, Any]],
+    signatures: Optional[Dict[int, str]],
+    force: bool,
+) -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+    """(teams whose roster must be downloaded, stored rosters reused for the others)."""
+    now = time.time()
+    due: List[int] = []
+    reused: Dict[int, Dict[str, Any]] = {}
+    for nba_team_id in team_map:
+        roster = stored.get(f"roster:{nba_team_id}") or {}
+        signature = stored.get(f"signature:{nba_team_id}") or {}
+        if (
+            force
+            or roster.get("payload") is None
+            or now - roster["checked_at"] > ROSTER_MAX_AGE_SECONDS
+            or (signatures is not None and signature.get("hash") != signatures.get(nba_team_id))
+        ):
+            due.append(nba_team_id)
+        else:
+            reused[nba_team_id] = roster["payload"]
+    return due, reused
+
+
+def _sync(
+    conn,
+    result: Dict[str, Any],
+    *,
+    workers: int,
+    rate: float,
+    use_checkpoints: bool,
+    force: bool,
+) -> Dict[str, Any]:
+    timings = result["timings_ms"]
+    stored = _load_state(conn)
+    fresh: Dict[str, Tuple[str, Any]] = {}
+
+    started = time.monotonic()
+    teams_payload = nba_teams_static.get_teams()
+    fresh["teams"] = (payload_hash(teams_payload), None)
+    team_ids = [record[0] for record in _team_records(teams_payload)]
+    team_map = {} if force else load_team_map(conn, team_ids)
+    if force or (stored.get("teams") or {}).get("hash") != fresh["teams"][0] or len(team_map) != len(team_ids):
+        team_map, result["teams"] = upsert_teams(conn, teams_payload)
+    else:
+        print(f"ℹ️  Equipos sin cambios ({len(team_map)})")
+    timings["teams"] = int((time.monotonic() - started) * 1000)
+    teams_changed = _changed(result["teams"]) if result.get("teams") else False
+
+    started = time.monotonic()
+    signatures = _team_signatures(list(team_map))
+    due, rosters = _due_rosters(team_map, stored, signatures, force)
+    print(f"ℹ️  {len(due)} plantillas con cambios o caducadas, {len(rosters)} sin cambios")
+    fetched, failed = fetch_rosters(due, workers=workers, rate=rate, use_checkpoints=use_checkpoints) if due else ({}, [])
+    timings["fetch"] = int((time.monotonic() - started) * 1000)
+    result["requests"] = len(due) + 1
+    result["rosters_due"] = len(due)
+    result["rosters_fetched"] = len(fetched)
+    result["rosters_failed"] = failed
+    result["rosters_changed"] = sorted(
+        nba_team_id
+        for nba_team_id, roster in fetched.items()
+        if (stored.get(f"roster:{nba_team_id}") or {}).get("hash") != payload_hash(roster)
+    )
+    for nba_team_id, roster in fetched.items():
+        rosters[nba_team_id] = roster
+        fresh[f"roster:{nba_team_id}"] = (payload_hash(roster), roster)
+        if signatures is not None:
+            fresh[f"signature:{nba_team_id}"] = (signatures[nba_team_id], None)
+
+    # A failed team keeps its old signature (retried next run) and its last stored roster.
+    missing = []
+    for nba_team_id in failed:
+        previous = (stored.get(f"roster:{nba_team_id}") or {}).get("payload")
+        if previous is None:
+            missing.append(nba_team_id)
+        else:
+            rosters[nba_team_id] = previous
+    if missing:
+        # Without any copy of these rosters, writing players would drop the team of everyone on them.
+        print(
+            f"❌ Faltan {len(missing)} plantillas sin copia previa ({', '.join(map(str, missing))}); "
+            "la próxima ejecución descargará solo esas.",
+            file=sys.stderr,
+        )
+        _save_state(conn, {entity: entry for entity, entry in fresh.items() if entity == "teams" or entity.startswith(("roster:", "signature:"))})
+        if teams_changed:
+            result["version"] = bump_reference_version(conn)
+        result["status"] = "partial"
+        return result
+
+    started = time.monotonic()
+    players_payload = nba_players_static.get_players()
+    fresh["players"] = (payload_hash(players_payload), None)
+    if force or result["rosters_changed"] or (stored.get("players") or {}).get("hash") != fresh["players"][0]:
+        result["players"] = upsert_players(conn, _player_metadata(team_map, rosters), players_payload)
+    else:
+        print("ℹ️  Plantillas y jugadores sin cambios; no se reprocesan")
+    timings["players"] = int((time.monotonic() - started) * 1000)
+    _save_state(conn, fresh)
+
+    changed = teams_changed or bool(result.get("players") and _changed(result["players"]))
+    if changed:
+        result["version"] = bump_reference_version(conn)
+    else:
+        print("ℹ️  Sin cambios en equipos ni jugadores; la versión de datos no se modifica")
+    if failed:
+        result["status"] = "partial"
+    else:
+        result["status"] = "ok" if changed else "unchanged"
+        clear_checkpoints()
+    return result
+
+
+def sync_once(
+    conn,
+    *,
+    trigger: str = "manual",
+    workers: int = FETCH_WORKERS,
+    rate: float = FETCH_RATE_PER_SECOND,
+    use_checkpoints: bool = True,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Run one incremental sync on ``conn`` and log it to nba_sync_runs.
+
+    Returns a summary dict whose ``status`` is ``ok`` (data changed),
+    ``unchanged``, ``partial`` (rosters missing, resumable), ``skipped``
+    (another sync holds the lock) or ``error``.
+    """
+    if not _try_lock(conn):
+        print("ℹ️  Otra sincronización NBA está en curso; se omite esta ejecución")
+        return {"status": "skipped", "reason": "running elsewhere"}
+    started = time.monotonic()
+    result: Dict[str, Any] = {"status": "running", "trigger": trigger, "force": force, "timings_ms": {}}
+    run_id: Optional[int] = None
+    try:
+        run_id = _start_run(conn, trigger)
+        result["run_id"] = run_id
+        _sync(conn, result, workers=workers, rate=rate, use_checkpoints=use_checkpoints, force=force)
+    except Exception as exc:
+        conn.rollback()
+        result["status"] = "error"
+        if run_id is not None:
+            _finish_run(conn, run_id, result, int((time.monotonic() - started) * 1000), error=str(exc))
+        raise
+    else:
+        _finish_run(conn, run_id, result, int((time.monotonic() - started) * 1000))
+    finally:
+        _unlock(conn)
+    result["duration_ms"] = int((time.monotonic() - started) * 1000)
+    return result
+
+
+def sync_with_dsn(dsn: str, **kwargs: Any) -> Dict[str, Any]:
+    """`sync_once` on a connection of its own: a run can take minutes and must not hold a request-pool slot."""
+    conn = psycopg2.connect(dsn, connect_timeout=10)
+    try:
+        return sync_once(conn, **kwargs)
+    finally:
+        conn.close()
+
+
+def recent_runs(cur, limit: int = 20) -> List[Dict[str, Any]]:
+    cur.execute(
+        """
+        SELECT id, triggered_by, status, started_at, finished_at, duration_ms, details, error
+        FROM nba_sync_runs
+        ORDER BY started_at DESC, id DESC
+        LIMIT %s
+        """,
+        (limit,),
+    )
+    return [
+        {
+            "id": run_id,
+            "trigger": trigger,
+            "status": run_status,
+            "started_at": started_at.isoformat() if started_at else None,
+            "finished_at": finished_at.isoformat() if finished_at else None,
+            "duration_ms": duration_ms,
+            "details": details,
+            "error": error,
+        }
+        for run_id, trigger, run_status, started_at, finished_at, duration_ms, details, error in cur.fetchall()
+    ]
+
+
+_worker: Optional[threading.Thread] = None
+_worker_stop = threading.Event()
+
+
+def _sync_loop(dsn: str, stop: threading.Event) -> None:
+    # Stagger replicas so they do not all reach the lock at once after a rollout.
+    stop.wait(SYNC_INTERVAL * random.uniform(0.05, 0.2))
+    while not stop.is_set():
+        try:
+            sync_with_dsn(dsn, trigger="worker")
+        except Exception as exc:
+            # Connection errors included: the thread must outlive a database outage.
+            print(f"[NBA] Sync run failed: {exc}")
+        stop.wait(SYNC_INTERVAL * random.uniform(0.8, 1.2))
+
+
+def start_sync_worker(dsn: str) -> None:
+    """Start (once per process) the thread that syncs teams and players."""
+    global _worker, _worker_stop
+    if not SYNC_ENABLED or (_worker is not None and _worker.is_alive() and not _worker_stop.is_set()):
+        return
+    # A fresh event per thread: one told to stop may still be finishing its run and exits on its own.
+    _worker_stop = threading.Event()
+    _worker = threading.Thread(target=_sync_loop, args=(dsn, _worker_stop), name="nba-sync", daemon=True)
+    _worker.start()
+
+
+def stop_sync_worker() -> None:
+    _worker_stop.set()
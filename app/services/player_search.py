@@ -0,0 +1,149 @@
+# app/services/player_search.py
+"""
+Accent-insensitive player name search.
+
+The primary path is Postgres: a ``pg_trgm`` GIN index over
+``nba_search_norm(full_name)`` (lower + unaccent). When those extensions
+cannot be installed the app falls back to `PlayerSearchIndex`, an in-memory
+trigram index built from the players table, which gives the same matching
+rules (substring, word-prefix first, then fuzzy) without a database round
+trip per keystroke. Word-prefix queries, the common autocomplete case, are
+answered from a sorted array with binary search before touching the trigram
+postings.
+
+Both paths filter on the guard/forward ``bucket`` stored with each player
+(see `classify_player_position`): players from the requested bucket come
+first, then the rest.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Iterable
+
+# Minimum share of the query's trigrams a name must contain to count as a fuzzy match.
+FUZZY_THRESHOLD = 0.4
+
+
+def classify_player_position(raw: str | None) -> str:
+    """Return guard/forward bucket from a raw position string."""
+    if not raw:
+        return "forward"
+    normalized = str(raw).strip().upper()
+    if not normalized:
+        return "forward"
+    if normalized.startswith(("PG", "SG", "G")):
+        return "guard"
+    if "G" in normalized:
+        return "guard"
+    if normalized.startswith(("SF", "PF", "F", "C")):
+        return "forward"
+    if "F" in normalized or "C" in normalized:
+        return "forward"
+    return "forward"
+
+
+def normalize_name(value: str | None) -> str:
+    """Lowercase, strip accents and collapse whitespace ("Nikola  Jokić" -> "nikola jokic")."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+def like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _is_word_prefix(name: str, term: str) -> bool:
+    return name.startswith(term) or f" {term}" in name
+
+
+class PlayerSearchIndex:
+    """Trigram postings over normalized names; records are the suggestion dicts."""
+
+    def __init__(self, records: Iterable[dict[str, Any]]):
+        self.records: list[dict[str, Any]] = list(records)
+        self._names = [normalize_name(record.get("name")) for record in self.records]
+        self._postings: dict[str, set[int]] = {}
+        # Every word of every name, sorted, for bisect-based prefix lookups.
+        words: list[tuple[str, int]] = []
+        for index, name in enumerate(self._names):
+            for gram in _trigrams(name):
+                self._postings.setdefault(gram, set()).add(index)
+            words.extend((word, index) for word in set(name.split()))
+        words.sort()
+        self._word_keys = [word for word, _ in words]
+        self._word_ids = [index for _, index in words]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def prefix_matches(self, term: str) -> list[int]:
+        """Records with a word starting with ``term`` (single word queries only)."""
+        if " " in term:
+            return []
+        start = bisect_left(self._word_keys, term)
+        found: dict[int, None] = {}
+        for position in range(start, len(self._word_keys)):
+            if not self._word_keys[position].startswith(term):
+                break
+            found[self._word_ids[position]] = None
+        return list(found)
+
+    def _substring_matches(self, term: str) -> list[int]:
+        grams = {term[i:i + 3] for i in range(len(term) - 2)}
+        if not grams:
+            return [i for i, name in enumerate(self._names) if term in name]
+        candidates: set[int] | None = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return []
+        return [i for i in candidates or () if term in self._names[i]]
+
+    def _fuzzy_matches(self, term: str) -> list[tuple[float, int]]:
+        grams = _trigrams(term)
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for index in self._postings.get(gram, ()):
+                counts[index] = counts.get(index, 0) + 1
+        scored = [(count / len(grams), index) for index, count in counts.items()]
+        return [(score, index) for score, index in scored if score >= FUZZY_THRESHOLD]
+
+    def _off_bucket(self, index: int, bucket: str | None) -> bool:
+        return bucket is not None and self.records[index].get("bucket") != bucket
+
+    def search(self, query: str, limit: int, bucket: str | None = None) -> list[dict[str, Any]]:
+        term = normalize_name(query)
+        if not term:
+            return []
+        prefix = self.prefix_matches(term)
+        in_bucket = [i for i in prefix if not self._off_bucket(i, bucket)]
+        if len(in_bucket) >= limit:
+            return [self.records[i] for i in sorted(in_bucket, key=self._names.__getitem__)[:limit]]
+        matches = self._substring_matches(term)
+        if matches:
+            ranked = sorted(
+                matches,
+                key=lambda i: (self._off_bucket(i, bucket), not _is_word_prefix(self._names[i], term), self._names[i]),
+            )
+        else:
+            ranked = [
+                index
+                for _, index in sorted(
+                    self._fuzzy_matches(term),
+                    key=lambda item: (self._off_bucket(item[1], bucket), -item[0], self._names[item[1]]),
+                )
+            ]
+        return [self.records[i] for i in ranked[:limit]]
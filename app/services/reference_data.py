@@ -0,0 +1,130 @@
+# app/services/reference_data.py
+"""
+Process-level cache for data that only changes when an import runs.
+
+Teams and players are rewritten by ``scripts/fetch_nba_data.py`` and are
+otherwise read-only, so rebuilding them per request is wasted work. Each
+dataset has a row in ``nba_data_versions``. The import bumps that row and
+sends ``NOTIFY nba_data_versions, '<name>'``.
+
+`VersionedCache` keeps whatever its ``build`` coroutine produced for the
+current version. A LISTEN connection marks it dirty as soon as a
+notification arrives. The version row is also polled every
+``poll_interval`` seconds, which covers missed notifications (restarts,
+pgpool failovers) and imports run against another node. For data that
+changes often (pick analytics) ``min_rebuild_interval`` debounces: the
+current value is served until that long after the last build.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from psycopg import AsyncConnection
+
+from app.services import async_db
+
+NOTIFY_CHANNEL = "nba_data_versions"
+
+T = TypeVar("T")
+
+
+async def current_version(name: str) -> int:
+    row = await async_db.fetch_one("SELECT version FROM nba_data_versions WHERE name = %s", (name,))
+    return int(row[0]) if row else 0
+
+
+class VersionedCache(Generic[T]):
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[int], Awaitable[T]],
+        *,
+        poll_interval: float = 30.0,
+        min_rebuild_interval: float = 0.0,
+    ):
+        self.name = name
+        self._build = build
+        self._poll_interval = poll_interval
+        self._min_rebuild_interval = min_rebuild_interval
+        self._value: T | None = None
+        self._version: int | None = None
+        self._checked_at = float("-inf")
+        self._built_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+        self.rebuilds = 0
+
+    @property
+    def version(self) -> int | None:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Re-check the version on the next get() (debounced) instead of waiting for the poll interval."""
+        self._checked_at = min(self._checked_at, self._built_at + self._min_rebuild_interval - self._poll_interval)
+
+    async def get(self) -> T:
+        if self._value is not None and time.monotonic() - self._checked_at < self._poll_interval:
+            return self._value
+        async with self._lock:
+            if self._value is not None and time.monotonic() - self._checked_at < self._poll_interval:
+                return self._value
+            try:
+                version = await current_version(self.name)
+            except Exception as exc:
+                print(f"[NBA] Unable to read {self.name} data version: {exc}")
+                if self._value is not None:
+                    return self._value
+                version = -1
+            if self._value is None or version != self._version:
+                wait = self._built_at + self._min_rebuild_interval - time.monotonic()
+                if self._value is not None and wait > 0:
+                    # Debounced: keep the current value and look again once the interval is over.
+                    self._checked_at = time.monotonic() + wait - self._poll_interval
+                    return self._value
+                self._value = await self._build(version)
+                self._version = version
+                self._built_at = time.monotonic()
+                self.rebuilds += 1
+            self._checked_at = time.monotonic()
+            return self._value
+
+    async def _listen(self, dsn: str) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with await AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    backoff = 1.0
+                    async for notify in conn.notifies():
+                        if notify.payload in ("", self.name):
+                            self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"[NBA] LISTEN {NOTIFY_CHANNEL} dropped ({exc}); polling until reconnected")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    def start_listener(self, dsn: str) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(dsn))
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self._version,
+            "rebuilds": self.rebuilds,
+            "listening": self._listener is not None and not self._listener.done(),
+        }
@@ -0,0 +1,275 @@
+# app/services/stats_cache.py
+"""
+Cache backends for the stats.nba.com payloads served by `nba_stats`.
+
+Every uvicorn worker in every replica used to keep its own dict, so each one
+refetched the same payloads once per TTL. The backends here share one
+interface (``get(key)`` / ``latest(key)`` / ``set(key, entry)``) so the getters don't care where
+entries live:
+
+* ``memory``   – the original per-process dict.
+* ``file``     – one JSON file per key in a directory shared by the workers
+  of a pod (or by every pod when the directory is on a shared volume).
+* ``postgres`` – the ``nba_stats_cache`` table, shared by every replica.
+
+Entries remember when they were fetched, so callers can keep serving an
+expired value while stats.nba.com is slow or failing.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from hashlib import sha1
+from pathlib import Path
+from typing import Any
+
+
+class CacheEntry:
+    __slots__ = ("value", "fetched_at", "expires_at")
+
+    def __init__(self, value: Any, fetched_at: float, expires_at: float):
+        self.value = value
+        self.fetched_at = fetched_at  # epoch seconds, comparable across processes
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def _json_default(obj: Any) -> Any:
+    # pandas' to_dict() hands back numpy scalars; .item() turns them into Python ones.
+    item = getattr(obj, "item", None)
+    if callable(item):
+        return item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _finite(value: Any) -> Any:
+    """NaN/inf (pandas' missing stats) become None: JSON has no literal for them."""
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if not isinstance(value, (str, int)) and callable(getattr(value, "item", None)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(_finite(value), default=_json_default, separators=(",", ":"), allow_nan=False)
+
+
+class MemoryCacheBackend:
+    name = "memory"
+
+    def __init__(self):
+        self._entries: dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    latest = get
+
+
+class FileCacheBackend:
+    name = "file"
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{sha1(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> CacheEntry | None:
+        try:
+            raw = json.loads(self._path(key).read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            print(f"[NBA] cache file for {key} unreadable: {exc}")
+            return None
+        return CacheEntry(raw["value"], raw["fetched_at"], raw["expires_at"])
+
+    latest = get
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        payload = dumps({"key": key, "value": entry.value, "fetched_at": entry.fetched_at, "expires_at": entry.expires_at})
+        # Write then rename so readers in other workers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class PostgresCacheBackend:
+    name = "postgres"
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def ensure_table(self) -> None:
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS nba_stats_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        fetched_at TIMESTAMPTZ NOT NULL,
+                        expires_at TIMESTAMPTZ NOT NULL
+                    )
+                    """
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+    def get(self, key: str) -> CacheEntry | None:
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT payload, EXTRACT(EPOCH FROM fetched_at), EXTRACT(EPOCH FROM expires_at)
+                    FROM nba_stats_cache
+                    WHERE cache_key = %s
+                    """,
+                    (key,),
+                )
+                row = cur.fetchone()
+        finally:
+            self._pool.putconn(conn)
+        if not row:
+            return None
+        payload, fetched_at, expires_at = row
+        return CacheEntry(json.loads(payload), float(fetched_at), float(expires_at))
+
+    latest = get
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO nba_stats_cache (cache_key, payload, fetched_at, expires_at)
+                    VALUES (%s, %s, to_timestamp(%s), to_timestamp(%s))
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET payload = EXCLUDED.payload,
+                        fetched_at = EXCLUDED.fetched_at,
+                        expires_at = EXCLUDED.expires_at
+                    WHERE nba_stats_cache.fetched_at <= EXCLUDED.fetched_at
+                    """,
+                    (key, dumps(entry.value), entry.fetched_at, entry.expires_at),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+
+class TieredCacheBackend:
+    """Per-process memory in front of a shared backend.
+
+    Fresh entries are answered from memory without touching the shared store;
+    the shared store is only consulted when the local copy is missing or
+    expired, and every write goes to both.
+    """
+
+    def __init__(self, shared):
+        self.local = MemoryCacheBackend()
+        self.shared = shared
+        self.name = f"memory+{shared.name}"
+
+    def get(self, key: str) -> CacheEntry | None:
+        local = self.local.get(key)
+        if local is not None and local.fresh:
+            return local
+        try:
+            shared = self.shared.get(key)
+        except Exception as exc:
+            print(f"[NBA] shared cache read failed for {key}: {exc}")
+            return local
+        if shared is None:
+            return local
+        if local is None or shared.fetched_at > local.fetched_at:
+            self.local.set(key, shared)
+            return shared
+        return local
+
+    def latest(self, key: str) -> CacheEntry | None:
+        """Like get(), but always asks the shared store (another worker may have refreshed it)."""
+        local = self.local.get(key)
+        try:
+            shared = self.shared.get(key)
+        except Exception as exc:
+            print(f"[NBA] shared cache read failed for {key}: {exc}")
+            return local
+        if shared is not None and (local is None or shared.fetched_at > local.fetched_at):
+            self.local.set(key, shared)
+            return shared
+        return local
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.local.set(key, entry)
+        try:
+            self.shared.set(key, entry)
+        except Exception as exc:
+            print(f"[NBA] shared cache write failed for {key}: {exc}")
+
+
+def build_backend(kind: str, *, pool=None, directory: str | None = None):
+    """Return the backend named by NBA_CACHE_BACKEND, falling back to memory."""
+    kind = (kind or "memory").strip().lower()
+    if kind == "postgres":
+        if pool is None:
+            print("[NBA] NBA_CACHE_BACKEND=postgres but no database pool; using memory cache")
+            return MemoryCacheBackend()
+        backend = PostgresCacheBackend(pool)
+        try:
+            backend.ensure_table()
+        except Exception as exc:
+            print(f"[NBA] Cannot create nba_stats_cache ({exc}); using memory cache")
+            return MemoryCacheBackend()
+        return TieredCacheBackend(backend)
+    if kind == "file":
+        try:
+            return TieredCacheBackend(FileCacheBackend(directory or "/tmp/nba_stats_cache"))
+        except OSError as exc:
+            print(f"[NBA] Cannot use cache directory {directory} ({exc}); using memory cache")
+            return MemoryCacheBackend()
+    if kind != "memory":
+        print(f"[NBA] Unknown NBA_CACHE_BACKEND={kind!r}; using memory cache")
+    return MemoryCacheBackend()
@@ -21,6 +21,22 @@ CREATE TABLE IF NOT EXISTS hall_of_hate_v2_ratings (
     FOREIGN KEY (villain_id) REFERENCES hall_of_hate_v2(id) ON DELETE CASCADE
 );
 
+-- Per-villain rating aggregates, maintained by the app on every rating write
+CREATE TABLE IF NOT EXISTS hall_of_hate_v2_rating_stats (
+    villain_id INTEGER PRIMARY KEY REFERENCES hall_of_hate_v2(id) ON DELETE CASCADE,
+    rating_sum BIGINT NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    average_hate NUMERIC,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO hall_of_hate_v2_rating_stats (villain_id, rating_sum, rating_count, average_hate)
+SELECT v.id, COALESCE(SUM(r.rating), 0), COUNT(r.rating), SUM(r.rating)::numeric / NULLIF(COUNT(r.rating), 0)
+FROM hall_of_hate_v2 v
+LEFT JOIN hall_of_hate_v2_ratings r ON r.villain_id = v.id
+GROUP BY v.id
+ON CONFLICT (villain_id) DO NOTHING;
+
 -- Grant permissions to corderos_app user
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO corderos_app;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO corderos_app;
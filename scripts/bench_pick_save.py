@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Measure how long it takes to save a full NBA picks submission (16 playoff
+seeds, 3 honors, 5 All-NBA slots = 24 picks).
+
+Compares the old delete-and-reinsert path (one statement per pick) with the
+diff-based writes in ``app.services.nba_picks`` for three cases: an identical
+resubmission, a submission that changes four picks, and one that changes all 24.
+Needs DATABASE_URL pointing at a database the app has already started
+against (tables, a season and nba_teams rows must exist). Rows are written
+for a throwaway ``bench-<pid>`` user and removed at the end.
+
+    python scripts/bench_pick_save.py [--rounds 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from psycopg import AsyncConnection
+
+from app.services import nba_picks
+
+CONFERENCES = ("East", "West")
+HONOR_CATEGORIES = ("best_record", "mvp", "roy")
+ALL_NBA_BUCKETS = {1: "guard", 2: "guard", 3: "forward", 4: "forward", 5: "forward"}
+
+
+def build_submission(team_ids: list[int], *, changed: int = 0, rewrite: int = 0) -> dict:
+    """A complete submission. ``changed`` swaps East seeds 1-3 and the MVP pick; ``rewrite`` changes every pick."""
+    playoff = {}
+    for offset, conference in enumerate(CONFERENCES):
+        playoff[conference] = {}
+        for seed in range(1, 9):
+            shift = rewrite + (changed if conference == "East" and seed <= 3 else 0)
+            playoff[conference][seed] = team_ids[(offset * 8 + seed - 1 + shift) % len(team_ids)]
+    honors = {
+        category: {
+            "nominee": f"Bench Nominee {category} {rewrite}{'*' * changed if category == 'mvp' else ''}",
+            "team_id": None,
+            "team_name": "Bench Team",
+        }
+        for category in HONOR_CATEGORIES
+    }
+    all_nba = {
+        slot: {"player_name": f"Bench Player {slot} {rewrite}", "position": bucket, "team_name": "Bench Team"}
+        for slot, bucket in ALL_NBA_BUCKETS.items()
+    }
+    return {"playoff": playoff, "honors": honors, "all_nba": all_nba}
+
+
+async def save_legacy(conn: AsyncConnection, season_id: int, user_uid: str, submission: dict) -> None:
+    """The previous implementation: delete everything, insert row by row."""
+    async with conn.transaction(), conn.cursor() as cur:
+        await cur.execute("DELETE FROM nba_playoff_picks WHERE season_id = %s AND user_uid = %s", (season_id, user_uid))
+        for conference, seeds in submission["playoff"].items():
+            for seed, team_id in seeds.items():
+                await cur.execute(
+                    "INSERT INTO nba_playoff_picks (season_id, user_uid, conference, seed, team_id) VALUES (%s, %s, %s, %s, %s)",
+                    (season_id, user_uid, conference, seed, team_id),
+                )
+        await cur.execute("DELETE FROM nba_honor_picks WHERE season_id = %s AND user_uid = %s", (season_id, user_uid))
+        for category, payload in submission["honors"].items():
+            await cur.execute(
+                """
+                INSERT INTO nba_honor_picks (season_id, user_uid, category, nominee, nominee_team_id, nominee_team_name)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (season_id, user_uid, category, payload["nominee"], payload["team_id"], payload["team_name"]),
+            )
+        await cur.execute("DELETE FROM nba_all_nba_picks WHERE season_id = %s AND user_uid = %s", (season_id, user_uid))
+        for slot, payload in submission["all_nba"].items():
+            await cur.execute(
+                """
+                INSERT INTO nba_all_nba_picks (season_id, user_uid, slot, player_name, position, team_name)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (season_id, user_uid, slot, payload["player_name"], payload["position"], payload["team_name"]),
+            )
+
+
+async def save_diff(conn: AsyncConnection, season_id: int, user_uid: str, submission: dict) -> None:
+    rows = nba_picks.pick_rows(submission["playoff"], submission["honors"], submission["all_nba"])
+    async with conn.transaction(), conn.cursor() as cur:
+        await nba_picks.write_user_picks(cur, season_id, user_uid, rows)
+
+
+async def wal_lsn(conn: AsyncConnection) -> int:
+    async with conn.cursor() as cur:
+        await cur.execute("SELECT pg_current_wal_insert_lsn() - '0/0'::pg_lsn")
+        return int((await cur.fetchone())[0])
+
+
+async def measure(conn, save, season_id, user_uid, submissions, rounds) -> tuple[list[float], float]:
+    # Prime the table with the first submission so "unchanged" really is unchanged.
+    await save(conn, season_id, user_uid, submissions[0])
+    timings = []
+    wal_start = await wal_lsn(conn)
+    for index in range(rounds):
+        started = time.perf_counter()
+        await save(conn, season_id, user_uid, submissions[index % len(submissions)])
+        timings.append((time.perf_counter() - started) * 1e3)
+    wal_bytes = (await wal_lsn(conn) - wal_start) / rounds
+    return timings, wal_bytes
+
+
+async def run(database_url: str, rounds: int) -> int:
+    user_uid = f"bench-{os.getpid()}"
+    async with await AsyncConnection.connect(database_url, autocommit=True) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT id FROM nba_seasons ORDER BY year DESC LIMIT 1")
+            season = await cur.fetchone()
+            await cur.execute("SELECT id FROM nba_teams ORDER BY id LIMIT 30")
+            team_ids = [row[0] for row in await cur.fetchall()]
+        if not season or len(team_ids) < 16:
+            print("Se necesita una temporada y al menos 16 equipos (arranca la app y ejecuta fetch_nba_data.py).")
+            return 1
+        season_id = season[0]
+
+        cases = {
+            "sin cambios": [build_submission(team_ids)],
+            "4 cambios": [build_submission(team_ids), build_submission(team_ids, changed=1)],
+            "24 cambios": [build_submission(team_ids), build_submission(team_ids, rewrite=1)],
+        }
+        print(f"{'caso':<14}{'método':<10}{'p50 ms':>9}{'p95 ms':>9}{'WAL B/save':>12}")
+        try:
+            for label, submissions in cases.items():
+                for name, save in (("legacy", save_legacy), ("diff", save_diff)):
+                    timings, wal_bytes = await measure(conn, save, season_id, user_uid, submissions, rounds)
+                    p95 = statistics.quantiles(timings, n=20)[-1]
+                    print(f"{label:<14}{name:<10}{statistics.median(timings):>9.2f}{p95:>9.2f}{wal_bytes:>12.0f}")
+        finally:
+            async with conn.transaction(), conn.cursor() as cur:
+                for table in (nba_picks.PLAYOFF_PICKS, nba_picks.HONOR_PICKS, nba_picks.ALL_NBA_PICKS):
+                    await cur.execute(f"DELETE FROM {table.name} WHERE user_uid = %s", (user_uid,))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL no está definido.")
+        return 1
+    return asyncio.run(run(database_url, max(args.rounds, 2)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
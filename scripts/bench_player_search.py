@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark player name search against the full historical player list (~5k
+names from nba_api's static data, not just active rosters).
+
+Always measures the in-memory PlayerSearchIndex against a naive substring
+scan. With DATABASE_URL set it also loads the names into a temporary table
+and compares the old ``ILIKE '%term%'`` query with the trigram query used by
+/api/nba/players/search (needs pg_trgm, unaccent and nba_search_norm, which
+the app creates on startup).
+
+    python scripts/bench_player_search.py [--rounds 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from nba_api.stats.static import players as nba_players_static
+
+from app.services.player_search import PlayerSearchIndex, like_escape, normalize_name
+
+QUERIES = ["jokic", "Dončić", "james", "jo", "antetokounmpo", "brunsn", "curry", "williams", "zz"]
+
+
+def _timeit(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1e6  # µs per call
+
+
+def bench_memory(names: list[str], rounds: int) -> None:
+    started = time.perf_counter()
+    index = PlayerSearchIndex({"name": name} for name in names)
+    print(f"Índice en memoria: {len(index)} nombres en {(time.perf_counter() - started) * 1e3:.1f} ms")
+    lowered = [name.lower() for name in names]
+    print(f"{'query':<16}{'naive µs':>12}{'index µs':>12}  primeros resultados")
+    for query in QUERIES:
+        needle = query.lower()
+        naive = _timeit(lambda: [n for n in lowered if needle in n][:25], rounds)
+        indexed = _timeit(lambda: index.search(query, 25), rounds)
+        top = ", ".join(record["name"] for record in index.search(query, 3))
+        print(f"{query:<16}{naive:>12.1f}{indexed:>12.1f}  {top}")
+
+
+def bench_postgres(database_url: str, names: list[str], rounds: int) -> None:
+    import psycopg2
+
+    with psycopg2.connect(database_url) as conn, conn.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE bench_players (id SERIAL PRIMARY KEY, full_name TEXT NOT NULL)")
+        cur.executemany("INSERT INTO bench_players (full_name) VALUES (%s)", [(name,) for name in names])
+        cur.execute("CREATE INDEX ON bench_players (LOWER(full_name))")
+        cur.execute("CREATE INDEX ON bench_players USING gin (nba_search_norm(full_name) gin_trgm_ops)")
+        cur.execute("ANALYZE bench_players")
+
+        def run_ilike(term: str):
+            cur.execute(
+                "SELECT full_name FROM bench_players WHERE full_name ILIKE %s ORDER BY full_name LIMIT 25",
+                (f"%{term}%",),
+            )
+            return cur.fetchall()
+
+        def run_trgm(term: str):
+            normalized = normalize_name(term)
+            escaped = like_escape(normalized)
+            cur.execute(
+                """
+                SELECT full_name FROM bench_players
+                WHERE nba_search_norm(full_name) LIKE %s OR %s <%% nba_search_norm(full_name)
+                ORDER BY nba_search_norm(full_name) LIKE %s DESC,
+                         word_similarity(%s, nba_search_norm(full_name)) DESC,
+                         full_name
+                LIMIT 25
+                """,
+                (f"%{escaped}%", normalized, f"%{escaped}%", normalized),
+            )
+            return cur.fetchall()
+
+        print(f"\n{'query':<16}{'ILIKE µs':>12}{'trgm µs':>12}{'ILIKE hits':>12}{'trgm hits':>12}")
+        for query in QUERIES:
+            ilike = _timeit(lambda: run_ilike(query), rounds)
+            trgm = _timeit(lambda: run_trgm(query), rounds)
+            print(f"{query:<16}{ilike:>12.1f}{trgm:>12.1f}{len(run_ilike(query)):>12}{len(run_trgm(query)):>12}")
+        conn.rollback()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    load_dotenv()
+    names = sorted({entry["full_name"] for entry in nba_players_static.get_players() if entry.get("full_name")})
+    print(f"⏳ {len(names)} jugadores históricos")
+    bench_memory(names, args.rounds)
+
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        bench_postgres(database_url, names, max(args.rounds // 10, 5))
+    else:
+        print("\nDATABASE_URL no está definido; se omite la comparación en Postgres.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
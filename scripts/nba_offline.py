@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Record stats.nba.com fixtures, or replay them to run the NBA pipelines offline.
+
+    python scripts/nba_offline.py record
+    python scripts/nba_offline.py replay [--rounds 20] [--profile flaky] [--seed 7]
+
+Both modes run every loader the stats warmer refreshes (team advanced, MVP
+and ROY ladders, standings) and the roster download of the team/player sync,
+starting from an empty in-memory cache each round. ``record`` needs network
+access and writes the responses to NBA_FIXTURES_DIR (default
+dev/nba_fixtures); ``replay`` serves them back without touching the network,
+optionally with the latency/error profile of app/services/nba_fixtures.py,
+and prints per-loader timings and error counts. To run the app or
+fetch_nba_data.py itself offline, export NBA_FIXTURES_MODE=replay instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--dir", help="directorio de fixtures (NBA_FIXTURES_DIR)")
+    parser.add_argument("--profile", default="", help="perfil de latencia/errores en replay, p.e. 'flaky,latency_ms=500'")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de los fallos inyectados")
+    parser.add_argument("--rounds", type=int, default=1, help="rondas en replay")
+    parser.add_argument("--workers", type=int, default=4, help="hilos para descargar plantillas")
+    parser.add_argument("--no-rosters", action="store_true", help="omite las plantillas de equipos")
+    args = parser.parse_args()
+
+    # Both modules read their configuration at import time.
+    os.environ["NBA_FIXTURES_MODE"] = args.mode
+    os.environ["NBA_FIXTURES_PROFILE"] = args.profile if args.mode == "replay" else ""
+    os.environ["NBA_FIXTURES_SEED"] = str(args.seed)
+    os.environ["NBA_CACHE_BACKEND"] = "memory"
+    if args.dir:
+        os.environ["NBA_FIXTURES_DIR"] = args.dir
+
+    from app.services import nba_fixtures, nba_stats, nba_sync
+
+    targets = [(label, load) for _, load, label in nba_stats._warm_targets()]
+    if not args.no_rosters:
+        team_ids = [record[0] for record in nba_sync._team_records(nba_sync.nba_teams_static.get_teams())]
+        # Replay has no server to protect, so only the live recording is rate limited.
+        rate = nba_sync.FETCH_RATE_PER_SECOND if args.mode == "record" else 0
+
+        def load_rosters():
+            rosters, failed = nba_sync.fetch_rosters(team_ids, workers=args.workers, rate=rate, use_checkpoints=False)
+            if failed:
+                raise RuntimeError(f"{len(failed)} plantillas fallidas")
+            return rosters
+
+        def load_signatures():
+            signatures = nba_sync._team_signatures(team_ids)
+            if signatures is None:
+                raise RuntimeError("sin lista de jugadores de la liga")
+            return signatures
+
+        targets.append(("signatures", load_signatures))
+        targets.append(("rosters", load_rosters))
+
+    rounds = 1 if args.mode == "record" else max(args.rounds, 1)
+    timings = {label: [] for label, _ in targets}
+    errors = {label: 0 for label, _ in targets}
+    for _ in range(rounds):
+        nba_stats.configure_cache()
+        for label, load in targets:
+            started = time.perf_counter()
+            try:
+                load()
+            except Exception as exc:
+                errors[label] += 1
+                print(f"⚠️  {label}: {exc}", file=sys.stderr)
+            timings[label].append((time.perf_counter() - started) * 1e3)
+
+    print(f"{'loader':<16}{'ok':>5}{'errores':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, samples in timings.items():
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+        print(f"{label:<16}{len(samples) - errors[label]:>5}{errors[label]:>9}{statistics.median(samples):>10.1f}{p95:>10.1f}")
+    print(f"fixtures: {nba_fixtures.stats()}")
+    return 1 if args.mode == "record" and any(errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
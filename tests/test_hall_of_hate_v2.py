@@ -0,0 +1,72 @@
+"""The Hall of Hate v2 listing must stay a single statement however many villains there are."""
+
+import pytest
+
+from app import main
+
+
+class CountingCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.returned = 0
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn):
+        assert conn is self.conn
+        self.returned += 1
+
+
+def _villain_rows(count):
+    # (id, name, image_filename, frame_type, average_hate, user_rating); every other villain unrated.
+    return [(i, f"Villain {i}", f"villain_{i}.png", None, 50 + i % 40, 10 if i % 2 else None) for i in range(1, count + 1)]
+
+
+@pytest.mark.parametrize("stats_enabled", [True, False])
+@pytest.mark.parametrize("villains", [1, 25, 300])
+def test_v2_entries_load_in_one_statement(monkeypatch, stats_enabled, villains):
+    cursor = CountingCursor(_villain_rows(villains))
+    pool = FakePool(FakeConnection(cursor))
+    monkeypatch.setattr(main, "pool", pool)
+    monkeypatch.setattr(main, "V2_RATING_STATS_ENABLED", stats_enabled)
+
+    entries = main._get_hall_of_hate_entries({"uid": "alice"})
+
+    assert len(cursor.statements) == 1
+    assert cursor.statements[0][1] == ("alice",)
+    assert len(entries) == villains
+    assert [entry["user_rating"] for entry in entries] == [10 if i % 2 else 99 for i in range(1, villains + 1)]
+    assert entries[0]["frame_type"] == "default"
+    assert pool.returned == 1
+
+
+def test_v2_entries_anonymous_user_still_one_statement(monkeypatch):
+    cursor = CountingCursor(_villain_rows(10))
+    monkeypatch.setattr(main, "pool", FakePool(FakeConnection(cursor)))
+
+    entries = main._get_hall_of_hate_entries(None)
+
+    assert len(cursor.statements) == 1
+    assert cursor.statements[0][1] == (None,)
+    assert len(entries) == 10
@@ -0,0 +1,157 @@
+"""Background jobs start in one elected process and stop when it loses the lock."""
+
+import threading
+
+import pytest
+
+from app.services import leader, nba_scoring
+
+
+class FakeLockConnection:
+    def __init__(self, alive_checks):
+        self.alive_checks = alive_checks
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.alive_checks <= 0:
+            raise ConnectionError("server closed the connection")
+        self.alive_checks -= 1
+
+    def close(self):
+        self.closed = True
+
+
+class Jobs:
+    def __init__(self):
+        self.started = 0
+        self.stopped = threading.Event()
+
+    def start(self):
+        self.started += 1
+
+    def stop(self):
+        self.stopped.set()
+
+
+@pytest.fixture(autouse=True)
+def fast_heartbeat(monkeypatch):
+    monkeypatch.setattr(leader, "HEARTBEAT_SECONDS", 0.01)
+
+
+def test_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        leader.JobsLeader("postgresql://", lambda: None, lambda: None, mode="maybe")
+
+
+def test_false_never_runs_jobs():
+    jobs = Jobs()
+    elector = leader.JobsLeader("postgresql://", jobs.start, jobs.stop, mode="false")
+    elector.start()
+    elector.stop()
+    assert jobs.started == 0
+    assert not elector.is_leader
+
+
+def test_true_runs_jobs_without_election():
+    jobs = Jobs()
+    elector = leader.JobsLeader("postgresql://", jobs.start, jobs.stop, mode="true")
+    elector.start()
+    assert elector.is_leader and jobs.started == 1
+    elector.stop()
+    assert jobs.stopped.is_set() and not elector.is_leader
+
+
+def test_auto_stops_jobs_when_the_lock_connection_drops(monkeypatch):
+    jobs = Jobs()
+    conn = FakeLockConnection(alive_checks=3)
+    attempts = []
+
+    def try_acquire(self):
+        attempts.append(1)
+        return conn if len(attempts) == 1 else None
+
+    monkeypatch.setattr(leader.JobsLeader, "_try_acquire", try_acquire)
+    elector = leader.JobsLeader("postgresql://", jobs.start, jobs.stop, mode="auto", retry_seconds=0.01)
+    elector.start()
+    try:
+        assert jobs.stopped.wait(timeout=5)
+    finally:
+        elector.stop()
+    assert jobs.started == 1
+    assert conn.closed
+    assert not elector.is_leader
+
+
+def test_auto_does_not_run_jobs_while_another_process_leads(monkeypatch):
+    jobs = Jobs()
+    tried = threading.Event()
+
+    def try_acquire(self):
+        tried.set()
+        return None
+
+    monkeypatch.setattr(leader.JobsLeader, "_try_acquire", try_acquire)
+    elector = leader.JobsLeader("postgresql://", jobs.start, jobs.stop, mode="auto", retry_seconds=0.01)
+    elector.start()
+    assert tried.wait(timeout=5)
+    elector.stop()
+    assert jobs.started == 0 and not jobs.stopped.is_set()
+
+
+class BlockingLockConnection(FakeLockConnection):
+    """Drops only once ``ready`` is set, so the lead is lost while a job is mid-run."""
+
+    def __init__(self, ready):
+        super().__init__(alive_checks=0)
+        self.ready = ready
+
+    def execute(self, query, params=None):
+        self.ready.wait(timeout=5)
+        super().execute(query, params)
+
+
+def test_regained_lead_restarts_jobs_while_the_old_thread_finishes(monkeypatch):
+    first_run_started = threading.Event()
+    release_first_run = threading.Event()
+    second_run = threading.Event()
+    runs = []
+
+    def run_snapshot(pool, season_id):
+        runs.append(season_id)
+        if len(runs) == 1:
+            first_run_started.set()
+            release_first_run.wait(timeout=5)
+        else:
+            second_run.set()
+
+    monkeypatch.setattr(nba_scoring, "SCORING_ENABLED", True)
+    monkeypatch.setattr(nba_scoring, "SCORING_INTERVAL", 0.01)
+    monkeypatch.setattr(nba_scoring, "run_snapshot", run_snapshot)
+    connections = [BlockingLockConnection(first_run_started), FakeLockConnection(alive_checks=10**6)]
+    monkeypatch.setattr(leader.JobsLeader, "_try_acquire", lambda self: connections.pop(0) if connections else None)
+
+    elector = leader.JobsLeader(
+        "postgresql://",
+        lambda: nba_scoring.start_scorer(None, lambda: 1),
+        nba_scoring.stop_scorer,
+        mode="auto",
+        retry_seconds=0.01,
+    )
+    elector.start()
+    try:
+        # Lead lost and won back while the first snapshot is still running: a new thread must take over.
+        assert second_run.wait(timeout=5)
+        assert elector.is_leader
+    finally:
+        release_first_run.set()
+        elector.stop()
+        nba_scoring.stop_scorer()
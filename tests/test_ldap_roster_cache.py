@@ -0,0 +1,110 @@
+"""A misbehaving LDAP keeps the last good roster instead of an empty one."""
+
+from contextlib import contextmanager
+
+import pytest
+from ldap3.core.exceptions import LDAPException
+
+from app.services.ldap_directory import DirectoryClient, RosterCache
+
+
+class Loader:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_empty_result_does_not_replace_cached_roster():
+    cache = RosterCache(Loader(["alice", "bob"], []), ttl=60, max_stale=0)
+    assert cache.get() == ["alice", "bob"]
+
+    cache.invalidate()
+    assert cache.get() == ["alice", "bob"]
+    assert cache.stats()["errors"] == 1
+
+
+def test_empty_first_roster_is_accepted():
+    cache = RosterCache(Loader([]), ttl=60, max_stale=0)
+    assert cache.get() == []
+    assert cache.stats()["errors"] == 0
+
+
+def test_invalidated_stats_report_a_finite_age():
+    cache = RosterCache(Loader(["alice"]), ttl=60, max_stale=600)
+    cache.get()
+    cache.invalidate()
+    age = cache.stats()["age_seconds"]
+    assert 660 <= age < 700
+
+
+def test_failed_reload_backs_off_for_queued_callers():
+    loader = Loader(["alice"], LDAPException("down"), ["alice", "carol"])
+    cache = RosterCache(loader, ttl=60, max_stale=0)
+    cache.get()
+    cache.invalidate()
+    assert cache.get() == ["alice"]
+    # Within the backoff nobody goes back to LDAP.
+    assert cache.get() == ["alice"]
+    assert loader.calls == 2
+
+
+class FakeEntry:
+    def __init__(self, uid):
+        self.uid = uid
+
+    def __contains__(self, attribute):
+        return attribute == "uid"
+
+
+class FakeSearchConnection:
+    def __init__(self, found, result, uids=()):
+        self.found = found
+        self.result = result
+        self.entries = [FakeEntry(uid) for uid in uids]
+
+    def search(self, **kwargs):
+        return self.found
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.discarded = False
+
+    @contextmanager
+    def connection(self):
+        try:
+            yield self.conn
+        except Exception:
+            self.discarded = True
+            raise
+
+
+def _client(conn):
+    client = DirectoryClient("ldap://localhost", "dc=example", "cn=svc", "secret")
+    client.pool = FakePool(conn)
+    return client
+
+
+def test_failed_search_raises_and_discards_the_connection():
+    client = _client(FakeSearchConnection(False, {"description": "busy", "result": 51}))
+    with pytest.raises(LDAPException):
+        client._search_user_uids()
+    assert client.pool.discarded
+
+
+def test_search_without_matches_is_an_empty_roster():
+    client = _client(FakeSearchConnection(False, {"description": "success", "result": 0}))
+    assert client._search_user_uids() == []
+
+
+def test_search_returns_uids():
+    client = _client(FakeSearchConnection(True, {"description": "success", "result": 0}, uids=["alice", "bob"]))
+    assert client._search_user_uids() == ["alice", "bob"]
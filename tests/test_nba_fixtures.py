@@ -0,0 +1,116 @@
+"""Record/replay of stats.nba.com: profiles, replay through nba_api and seeded fault injection."""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import requests
+from nba_api.stats.endpoints import commonteamroster
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from app.services import nba_fixtures, nba_stats, nba_sync
+from app.services.nba_fixtures import FaultProfile, FixtureAdapter, FixtureMissing, FixtureStore, parse_profile
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "nba"
+LAKERS = 1610612747
+
+
+def test_parse_profile_presets_and_overrides():
+    assert parse_profile("") == FaultProfile()
+    assert parse_profile("flaky") == nba_fixtures.PROFILES["flaky"]
+    profile = parse_profile("flaky, latency_ms=500, error_status=502")
+    assert profile.latency_ms == 500.0
+    assert profile.error_status == 502 and isinstance(profile.error_status, int)
+    assert profile.error_rate == nba_fixtures.PROFILES["flaky"].error_rate
+
+
+@pytest.mark.parametrize("spec", ["stormy", "latency=5", "flaky,error_rate"])
+def test_parse_profile_rejects_unknown_settings(spec):
+    with pytest.raises(ValueError):
+        parse_profile(spec)
+
+
+def test_fixture_key_ignores_parameter_order():
+    a = "https://stats.nba.com/stats/commonteamroster?LeagueID=00&Season=2025-26&TeamID=1"
+    b = "https://stats.nba.com/stats/commonteamroster?TeamID=1&Season=2025-26&LeagueID=00"
+    assert nba_fixtures.fixture_key(a) == nba_fixtures.fixture_key(b)
+    assert nba_fixtures.fixture_key(a)[0] == "commonteamroster"
+
+
+@pytest.fixture
+def replay_adapter(monkeypatch):
+    adapter = FixtureAdapter("replay", FixtureStore(FIXTURES_DIR), FaultProfile())
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    monkeypatch.setattr(NBAStatsHTTP, "_session", session)
+    monkeypatch.setattr(nba_stats, "SEASON", "2025-26")
+    return adapter
+
+
+def test_replays_committed_fixture_through_nba_api(replay_adapter):
+    roster = commonteamroster.CommonTeamRoster(team_id=LAKERS, season="2025-26", timeout=1)
+
+    players = roster.common_team_roster.get_dict()
+    assert [row[players["headers"].index("PLAYER")] for row in players["data"]] == ["LeBron James", "Luka Doncic"]
+    assert replay_adapter.stats["replayed"] == 1
+
+
+def test_sync_roster_fetch_replays_offline(replay_adapter):
+    roster = nba_sync._fetch_roster(LAKERS, nba_sync.RateLimiter(0))
+
+    assert roster["headers"][-1] == "PLAYER_ID"
+    assert [row[-1] for row in roster["data"]] == [2544, 1629029]
+
+
+def test_missing_fixture_fails_like_a_connection_error(replay_adapter):
+    with pytest.raises(requests.exceptions.ConnectionError) as excinfo:
+        commonteamroster.CommonTeamRoster(team_id=LAKERS, season="2019-20", timeout=1)
+    assert isinstance(excinfo.value, FixtureMissing)
+    assert replay_adapter.stats["missing"] == 1
+
+
+URLS = [f"https://stats.nba.com/stats/commonteamroster?LeagueID=00&Season=2025-26&TeamID={team}" for team in range(30)]
+FAULTY = FaultProfile(error_rate=0.3, timeout_rate=0.2)
+
+
+def _outcomes(seed, order_seed):
+    """Outcome of every (url, attempt) when 4 threads send 3 attempts per URL in a shuffled order."""
+    adapter = FixtureAdapter("replay", FixtureStore(FIXTURES_DIR), FAULTY, seed=seed)
+    requests_to_send = [(url, attempt) for url in URLS for attempt in range(3)]
+    random.Random(order_seed).shuffle(requests_to_send)
+    # Attempts of one URL must still go out in order; only the interleaving across URLs varies.
+    requests_to_send.sort(key=lambda item: item[1])
+    outcomes = {}
+    lock = threading.Lock()
+
+    def send(item):
+        url, attempt = item
+        try:
+            response = adapter.send(requests.Request("GET", url).prepare())
+            outcome = f"status {response.status_code}"
+        except requests.exceptions.ReadTimeout:
+            outcome = "timeout"
+        except FixtureMissing:
+            outcome = "missing"
+        with lock:
+            outcomes[(url, attempt)] = outcome
+
+    for attempt in range(3):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(send, [item for item in requests_to_send if item[1] == attempt]))
+    return outcomes, adapter.stats
+
+
+def test_injected_faults_depend_on_seed_not_thread_order():
+    first, stats = _outcomes(seed=7, order_seed=1)
+    second, _ = _outcomes(seed=7, order_seed=2)
+    other_seed, _ = _outcomes(seed=8, order_seed=1)
+
+    assert first == second
+    assert first != other_seed
+    assert {"timeout", "status 503", "missing"} <= set(first.values())
+    assert stats["injected_timeouts"] == list(first.values()).count("timeout")
+    assert stats["injected_errors"] == list(first.values()).count("status 503")
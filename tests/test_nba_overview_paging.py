@@ -0,0 +1,77 @@
+"""The picks overview reads users in short keyset batches and reports a failed batch."""
+
+import asyncio
+
+import pytest
+
+from app import main
+from app.services import async_db
+
+USERS = [f"user{i:03d}" for i in range(1, 61)]
+
+
+class FakePicksDatabase:
+    """Answers _ALL_USERS_NBA_PICKS_SQL from USERS: two honor rows per user, ordered by uid."""
+
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+
+    async def fetch_all(self, query, params=()):
+        assert query is main._ALL_USERS_NBA_PICKS_SQL
+        self.calls.append(dict(params))
+        if self.fail_on_call == len(self.calls):
+            raise RuntimeError("connection lost")
+        users = [uid for uid in USERS if uid > params["after"]][: params["limit"]]
+        return [
+            (uid, "honor", category, None, None, f"{uid} nominee", None, None)
+            for uid in users
+            for category in ("mvp", "roy")
+        ]
+
+
+def _collect(page, **kwargs):
+    async def run():
+        return [sheet async for sheet in main._iter_all_users_nba_picks(page, **kwargs)]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def database(monkeypatch):
+    fake = FakePicksDatabase()
+    monkeypatch.setattr(async_db, "is_ready", lambda: True)
+    monkeypatch.setattr(async_db, "fetch_all", fake.fetch_all)
+    monkeypatch.setattr(main, "NBA_CURRENT_SEASON_ID", 1)
+    monkeypatch.setattr(main, "NBA_OVERVIEW_FETCH_USERS", 10)
+    return fake
+
+
+def test_page_is_read_in_batches_with_next_cursor(database):
+    page = {}
+    sheets = _collect(page, limit=25)
+
+    assert [sheet["user_uid"] for sheet in sheets] == USERS[:25]
+    assert set(sheets[0]["honors"]) == {"mvp", "roy"}
+    assert [call["after"] for call in database.calls] == ["", "user010", "user020"]
+    # Only the last batch asks for one extra user to detect the next page.
+    assert [call["limit"] for call in database.calls] == [10, 10, 6]
+    assert page == {"next_after": "user025", "error": False}
+
+
+def test_last_page_has_no_next_cursor(database):
+    page = {}
+    sheets = _collect(page, after="user050", limit=25)
+
+    assert [sheet["user_uid"] for sheet in sheets] == USERS[50:]
+    assert len(database.calls) == 2
+    assert page["next_after"] is None
+
+
+def test_failed_batch_keeps_earlier_sheets_and_flags_the_page(database):
+    database.fail_on_call = 2
+    page = {}
+    sheets = _collect(page, limit=25)
+
+    assert [sheet["user_uid"] for sheet in sheets] == USERS[:10]
+    assert page == {"next_after": None, "error": True}
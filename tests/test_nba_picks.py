@@ -0,0 +1,114 @@
+"""Pick-count keys built from a submitted sheet, read back through PICK_KEYS_SQL, and their deltas."""
+
+import re
+
+from app.services import nba_picks
+
+LAL, BOS, DEN, NYK = 1610612747, 1610612738, 1610612743, 1610612752
+
+
+def _sheet(*, west_1=DEN, west_2=LAL, mvp="Nikola Jokic", all_nba=("Luka Doncic",)):
+    return nba_picks.pick_rows(
+        {"West": {1: west_1, 2: west_2, 3: None}, "East": {1: BOS}},
+        {"mvp": {"nominee": mvp, "team_id": DEN, "team_name": "Denver Nuggets"}, "roy": {"nominee": "  "}},
+        {slot: {"player_name": name, "position": "G"} for slot, name in enumerate(all_nba, start=1)},
+    )
+
+
+def _evaluate(expression, row):
+    """One select-list expression of PICK_KEYS_SQL: literals, columns, ``::text`` and ``||``."""
+    parts = []
+    for term in expression.split("||"):
+        term = term.strip()
+        if term.startswith("'"):
+            parts.append(term.strip("'"))
+        else:
+            parts.append(str(row[term.removesuffix("::text")]))
+    return "".join(parts)
+
+
+def _keys_through_sql(rows):
+    """What PICK_KEYS_SQL returns as (kind, slot, choice) for ``rows`` once they are stored."""
+    tables = {table.name: table for table in rows}
+    keys = []
+    for branch in nba_picks.PICK_KEYS_SQL.split("UNION ALL"):
+        match = re.search(r"SELECT (.*?)\s+FROM (\w+)(?:\s+WHERE (\w+) IS NOT NULL)?\s*$", branch.strip(), re.S)
+        select, table_name, not_null = match.groups()
+        expressions = [re.sub(r"\s+AS \w+$", "", column.strip()) for column in select.split(",")]
+        table = tables[table_name]
+        for values in rows[table]:
+            row = dict(zip(table.columns, values))
+            if not_null and row[not_null] is None:
+                continue
+            # season_id and user_uid come first; the key is the rest.
+            keys.append(tuple(_evaluate(expression, row) for expression in expressions[2:]))
+    return keys
+
+
+def test_form_keys_match_pick_keys_sql():
+    rows = _sheet()
+
+    assert nba_picks.count_keys(rows) == nba_picks.stored_count_keys(_keys_through_sql(rows))
+    assert nba_picks.count_keys(rows) == {
+        ("seed", "West:1", str(DEN)): 1,
+        ("seed", "West:2", str(LAL)): 1,
+        ("seed", "East:1", str(BOS)): 1,
+        ("honor", "mvp", "Nikola Jokic"): 1,
+        ("all_nba", "", "Luka Doncic"): 1,
+        ("participants", "any", ""): 1,
+        ("participants", "all_nba", ""): 1,
+    }
+
+
+def test_changed_sheet_gives_deltas():
+    before = nba_picks.stored_count_keys(_keys_through_sql(_sheet()))
+    after = nba_picks.count_keys(_sheet(west_1=LAL, west_2=NYK, mvp="Nikola Jokic", all_nba=()))
+
+    assert nba_picks.count_deltas(before, after) == [
+        ("all_nba", "", "Luka Doncic", -1),
+        ("participants", "all_nba", "", -1),
+        ("seed", "West:1", str(DEN), -1),
+        ("seed", "West:1", str(LAL), 1),
+        ("seed", "West:2", str(LAL), -1),
+        ("seed", "West:2", str(NYK), 1),
+    ]
+
+
+def test_first_and_cleared_sheets():
+    keys = nba_picks.count_keys(_sheet())
+    empty = nba_picks.count_keys(nba_picks.pick_rows({}, {}, {}))
+
+    assert empty == {}
+    assert nba_picks.count_deltas(empty, keys) == sorted((*key, 1) for key in keys)
+    assert nba_picks.count_deltas(keys, empty) == sorted((*key, -1) for key in keys)
+    assert nba_picks.count_deltas(keys, nba_picks.count_keys(_sheet())) == []
+
+
+def test_summarize_counts():
+    teams = {str(DEN): {"name": "Denver Nuggets", "abbreviation": "DEN"}, str(LAL): {"name": "Los Angeles Lakers", "abbreviation": "LAL"}}
+    count_rows = [
+        ("participants", "any", "", 4),
+        ("participants", "all_nba", "", 2),
+        ("seed", "West:1", str(DEN), 3),
+        ("seed", "West:1", str(LAL), 1),
+        ("seed", "West:2", str(LAL), 2),
+        ("seed", "West:2", str(DEN), 0),
+        ("honor", "mvp", "Nikola Jokic", 3),
+        ("honor", "mvp", "Luka Doncic", 1),
+        ("all_nba", "", "Luka Doncic", 2),
+    ]
+
+    summary = nba_picks.summarize_counts(count_rows, teams, ["West", "East"])
+
+    assert summary["users"] == 4
+    assert summary["seeds"]["West"][1] == [
+        {"team_id": DEN, "team_name": "Denver Nuggets", "abbreviation": "DEN", "picks": 3, "share": 0.75},
+        {"team_id": LAL, "team_name": "Los Angeles Lakers", "abbreviation": "LAL", "picks": 1, "share": 0.25},
+    ]
+    assert summary["seeds"]["East"][1] == []
+    assert [(row["abbreviation"], row["counts"]) for row in summary["seed_matrix"]["West"]] == [
+        ("DEN", [3, 0, 0, 0, 0, 0, 0, 0]),
+        ("LAL", [1, 2, 0, 0, 0, 0, 0, 0]),
+    ]
+    assert summary["honors"]["mvp"][0] == {"nominee": "Nikola Jokic", "picks": 3, "share": 0.75}
+    assert summary["all_nba"] == [{"player_name": "Luka Doncic", "picks": 2, "share": 1.0}]
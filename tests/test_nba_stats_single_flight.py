@@ -0,0 +1,85 @@
+"""Concurrent cache misses on one key must reach stats.nba.com once."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import nba_stats
+from app.services.stats_cache import MemoryCacheBackend
+
+CALLERS = 50
+
+
+class CountingLoader:
+    """Stands in for an nba_api call: slow enough that every caller arrives while it runs."""
+
+    def __init__(self, delay=0.3, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [{"PLAYER_ID": 1, "PTS": 30.1}]
+
+
+def _run_concurrently(call):
+    barrier = threading.Barrier(CALLERS)
+
+    def worker():
+        barrier.wait()
+        return call()
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(worker) for _ in range(CALLERS)]
+        return [future.result(timeout=10) for future in futures]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(nba_stats, "_cache", MemoryCacheBackend())
+
+
+def test_single_flight_runs_loader_once():
+    loader = CountingLoader()
+
+    results = _run_concurrently(lambda: nba_stats._single_flight("test_key", loader))
+
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+    assert nba_stats._flights == {}
+
+
+def test_cached_miss_fetches_once_and_fills_cache():
+    loader = CountingLoader()
+
+    results = _run_concurrently(lambda: nba_stats._cached("test_cached_key", loader, "test"))
+
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+    assert nba_stats._cache.get("test_cached_key").value is results[0]
+    assert nba_stats._cached("test_cached_key", loader, "test") is results[0]
+    assert loader.calls == 1
+
+
+def test_single_flight_shares_the_leader_error():
+    loader = CountingLoader(error=RuntimeError("stats.nba.com down"))
+
+    def call():
+        try:
+            return nba_stats._single_flight("test_error_key", loader)
+        except RuntimeError as exc:
+            return exc
+
+    results = _run_concurrently(call)
+
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+    assert isinstance(results[0], RuntimeError)
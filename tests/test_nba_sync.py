@@ -0,0 +1,258 @@
+"""Incremental team/player sync: which rosters are fetched, partial failures and what gets saved."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import nba_sync
+
+LAL, BOS, DEN = 1610612747, 1610612738, 1610612743
+TEAMS = [
+    {"id": LAL, "full_name": "Los Angeles Lakers", "abbreviation": "LAL", "city": "Los Angeles", "nickname": "Lakers"},
+    {"id": BOS, "full_name": "Boston Celtics", "abbreviation": "BOS", "city": "Boston", "nickname": "Celtics"},
+    {"id": DEN, "full_name": "Denver Nuggets", "abbreviation": "DEN", "city": "Denver", "nickname": "Nuggets"},
+]
+ROSTER_HEADERS = ["TeamID", "PLAYER", "POSITION", "PLAYER_ID"]
+
+
+def _roster(team, *players):
+    return {"headers": ROSTER_HEADERS, "data": [[team, name, position, player_id] for player_id, name, position in players]}
+
+
+class FakeLeague:
+    """stats.nba.com plus the database tables the sync touches."""
+
+    def __init__(self):
+        self.rosters = {
+            LAL: [(2544, "LeBron James", "F"), (1629029, "Luka Doncic", "G-F")],
+            BOS: [(1628369, "Jayson Tatum", "F-G")],
+            DEN: [(203999, "Nikola Jokic", "C")],
+        }
+        self.failing = set()
+        self.signal_down = False
+        self.roster_requests = []
+        self.signal_requests = 0
+        # Database side.
+        self.state = {}
+        self.saves = []
+        self.players = {}
+        self.player_upserts = 0
+        self.version = 0
+        self.teams_stored = False
+
+    # stats.nba.com
+    def fetch_roster(self, nba_team_id, limiter):
+        self.roster_requests.append(nba_team_id)
+        if nba_team_id in self.failing:
+            raise ConnectionError("read timeout")
+        return _roster(nba_team_id, *self.rosters[nba_team_id])
+
+    def common_all_players(self, **kwargs):
+        self.signal_requests += 1
+        if self.signal_down:
+            raise ConnectionError("read timeout")
+        rows = [[player_id, team] for team, players in self.rosters.items() for player_id, _, _ in players]
+        data = {"headers": ["PERSON_ID", "TEAM_ID"], "data": rows}
+        return SimpleNamespace(common_all_players=SimpleNamespace(get_dict=lambda: data))
+
+    # Database
+    def load_state(self, conn):
+        return {entity: dict(entry) for entity, entry in self.state.items()}
+
+    def save_state(self, conn, entries):
+        self.saves.append(sorted(entries))
+        for entity, (digest, payload) in entries.items():
+            previous = self.state.get(entity, {})
+            self.state[entity] = {
+                "hash": digest,
+                "payload": payload if payload is not None else previous.get("payload"),
+                "checked_at": time.time(),
+            }
+
+    def load_team_map(self, conn, team_ids):
+        return {team_id: team_id % 1000 for team_id in team_ids} if self.teams_stored else {}
+
+    def upsert_teams(self, conn, payload):
+        inserted = 0 if self.teams_stored else len(payload)
+        self.teams_stored = True
+        return (
+            {entry["id"]: entry["id"] % 1000 for entry in payload},
+            {"inserted": inserted, "updated": 0, "unchanged": len(payload) - inserted},
+        )
+
+    def upsert_players(self, conn, metadata, payload):
+        self.player_upserts += 1
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for player_id, row in metadata.items():
+            previous = self.players.get(player_id)
+            counts["inserted" if previous is None else "updated" if previous != row else "unchanged"] += 1
+            self.players[player_id] = dict(row)
+        return counts
+
+    def bump_reference_version(self, conn):
+        self.version += 1
+        return self.version
+
+
+@pytest.fixture
+def league(monkeypatch, tmp_path):
+    fake = FakeLeague()
+    monkeypatch.setattr(nba_sync, "CHECKPOINT_DIR", tmp_path)
+    monkeypatch.setattr(nba_sync, "_fetch_roster", fake.fetch_roster)
+    monkeypatch.setattr(nba_sync, "commonallplayers", SimpleNamespace(CommonAllPlayers=fake.common_all_players))
+    monkeypatch.setattr(nba_sync, "nba_teams_static", SimpleNamespace(get_teams=lambda: TEAMS))
+    monkeypatch.setattr(nba_sync, "nba_players_static", SimpleNamespace(get_players=lambda: [{"id": 2544}]))
+    monkeypatch.setattr(nba_sync, "_load_state", fake.load_state)
+    monkeypatch.setattr(nba_sync, "_save_state", fake.save_state)
+    monkeypatch.setattr(nba_sync, "load_team_map", fake.load_team_map)
+    monkeypatch.setattr(nba_sync, "upsert_teams", fake.upsert_teams)
+    monkeypatch.setattr(nba_sync, "upsert_players", fake.upsert_players)
+    monkeypatch.setattr(nba_sync, "bump_reference_version", fake.bump_reference_version)
+    return fake
+
+
+def _run(league, force=False):
+    league.roster_requests.clear()
+    league.saves.clear()
+    result = {"timings_ms": {}}
+    return nba_sync._sync(None, result, workers=2, rate=0, use_checkpoints=False, force=force)
+
+
+def test_first_run_fetches_everything_and_bumps_once(league):
+    result = _run(league)
+
+    assert result["status"] == "ok"
+    assert sorted(league.roster_requests) == sorted([LAL, BOS, DEN])
+    assert result["requests"] == 4
+    assert league.players[203999] == {"position": "C", "team_id": DEN % 1000, "full_name": "Nikola Jokic"}
+    assert league.version == 1
+    assert {f"roster:{team}" for team in (LAL, BOS, DEN)} | {"teams", "players"} <= set(league.state)
+
+
+def test_quiet_run_is_one_request_and_writes_nothing(league):
+    _run(league)
+    upserts = league.player_upserts
+
+    result = _run(league)
+
+    assert result["status"] == "unchanged"
+    assert league.roster_requests == []
+    assert result["requests"] == 1 and league.signal_requests == 2
+    assert league.player_upserts == upserts
+    assert league.version == 1
+
+
+def test_trade_refetches_only_the_two_teams(league):
+    _run(league)
+    league.rosters[LAL].remove((1629029, "Luka Doncic", "G-F"))
+    league.rosters[BOS].append((1629029, "Luka Doncic", "G-F"))
+
+    result = _run(league)
+
+    assert sorted(league.roster_requests) == sorted([LAL, BOS])
+    assert result["rosters_changed"] == sorted([LAL, BOS])
+    assert league.players[1629029]["team_id"] == BOS % 1000
+    assert result["status"] == "ok" and league.version == 2
+
+
+def test_failed_team_keeps_old_signature_and_stored_roster(league):
+    _run(league)
+    league.rosters[DEN].append((1631096, "Peyton Watson", "F"))
+    league.failing = {DEN}
+    old_signature = league.state[f"signature:{DEN}"]["hash"]
+
+    result = _run(league)
+
+    assert result["status"] == "partial"
+    assert result["rosters_failed"] == [DEN]
+    # Its last stored roster is still used, so Jokic keeps his team.
+    assert league.players[203999]["team_id"] == DEN % 1000
+    assert 1631096 not in league.players
+    assert league.state[f"signature:{DEN}"]["hash"] == old_signature
+    assert f"signature:{DEN}" not in league.saves[-1]
+    assert league.version == 1
+
+    league.failing = set()
+    result = _run(league)
+
+    assert league.roster_requests == [DEN]
+    assert result["status"] == "ok"
+    assert league.players[1631096]["team_id"] == DEN % 1000
+
+
+def test_missing_roster_without_copy_skips_players(league):
+    league.failing = {DEN}
+
+    result = _run(league)
+
+    assert result["status"] == "partial"
+    assert league.player_upserts == 0
+    assert "players" not in league.state
+    assert f"roster:{DEN}" not in league.state and f"roster:{LAL}" in league.state
+    # New teams were written, so the version still moves.
+    assert league.version == 1
+
+    league.failing = set()
+    result = _run(league)
+
+    assert league.roster_requests == [DEN]
+    assert result["status"] == "ok" and league.player_upserts == 1
+
+
+def test_without_the_signal_only_aged_rosters_are_fetched(league, monkeypatch):
+    _run(league)
+    league.signal_down = True
+    league.state[f"roster:{BOS}"]["checked_at"] -= nba_sync.ROSTER_MAX_AGE_SECONDS + 1
+
+    result = _run(league)
+
+    assert league.roster_requests == [BOS]
+    assert result["status"] == "unchanged"
+    # No signal, so no signature is rewritten.
+    assert not any(entity.startswith("signature:") for entity in league.saves[-1])
+
+
+def test_force_refetches_and_rewrites(league):
+    _run(league)
+
+    result = _run(league, force=True)
+
+    assert sorted(league.roster_requests) == sorted([LAL, BOS, DEN])
+    assert league.player_upserts == 2
+    assert result["status"] == "unchanged"
+
+
+def test_due_rosters_reasons():
+    now = time.time()
+    stored = {
+        f"roster:{LAL}": {"hash": "a", "payload": {"data": []}, "checked_at": now},
+        f"signature:{LAL}": {"hash": "lal"},
+        f"roster:{BOS}": {"hash": "b", "payload": {"data": []}, "checked_at": now},
+        f"signature:{BOS}": {"hash": "old"},
+        f"roster:{DEN}": {"hash": "c", "payload": {"data": []}, "checked_at": now - nba_sync.ROSTER_MAX_AGE_SECONDS - 1},
+        f"signature:{DEN}": {"hash": "den"},
+    }
+    team_map = {LAL: 1, BOS: 2, DEN: 3, 1610612744: 4}
+    signatures = {LAL: "lal", BOS: "bos", DEN: "den", 1610612744: "gsw"}
+
+    due, reused = nba_sync._due_rosters(team_map, stored, signatures, force=False)
+    assert due == [BOS, DEN, 1610612744]
+    assert list(reused) == [LAL]
+
+    due, reused = nba_sync._due_rosters(team_map, stored, None, force=False)
+    assert due == [DEN, 1610612744]
+
+    due, reused = nba_sync._due_rosters(team_map, stored, signatures, force=True)
+    assert due == list(team_map) and reused == {}
+
+
+def test_player_metadata_uses_header_positions_and_last_roster_wins():
+    rosters = {
+        LAL: _roster(LAL, (2544, "LeBron James", "F"), ("bad", "Nobody", "G")),
+        BOS: _roster(BOS, (2544, "LeBron James", "")),
+    }
+
+    metadata = nba_sync._player_metadata({LAL: 1, BOS: 2, DEN: 3}, rosters)
+
+    assert metadata == {2544: {"position": "F", "team_id": 2, "full_name": "LeBron James"}}